@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Request, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
 import uuid
@@ -8,15 +8,26 @@ import logging
 from werkzeug.utils import secure_filename
 import tempfile
 import shutil
+import zipfile
 
 # Import our analysis modules
 from services.resume_analyzer import ResumeAnalyzer
-from services.gemini_service import GeminiService
+from services.gemini_service import GeminiService, GeminiUnavailableError
 from services.file_processor import FileProcessor
 from services.job_matcher import JobMatcher
 from services.learning_service import LearningService
+from services.job_queue import JobQueue, QueueFullError
+from services.session_store import get_session_store
+from services.session_janitor import SessionJanitor
+from services.extraction_pool import get_extraction_pool, ExtractionError, ExtractionTimeout
+from services.bulk_analyzer import BulkAnalyzer, OVERSIZED_ERROR, iter_zip
+from services.report_cache import get_report_cache
+from services.report_export import get_report_exporter, EXPORTS
 from utils.validators import validate_file
 from utils.response_formatter import format_response, format_error
+from utils.projection import requested_fields, project
+from utils.cache import LRUCache, DiskCache, TieredCache, content_key
+from utils.lazy import lazy_service
 
 # Import route blueprints
 from routes.job_match import job_match_bp
@@ -27,30 +38,95 @@ from routes.mock_interview import mock_interview_bp
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Endpoints that accept uploads larger than MAX_CONTENT_LENGTH
+BULK_UPLOAD_PATHS = {'/api/resume/bulk-analyze'}
+
+class AppRequest(Request):
+    @property
+    def max_content_length(self):
+        """Allow batch archives on the bulk endpoints; everything else keeps the normal limit"""
+        if self.path in BULK_UPLOAD_PATHS:
+            return app.config['BULK_MAX_CONTENT_LENGTH']
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = AppRequest
 CORS(app, origins=["http://localhost:5173"])  # Allow Vite dev server
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['TEMP_FOLDER'] = 'temp'
+app.config['GEMINI_PROBE_INTERVAL'] = float(os.getenv('GEMINI_PROBE_INTERVAL', 0))
+app.config['GEMINI_WORKERS'] = int(os.getenv('GEMINI_WORKERS', 4))
+app.config['GEMINI_MAX_PENDING_JOBS'] = int(os.getenv('GEMINI_MAX_PENDING_JOBS', 100))
+app.config['ANALYSIS_CACHE_FOLDER'] = os.getenv('ANALYSIS_CACHE_FOLDER', 'cache/analysis')
+app.config['ANALYSIS_CACHE_MEMORY_ITEMS'] = int(os.getenv('ANALYSIS_CACHE_MEMORY_ITEMS', 256))
+app.config['ANALYSIS_CACHE_MAX_BYTES'] = int(os.getenv('ANALYSIS_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+app.config['SESSION_PURGE_INTERVAL'] = float(os.getenv('SESSION_PURGE_INTERVAL', 300))
+app.config['BULK_MAX_CONTENT_LENGTH'] = int(os.getenv('BULK_MAX_CONTENT_LENGTH', 512 * 1024 * 1024))
+app.config['BULK_MAX_FILES'] = int(os.getenv('BULK_MAX_FILES', 5000))
+app.config['BULK_BATCH_SIZE'] = int(os.getenv('BULK_BATCH_SIZE', 32))
+app.config['REPORT_EXPORT_MAX_SESSIONS'] = int(os.getenv('REPORT_EXPORT_MAX_SESSIONS', 1000))
 
 # Ensure directories exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['TEMP_FOLDER'], exist_ok=True)
 
-# Initialize services
-resume_analyzer = ResumeAnalyzer()
-gemini_service = GeminiService()
-file_processor = FileProcessor()
-job_matcher = JobMatcher()
-learning_service = LearningService()
+# Initialize services. Each is built on first use, not at import: pool worker
+# processes re-run this script as __mp_main__ while starting up (see utils.lazy)
+resume_analyzer = lazy_service(ResumeAnalyzer)
+gemini_service = lazy_service(GeminiService)
+file_processor = lazy_service(FileProcessor)
+job_matcher = lazy_service(JobMatcher)
+learning_service = lazy_service(LearningService)
+
+# Shared session state (analysis results, extracted text, rewrites)
+session_store = lazy_service(get_session_store)
+
+# Document parsing runs in isolated worker processes with time and memory limits
+extraction_pool = lazy_service(get_extraction_pool)
+
+# Batch scoring of many resumes against one job description
+bulk_analyzer = lazy_service(lambda: BulkAnalyzer(
+    resume_analyzer,
+    extraction_pool,
+    batch_size=app.config['BULK_BATCH_SIZE'],
+    max_files=app.config['BULK_MAX_FILES']
+))
+
+# Purge expired session store entries in the background (started by the first request)
+session_janitor = lazy_service(lambda: SessionJanitor(session_store, interval=app.config['SESSION_PURGE_INTERVAL']))
+
+# Background executor for Gemini-backed requests submitted in async mode
+gemini_jobs = lazy_service(lambda: JobQueue(
+    max_workers=app.config['GEMINI_WORKERS'],
+    max_pending=app.config['GEMINI_MAX_PENDING_JOBS']
+))
+
+# Content-addressed cache of analysis results, keyed on resume bytes + analyzer version
+analysis_cache = lazy_service(lambda: TieredCache(
+    LRUCache(max_items=app.config['ANALYSIS_CACHE_MEMORY_ITEMS']),
+    DiskCache(app.config['ANALYSIS_CACHE_FOLDER'], app.config['ANALYSIS_CACHE_MAX_BYTES'])
+))
+
+# Rendered PDF reports, optionally pre-rendered in the background (REPORT_PRERENDER)
+report_cache = lazy_service(get_report_cache)
+
+# Bulk report export: renders on a process pool, streamed back as one zip
+report_exporter = lazy_service(get_report_exporter)
 
 # Register blueprints
 app.register_blueprint(job_match_bp, url_prefix='/api/job-match')
 app.register_blueprint(learning_bp, url_prefix='/api/learning')
 app.register_blueprint(mock_interview_bp, url_prefix='/api/mock-interview')
 
+@app.before_request
+def start_background_tasks():
+    """Start per-process background threads lazily, so importing the app (or forking it) starts none"""
+    gemini_service.start_health_probe(app.config['GEMINI_PROBE_INTERVAL'])
+    session_janitor.start()
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -63,7 +139,16 @@ def health_check():
             'job_matcher': True,
             'learning_service': True,
             'mock_interview': True
-        }
+        },
+        'cache': {
+            'analysis': analysis_cache.stats(),
+            'reports': report_cache.stats()
+        },
+        'sessions': session_janitor.stats(),
+        'extraction': extraction_pool.stats(),
+        'gemini': gemini_service.get_status(),
+        'gemini_cache': gemini_service.response_cache.stats(),
+        'jobs': gemini_jobs.stats()
     })
 
 @app.route('/api/resume/analyze', methods=['POST'])
@@ -80,27 +165,41 @@ def analyze_resume():
         if not validate_file(resume_file):
             return format_error('Invalid resume file format. Please upload PDF or DOCX.', 400)
         
+        try:
+            fields = requested_fields('analysis', request.args)
+        except ValueError as e:
+            return format_error(str(e), 400)
+        
         # Generate unique session ID
         session_id = str(uuid.uuid4())
         
-        # Create temporary directory for this session
-        session_dir = os.path.join(app.config['TEMP_FOLDER'], session_id)
-        os.makedirs(session_dir, exist_ok=True)
-        
         try:
-            # Save and process resume
-            resume_path = os.path.join(session_dir, secure_filename(resume_file.filename))
-            resume_file.save(resume_path)
+            # Process the resume straight from the request buffer; nothing is written to disk
+            resume_bytes = resume_file.read()
             
-            logger.info(f"Processing resume: {resume_file.filename}")
-            resume_text = file_processor.extract_text(resume_path)
+            cache_key = content_key(resume_bytes, 'resume', 'doc', ResumeAnalyzer.VERSION)
+            cached_entry = analysis_cache.get(cache_key)
             
-            if not resume_text.strip():
-                return format_error('Could not extract text from resume. Please check the file format.', 400)
+            if cached_entry is not None:
+                logger.info(f"Analysis cache hit for resume: {resume_file.filename}")
+                document = cached_entry['document']
+                analysis_result = dict(cached_entry['analysis'])
+            else:
+                logger.info(f"Processing resume: {resume_file.filename}")
+                document = extraction_pool.extract_document(resume_bytes, resume_file.filename)
+                resume_text = document['text']
+                
+                if not resume_text.strip():
+                    return format_error('Could not extract text from resume. Please check the file format.', 400)
+                
+                # Perform analysis
+                logger.info("Starting resume analysis...")
+                analysis_result = resume_analyzer.analyze_resume(resume_text)
+                analysis_cache.set(cache_key, {'analysis': analysis_result, 'document': document})
+                analysis_result = dict(analysis_result)
             
-            # Perform analysis
-            logger.info("Starting resume analysis...")
-            analysis_result = resume_analyzer.analyze_resume(resume_text)
+            # Keep the extracted text so follow-up requests never re-parse the file
+            session_store.set('document', session_id, document)
             
             # Add session info
             analysis_result['session_id'] = session_id
@@ -110,25 +209,161 @@ def analyze_resume():
             }
             
             # Save analysis result
-            result_path = os.path.join(session_dir, 'analysis_result.json')
-            with open(result_path, 'w') as f:
-                json.dump(analysis_result, f, indent=2)
+            session_store.set('analysis', session_id, analysis_result)
+            report_cache.prerender('analysis', analysis_result)
             
             logger.info(f"Analysis completed. Score: {analysis_result.get('finalScore', 'N/A')}")
-            return format_response(analysis_result)
+            return format_response(project(analysis_result, fields))
             
+        except ExtractionTimeout as e:
+            return format_error(str(e), 422, error_code='EXTRACTION_TIMEOUT')
+        except ExtractionError as e:
+            return format_error(f'Could not extract text from resume: {str(e)}', 422, error_code='EXTRACTION_FAILED')
         except Exception as e:
             logger.error(f"Error during analysis: {str(e)}")
             return format_error(f'Analysis failed: {str(e)}', 500)
-        
-        finally:
-            # Clean up temporary files after a delay (in production, use a background task)
-            pass
     
     except Exception as e:
         logger.error(f"Unexpected error in analyze_resume: {str(e)}")
         return format_error('Internal server error', 500)
 
+@app.route('/api/resume/analysis/<session_id>', methods=['GET'])
+def get_analysis(session_id):
+    """Fetch a stored analysis result, optionally narrowed with ?fields= or ?profile="""
+    try:
+        fields = requested_fields('analysis', request.args)
+    except ValueError as e:
+        return format_error(str(e), 400)
+    
+    analysis_result = session_store.get('analysis', session_id)
+    if analysis_result is None:
+        return format_error('Session not found', 404)
+    
+    return format_response(project(analysis_result, fields))
+
+@app.route('/api/resume/bulk-analyze', methods=['POST'])
+def bulk_analyze_resumes():
+    """Score a zip (or several uploaded files) of resumes against one job description, streamed as NDJSON"""
+    try:
+        archive_file = request.files.get('archive')
+        # Unsupported or oversized uploads are not dropped; each gets an error record in the stream
+        resume_files = [f for f in request.files.getlist('resumes') if f.filename]
+        
+        if not archive_file and not resume_files:
+            return format_error('Provide a zip archive or PDF/DOCX resume files', 400)
+        
+        # Process the job description once for the whole batch
+        job_desc_file = request.files.get('job_description')
+        if job_desc_file:
+            if not validate_file(job_desc_file):
+                return format_error('Invalid job description file format', 400)
+            job_description = extraction_pool.extract_text(job_desc_file.read(), secure_filename(job_desc_file.filename))
+        else:
+            job_description = request.form.get('job_description_text', '')
+        
+        if not job_description.strip():
+            return format_error('Job description is required', 400)
+        
+        max_file_bytes = app.config['MAX_CONTENT_LENGTH']
+        if archive_file:
+            try:
+                archive = zipfile.ZipFile(archive_file.stream)
+            except zipfile.BadZipFile:
+                return format_error('Archive is not a valid zip file', 400)
+            sources = iter_zip(archive, max_file_bytes)
+        else:
+            sources = iter_uploads(resume_files, max_file_bytes)
+        
+        full = request.args.get('full', '').lower() in ('1', 'true')
+        
+        def generate():
+            try:
+                for record in bulk_analyzer.analyze(sources, job_description, full=full):
+                    yield json.dumps(record) + '\n'
+            except Exception as e:
+                logger.error(f"Error during bulk analysis: {str(e)}")
+                yield json.dumps({'type': 'error', 'message': f'Bulk analysis failed: {str(e)}'}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+    except ExtractionError as e:
+        return format_error(f'Could not extract text from job description: {str(e)}', 422, error_code='EXTRACTION_FAILED')
+    except Exception as e:
+        logger.error(f"Error in bulk_analyze_resumes: {str(e)}")
+        return format_error(f'Bulk analysis failed: {str(e)}', 500)
+
+def iter_uploads(files, max_file_bytes: int):
+    """(name, bytes, error) for each uploaded file; oversized files are not read"""
+    for f in files:
+        f.stream.seek(0, os.SEEK_END)
+        size = f.stream.tell()
+        f.stream.seek(0)
+        name = secure_filename(f.filename) or f.filename
+        if size > max_file_bytes:
+            yield name, None, OVERSIZED_ERROR
+        else:
+            yield name, f.read(), None
+
+def wants_async(data: dict) -> bool:
+    """Whether the client asked for job-submission mode"""
+    return bool(data.get('async')) or request.args.get('mode') == 'async'
+
+def submit_job(kind: str, fn, *args):
+    """Queue a Gemini-backed call and return the 202 job-accepted response"""
+    try:
+        job_id = gemini_jobs.submit(kind, fn, *args)
+    except QueueFullError as e:
+        return format_error(str(e), 503)
+    
+    return format_response({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/jobs/{job_id}',
+        'result_url': f'/api/jobs/{job_id}/result'
+    }, 'Job accepted', 202)
+
+def run_rewrite(session_id: str, resume_text: str, analysis_result: dict) -> dict:
+    """Rewrite the resume with Gemini and persist the result in the session"""
+    logger.info("Starting resume rewrite with Gemini...")
+    rewritten_content = gemini_service.rewrite_resume(
+        resume_text, 
+        analysis_result.get('suggestions', []),
+        analysis_result.get('missingSkills', [])
+    )
+    
+    rewrite_result = save_rewrite(session_id, resume_text, rewritten_content, analysis_result)
+    logger.info("Resume rewrite completed")
+    return rewrite_result
+
+def save_rewrite(session_id: str, resume_text: str, rewritten_content: str, analysis_result: dict) -> dict:
+    """Persist a rewritten resume in the session"""
+    rewrite_result = {
+        'original_text': resume_text,
+        'rewritten_text': rewritten_content,
+        'timestamp': datetime.now().isoformat(),
+        'improvements_applied': analysis_result.get('suggestions', [])
+    }
+    
+    session_store.set('rewrite', session_id, rewrite_result)
+    
+    return rewrite_result
+
+def load_rewrite_inputs(session_id: str):
+    """Load the analysis result and resume text for a session, or return an error response"""
+    analysis_result = session_store.get('analysis', session_id)
+    if analysis_result is None:
+        return None, format_error('Session not found', 404)
+    
+    document = session_store.get('document', session_id)
+    if document is None:
+        return None, format_error('Resume text not found', 404)
+    
+    return (analysis_result, document['text']), None
+
+def sse_event(event: str, payload: dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
 @app.route('/api/resume/rewrite', methods=['POST'])
 def rewrite_resume():
     """AI-powered resume rewriting using Gemini"""
@@ -138,81 +373,86 @@ def rewrite_resume():
         if not data or 'session_id' not in data:
             return format_error('Session ID required', 400)
         
-        session_id = data['session_id']
-        session_dir = os.path.join(app.config['TEMP_FOLDER'], session_id)
+        inputs, error = load_rewrite_inputs(data['session_id'])
+        if error:
+            return error
+        analysis_result, resume_text = inputs
         
-        if not os.path.exists(session_dir):
-            return format_error('Session not found', 404)
+        if wants_async(data):
+            return submit_job('rewrite', run_rewrite, data['session_id'], resume_text, analysis_result)
         
-        # Load analysis result
-        result_path = os.path.join(session_dir, 'analysis_result.json')
-        if not os.path.exists(result_path):
-            return format_error('Analysis result not found', 404)
-        
-        with open(result_path, 'r') as f:
-            analysis_result = json.load(f)
+        rewrite_result = run_rewrite(data['session_id'], resume_text, analysis_result)
+        return format_response(rewrite_result)
         
-        # Get original resume text
-        resume_files = [f for f in os.listdir(session_dir) if f.endswith(('.pdf', '.docx'))]
-        if not resume_files:
-            return format_error('Original resume file not found', 404)
+    except GeminiUnavailableError as e:
+        return format_error(str(e), 503)
+    except Exception as e:
+        logger.error(f"Error in rewrite_resume: {str(e)}")
+        return format_error(f'Rewrite failed: {str(e)}', 500)
+
+@app.route('/api/resume/rewrite/stream', methods=['GET', 'POST'])
+def stream_rewrite_resume():
+    """Stream the Gemini resume rewrite to the client as server-sent events"""
+    try:
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id') or request.args.get('session_id')
         
-        resume_path = os.path.join(session_dir, resume_files[0])
-        resume_text = file_processor.extract_text(resume_path)
+        if not session_id:
+            return format_error('Session ID required', 400)
         
-        # Generate rewritten resume using Gemini
-        logger.info("Starting resume rewrite with Gemini...")
-        rewritten_content = gemini_service.rewrite_resume(
-            resume_text, 
-            analysis_result.get('suggestions', []),
-            analysis_result.get('missingSkills', [])
+        if not gemini_service.is_available():
+            return format_error('Gemini AI service temporarily unavailable', 503)
+        
+        inputs, error = load_rewrite_inputs(session_id)
+        if error:
+            return error
+        analysis_result, resume_text = inputs
+        
+        def generate():
+            chunks = []
+            try:
+                for chunk in gemini_service.stream_rewrite_resume(
+                    resume_text,
+                    analysis_result.get('suggestions', []),
+                    analysis_result.get('missingSkills', [])
+                ):
+                    chunks.append(chunk)
+                    yield sse_event('chunk', {'text': chunk})
+                
+                rewrite_result = save_rewrite(session_id, resume_text, ''.join(chunks).strip(), analysis_result)
+                yield sse_event('done', {
+                    'timestamp': rewrite_result['timestamp'],
+                    'length': len(rewrite_result['rewritten_text'])
+                })
+                
+            except Exception as e:
+                logger.error(f"Error streaming rewrite: {str(e)}")
+                yield sse_event('error', {'message': f'Rewrite failed: {str(e)}'})
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
         )
         
-        # Save rewritten resume
-        rewrite_result = {
-            'original_text': resume_text,
-            'rewritten_text': rewritten_content,
-            'timestamp': datetime.now().isoformat(),
-            'improvements_applied': analysis_result.get('suggestions', [])
-        }
-        
-        rewrite_path = os.path.join(session_dir, 'rewritten_resume.json')
-        with open(rewrite_path, 'w') as f:
-            json.dump(rewrite_result, f, indent=2)
-        
-        logger.info("Resume rewrite completed")
-        return format_response(rewrite_result)
-        
     except Exception as e:
-        logger.error(f"Error in rewrite_resume: {str(e)}")
+        logger.error(f"Error in stream_rewrite_resume: {str(e)}")
         return format_error(f'Rewrite failed: {str(e)}', 500)
 
 @app.route('/api/resume/report/<session_id>', methods=['GET'])
 def generate_report(session_id):
     """Generate and download PDF report"""
     try:
-        session_dir = os.path.join(app.config['TEMP_FOLDER'], session_id)
-        
-        if not os.path.exists(session_dir):
+        analysis_result = session_store.get('analysis', session_id)
+        if analysis_result is None:
             return format_error('Session not found', 404)
         
-        # Load analysis result
-        result_path = os.path.join(session_dir, 'analysis_result.json')
-        if not os.path.exists(result_path):
-            return format_error('Analysis result not found', 404)
-        
-        with open(result_path, 'r') as f:
-            analysis_result = json.load(f)
-        
-        # Generate PDF report
-        from services.report_generator import ReportGenerator
-        report_generator = ReportGenerator()
-        
-        pdf_path = os.path.join(session_dir, 'resume_analysis_report.pdf')
-        report_generator.generate_pdf_report(analysis_result, pdf_path)
+        # Rendered once per distinct result; repeat downloads are served from the cache.
+        # An open handle keeps the download intact even if the cache evicts the file meanwhile.
+        pdf_file = report_cache.open_report('analysis', analysis_result)
         
         return send_file(
-            pdf_path,
+            pdf_file,
             as_attachment=True,
             download_name=f'Resume_Analysis_Report_{session_id[:8]}.pdf',
             mimetype='application/pdf'
@@ -222,6 +462,43 @@ def generate_report(session_id):
         logger.error(f"Error generating report: {str(e)}")
         return format_error('Report generation failed', 500)
 
+@app.route('/api/resume/reports/export', methods=['POST'])
+def export_reports():
+    """Download the reports of many sessions as a single zip, streamed as it is built"""
+    try:
+        data = request.get_json(silent=True) or {}
+        session_ids = data.get('session_ids')
+        kind = data.get('type', 'analysis')
+        
+        if not isinstance(session_ids, list) or not session_ids:
+            return format_error('session_ids must be a non-empty list', 400)
+        if not all(isinstance(session_id, str) and session_id for session_id in session_ids):
+            return format_error('session_ids must be strings', 400)
+        if kind not in EXPORTS:
+            return format_error(f"type must be one of: {', '.join(EXPORTS)}", 400)
+        
+        session_ids = list(dict.fromkeys(session_ids))
+        max_sessions = app.config['REPORT_EXPORT_MAX_SESSIONS']
+        if len(session_ids) > max_sessions:
+            return format_error(f'At most {max_sessions} sessions can be exported at once', 400)
+        
+        # Results are looked up as the archive is built, not all up front
+        archive = report_exporter.export(session_ids, kind, lambda session_id: session_store.get(kind, session_id))
+        filename = f"{kind}_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        
+        return Response(
+            stream_with_context(archive),
+            mimetype='application/zip',
+            headers={
+                'Content-Disposition': f'attachment; filename={filename}',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in export_reports: {str(e)}")
+        return format_error(f'Report export failed: {str(e)}', 500)
+
 @app.route('/api/resume/suggestions', methods=['POST'])
 def get_ai_suggestions():
     """Get additional AI suggestions for improvement"""
@@ -234,31 +511,61 @@ def get_ai_suggestions():
         session_id = data['session_id']
         focus_area = data.get('focus_area', 'general')  # general, skills, formatting, content
         
-        session_dir = os.path.join(app.config['TEMP_FOLDER'], session_id)
-        result_path = os.path.join(session_dir, 'analysis_result.json')
-        
-        if not os.path.exists(result_path):
+        analysis_result = session_store.get('analysis', session_id)
+        if analysis_result is None:
             return format_error('Analysis result not found', 404)
         
-        with open(result_path, 'r') as f:
-            analysis_result = json.load(f)
+        if wants_async(data):
+            return submit_job('suggestions', run_suggestions, analysis_result, focus_area)
         
-        # Get targeted suggestions from Gemini
-        suggestions = gemini_service.get_targeted_suggestions(analysis_result, focus_area)
-        
-        return format_response({
-            'focus_area': focus_area,
-            'suggestions': suggestions,
-            'timestamp': datetime.now().isoformat()
-        })
+        return format_response(run_suggestions(analysis_result, focus_area))
         
+    except GeminiUnavailableError as e:
+        return format_error(str(e), 503)
     except Exception as e:
         logger.error(f"Error getting AI suggestions: {str(e)}")
         return format_error('Failed to get suggestions', 500)
 
+def run_suggestions(analysis_result: dict, focus_area: str) -> dict:
+    """Get targeted suggestions from Gemini"""
+    suggestions = gemini_service.get_targeted_suggestions(analysis_result, focus_area)
+    
+    return {
+        'focus_area': focus_area,
+        'suggestions': suggestions,
+        'timestamp': datetime.now().isoformat()
+    }
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Poll the status of a background job"""
+    status = gemini_jobs.get_status(job_id)
+    if status is None:
+        return format_error('Job not found', 404)
+    
+    return format_response(status)
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Fetch the result of a completed background job"""
+    status = gemini_jobs.get_status(job_id)
+    if status is None:
+        return format_error('Job not found', 404)
+    
+    if status['status'] == 'failed':
+        return format_error(f"Job failed: {status['error']}", 500)
+    
+    if status['status'] != 'completed':
+        return format_response(status, 'Job not finished yet', 202)
+    
+    return format_response(gemini_jobs.get_result(job_id))
+
 @app.errorhandler(413)
 def too_large(e):
-    return format_error('File too large. Maximum size is 16MB.', 413)
+    limit = request.max_content_length
+    if limit is None:
+        return format_error('File too large.', 413)
+    return format_error(f'File too large. Maximum size is {limit // (1024 * 1024)}MB.', 413)
 
 @app.errorhandler(404)
 def not_found(e):
@@ -277,9 +584,13 @@ if __name__ == '__main__':
     logger.info("Starting SIPA Backend Server...")
     logger.info("Available endpoints:")
     logger.info("  POST /api/resume/analyze - Analyze resume")
+    logger.info("  POST /api/resume/bulk-analyze - Score a batch of resumes (NDJSON)")
     logger.info("  POST /api/resume/rewrite - Rewrite resume with AI")
+    logger.info("  GET  /api/resume/rewrite/stream - Stream AI rewrite (SSE)")
     logger.info("  GET  /api/resume/report/<session_id> - Download PDF report")
     logger.info("  POST /api/resume/suggestions - Get AI suggestions")
+    logger.info("  GET  /api/jobs/<job_id> - Poll background job status")
+    logger.info("  GET  /api/jobs/<job_id>/result - Get background job result")
     logger.info("  POST /api/job-match/analyze - Analyze job match")
     logger.info("  POST /api/job-match/analyze-files - Analyze job match with files")
     logger.info("  GET  /api/job-match/report/<session_id> - Download job match report")
@@ -2,8 +2,13 @@ from flask import Blueprint, request, jsonify
 import logging
 from services.job_matcher import JobMatcher
 from services.file_processor import FileProcessor
+from services.session_store import get_session_store
+from services.extraction_pool import get_extraction_pool, ExtractionError, ExtractionTimeout
+from services.report_cache import get_report_cache
 from utils.response_formatter import format_response, format_error
+from utils.projection import requested_fields, project
 from utils.validators import validate_file
+from utils.lazy import lazy_service
 import os
 import uuid
 import json
@@ -14,9 +19,12 @@ logger = logging.getLogger(__name__)
 
 job_match_bp = Blueprint('job_match', __name__)
 
-# Initialize services
-job_matcher = JobMatcher()
-file_processor = FileProcessor()
+# Initialize services (built on first use; see utils.lazy)
+job_matcher = lazy_service(JobMatcher)
+file_processor = lazy_service(FileProcessor)
+session_store = lazy_service(get_session_store)
+extraction_pool = lazy_service(get_extraction_pool)
+report_cache = lazy_service(get_report_cache)
 
 @job_match_bp.route('/analyze', methods=['POST'])
 def analyze_job_match():
@@ -35,6 +43,11 @@ def analyze_job_match():
         if not resume_text or not job_description:
             return format_error('Both resume text and job description are required', 400)
         
+        try:
+            fields = requested_fields('job_match', request.args)
+        except ValueError as e:
+            return format_error(str(e), 400)
+        
         logger.info("Starting job match analysis...")
         
         # Perform job match analysis
@@ -45,11 +58,17 @@ def analyze_job_match():
         )
         
         # Add metadata
+        session_id = str(uuid.uuid4())
         match_result['timestamp'] = datetime.now().isoformat()
-        match_result['analysis_id'] = str(uuid.uuid4())
+        match_result['analysis_id'] = session_id
+        match_result['session_id'] = session_id
+        
+        # Keep the full result so detail can be fetched later from /result/<session_id>
+        session_store.set('job_match', session_id, match_result)
+        report_cache.prerender('job_match', match_result)
         
         logger.info(f"Job match analysis completed. Score: {match_result['overall_score']}")
-        return format_response(match_result)
+        return format_response(project(match_result, fields))
         
     except Exception as e:
         logger.error(f"Error in job match analysis: {str(e)}")
@@ -74,17 +93,18 @@ def analyze_job_match_files():
         if job_desc_file and not validate_file(job_desc_file):
             return format_error('Invalid job description file format', 400)
         
+        try:
+            fields = requested_fields('job_match', request.args)
+        except ValueError as e:
+            return format_error(str(e), 400)
+        
         # Generate session ID
         session_id = str(uuid.uuid4())
-        session_dir = os.path.join('temp', session_id)
-        os.makedirs(session_dir, exist_ok=True)
         
         try:
-            # Process resume file
+            # Extract straight from the upload buffers in isolated workers; nothing is written to disk
             resume_filename = secure_filename(resume_file.filename)
-            resume_path = os.path.join(session_dir, resume_filename)
-            resume_file.save(resume_path)
-            resume_text = file_processor.extract_text(resume_path)
+            resume_text = extraction_pool.extract_text(resume_file.read(), resume_filename)
             
             if not resume_text.strip():
                 return format_error('Could not extract text from resume file', 400)
@@ -92,9 +112,7 @@ def analyze_job_match_files():
             # Process job description
             if job_desc_file:
                 job_desc_filename = secure_filename(job_desc_file.filename)
-                job_desc_path = os.path.join(session_dir, job_desc_filename)
-                job_desc_file.save(job_desc_path)
-                job_description = file_processor.extract_text(job_desc_path)
+                job_description = extraction_pool.extract_text(job_desc_file.read(), job_desc_filename)
                 
                 if not job_description.strip():
                     return format_error('Could not extract text from job description file', 400)
@@ -118,13 +136,16 @@ def analyze_job_match_files():
             }
             
             # Save result
-            result_path = os.path.join(session_dir, 'match_result.json')
-            with open(result_path, 'w') as f:
-                json.dump(match_result, f, indent=2)
+            session_store.set('job_match', session_id, match_result)
+            report_cache.prerender('job_match', match_result)
             
             logger.info(f"File-based job match analysis completed. Score: {match_result['overall_score']}")
-            return format_response(match_result)
+            return format_response(project(match_result, fields))
             
+        except ExtractionTimeout as e:
+            return format_error(str(e), 422, error_code='EXTRACTION_TIMEOUT')
+        except ExtractionError as e:
+            return format_error(f'Could not extract text from file: {str(e)}', 422, error_code='EXTRACTION_FAILED')
         except Exception as e:
             logger.error(f"Error processing files: {str(e)}")
             return format_error(f'File processing failed: {str(e)}', 500)
@@ -235,33 +256,35 @@ def get_job_insights():
         logger.error(f"Error getting job insights: {str(e)}")
         return format_error(f'Job insights analysis failed: {str(e)}', 500)
 
+@job_match_bp.route('/result/<session_id>', methods=['GET'])
+def get_match_result(session_id):
+    """Fetch a stored job match result, optionally narrowed with ?fields= or ?profile="""
+    try:
+        fields = requested_fields('job_match', request.args)
+    except ValueError as e:
+        return format_error(str(e), 400)
+    
+    match_result = session_store.get('job_match', session_id)
+    if match_result is None:
+        return format_error('Session not found', 404)
+    
+    return format_response(project(match_result, fields))
+
 @job_match_bp.route('/report/<session_id>', methods=['GET'])
 def generate_match_report(session_id):
     """Generate and download job match report"""
     try:
-        session_dir = os.path.join('temp', session_id)
-        
-        if not os.path.exists(session_dir):
+        match_result = session_store.get('job_match', session_id)
+        if match_result is None:
             return format_error('Session not found', 404)
         
-        # Load match result
-        result_path = os.path.join(session_dir, 'match_result.json')
-        if not os.path.exists(result_path):
-            return format_error('Match result not found', 404)
-        
-        with open(result_path, 'r') as f:
-            match_result = json.load(f)
-        
-        # Generate PDF report
-        from services.report_generator import ReportGenerator
-        report_generator = ReportGenerator()
-        
-        pdf_path = os.path.join(session_dir, 'job_match_report.pdf')
-        report_generator.generate_job_match_report(match_result, pdf_path)
+        # Rendered once per distinct result; repeat downloads are served from the cache.
+        # An open handle keeps the download intact even if the cache evicts the file meanwhile.
+        pdf_file = report_cache.open_report('job_match', match_result)
         
         from flask import send_file
         return send_file(
-            pdf_path,
+            pdf_file,
             as_attachment=True,
             download_name=f'Job_Match_Report_{session_id[:8]}.pdf',
             mimetype='application/pdf'
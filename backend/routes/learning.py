@@ -1,8 +1,9 @@
 from flask import Blueprint, request, jsonify
 import logging
 from services.learning_service import LearningService
-from utils.response_formatter import format_response, format_error
+from utils.response_formatter import format_response, format_error, PayloadCache
 from utils.validators import validate_session_id
+from utils.lazy import lazy_service
 import uuid
 from datetime import datetime
 
@@ -10,8 +11,14 @@ logger = logging.getLogger(__name__)
 
 learning_bp = Blueprint('learning', __name__)
 
-# Initialize service
-learning_service = LearningService()
+# Initialize service (built on first use; see utils.lazy)
+learning_service = lazy_service(LearningService)
+
+# Upper bound for the pageSize query parameter on course listings
+MAX_PAGE_SIZE = 100
+
+# Encoded course listing pages, rebuilt when the course catalog is reloaded
+course_payloads = PayloadCache(max_entries=512)
 
 @learning_bp.route('/dashboard/<user_id>', methods=['GET'])
 def get_dashboard(user_id):
@@ -34,21 +41,34 @@ def get_courses():
     """Get courses with optional filtering"""
     try:
         # Get filter parameters
+        search = request.args.get('search', '')
         filters = {
-            'search': request.args.get('search', ''),
+            'search': search,
             'category': request.args.get('category', 'all'),
             'difficulty': request.args.get('difficulty', 'all'),
-            'sortBy': request.args.get('sortBy', 'popular')
+            'sortBy': request.args.get('sortBy', 'relevance' if search else 'popular')
         }
         
+        page = request.args.get('page', 1, type=int)
+        page_size = min(request.args.get('pageSize', 20, type=int), MAX_PAGE_SIZE)
+        if page < 1 or page_size < 1:
+            return format_error('page and pageSize must be positive integers', 400)
+        
         logger.info(f"Getting courses with filters: {filters}")
-        courses = learning_service.get_courses(filters)
         
-        return format_response({
-            'courses': courses,
-            'total': len(courses),
-            'filters': filters
-        })
+        def build():
+            results = learning_service.search_courses(filters, page=page, page_size=page_size)
+            return {
+                'courses': results['courses'],
+                'total': results['total'],
+                'page': results['page'],
+                'pageSize': results['pageSize'],
+                'filters': filters
+            }
+        
+        # Listings are the same for every user, so each page is encoded once per catalog version
+        key = (filters['search'], filters['category'], filters['difficulty'], filters['sortBy'], page, page_size)
+        return course_payloads.get(key, learning_service.courses, build).to_response()
         
     except Exception as e:
         logger.error(f"Error getting courses: {str(e)}")
@@ -339,6 +359,8 @@ def get_recommendations(user_id):
             relevance_score = skill_overlap / len(course_skills) if course_skills else 0
             
             if relevance_score > 0.2:  # At least 20% skill overlap
+                # Catalog entries are shared; annotate a copy
+                course = dict(course)
                 course['relevanceScore'] = relevance_score
                 course['reason'] = f"Matches {skill_overlap} of your existing skills"
                 recommendations.append(course)
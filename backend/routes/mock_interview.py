@@ -4,89 +4,23 @@ import json
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
-from utils.response_formatter import format_response, format_error
+from utils.response_formatter import format_response, format_error, PayloadCache
+from services.session_store import get_session_store
+from services.catalog import get_question_catalog
+from utils.lazy import lazy_service
 
 logger = logging.getLogger(__name__)
 
 mock_interview_bp = Blueprint('mock_interview', __name__)
 
-# Mock interview questions database
-INTERVIEW_QUESTIONS = {
-    'technical': [
-        {
-            'id': 'tech-1',
-            'category': 'Data Structures',
-            'difficulty': 'Medium',
-            'question': 'Explain the difference between an array and a linked list. When would you use each?',
-            'expectedKeywords': ['array', 'linked list', 'memory', 'access time', 'insertion', 'deletion'],
-            'timeLimit': 120,
-            'followUpQuestions': ['How would you implement a dynamic array?']
-        },
-        {
-            'id': 'tech-2',
-            'category': 'Algorithms',
-            'difficulty': 'Hard',
-            'question': 'Describe how you would implement a binary search algorithm and analyze its time complexity.',
-            'expectedKeywords': ['binary search', 'sorted array', 'divide and conquer', 'O(log n)', 'time complexity'],
-            'timeLimit': 180,
-            'followUpQuestions': ['What happens if the array is not sorted?']
-        },
-        {
-            'id': 'tech-3',
-            'category': 'System Design',
-            'difficulty': 'Hard',
-            'question': 'How would you design a URL shortener like bit.ly? Walk me through your architecture.',
-            'expectedKeywords': ['database', 'hashing', 'scalability', 'load balancer', 'caching', 'API'],
-            'timeLimit': 300,
-            'followUpQuestions': ['How would you handle 1 million requests per second?']
-        }
-    ],
-    'behavioral': [
-        {
-            'id': 'beh-1',
-            'category': 'Leadership',
-            'difficulty': 'Medium',
-            'question': 'Tell me about a time when you had to lead a team through a challenging project.',
-            'expectedKeywords': ['leadership', 'team', 'challenge', 'communication', 'result', 'collaboration'],
-            'timeLimit': 180,
-            'followUpQuestions': ['How did you handle team conflicts?']
-        },
-        {
-            'id': 'beh-2',
-            'category': 'Problem Solving',
-            'difficulty': 'Medium',
-            'question': 'Describe a situation where you had to solve a complex technical problem under pressure.',
-            'expectedKeywords': ['problem solving', 'pressure', 'analysis', 'solution', 'outcome', 'learning'],
-            'timeLimit': 150,
-            'followUpQuestions': ['What would you do differently next time?']
-        }
-    ],
-    'system-design': [
-        {
-            'id': 'sys-1',
-            'category': 'Scalability',
-            'difficulty': 'Hard',
-            'question': 'Design a chat application like WhatsApp that can handle millions of users.',
-            'expectedKeywords': ['websockets', 'database', 'message queue', 'load balancer', 'microservices', 'real-time'],
-            'timeLimit': 600,
-            'followUpQuestions': ['How would you handle message delivery guarantees?']
-        }
-    ],
-    'coding': [
-        {
-            'id': 'code-1',
-            'category': 'Arrays',
-            'difficulty': 'Medium',
-            'question': 'Given an array of integers, find two numbers that add up to a target sum.',
-            'expectedKeywords': ['two sum', 'hash map', 'array', 'target', 'time complexity', 'space complexity'],
-            'timeLimit': 300,
-            'followUpQuestions': ['What if there are multiple solutions?']
-        }
-    ]
-}
+# Question bank, loaded from data/interview_questions.jsonl and reloaded when it changes
+question_catalog = lazy_service(get_question_catalog)
+
+# Encoded question listings, rebuilt when the question file is reloaded
+static_payloads = PayloadCache()
 
-# In-memory storage for interview sessions (in production, use a database)
-interview_sessions = {}
+# Interview sessions live in the shared session store so any worker can serve them
+session_store = lazy_service(get_session_store)
 
 @mock_interview_bp.route('/start', methods=['POST'])
 def start_interview():
@@ -102,14 +36,15 @@ def start_interview():
         duration = data.get('duration', 30)  # minutes
         
         # Validate input
-        if interview_type not in INTERVIEW_QUESTIONS:
+        questions_by_type = question_catalog.questions
+        if interview_type not in questions_by_type:
             return format_error('Invalid interview type', 400)
         
         if difficulty not in ['Easy', 'Medium', 'Hard']:
             return format_error('Invalid difficulty level', 400)
         
         # Get questions for the interview
-        questions = INTERVIEW_QUESTIONS[interview_type]
+        questions = questions_by_type[interview_type]
         filtered_questions = [q for q in questions if q['difficulty'] == difficulty]
         
         # Limit questions based on duration (roughly 5 minutes per question)
@@ -133,7 +68,7 @@ def start_interview():
             'status': 'in-progress'
         }
         
-        interview_sessions[session_id] = session
+        session_store.set('interview', session_id, session)
         
         logger.info(f"Started interview session {session_id} with {len(selected_questions)} questions")
         
@@ -162,11 +97,10 @@ def submit_response():
         transcription = data.get('transcription', '')
         duration = data.get('duration', 0)
         
-        if not session_id or session_id not in interview_sessions:
+        session = session_store.get('interview', session_id) if session_id else None
+        if session is None:
             return format_error('Invalid session ID', 400)
         
-        session = interview_sessions[session_id]
-        
         # Find the question
         current_question = None
         for q in session['questions']:
@@ -189,12 +123,24 @@ def submit_response():
             'timestamp': datetime.now().isoformat()
         }
         
-        # Add to session
-        session['responses'].append(response)
+        def record_response(session):
+            if session is None:
+                raise ValueError('Interview session expired')
+            
+            session['responses'].append(response)
+            
+            # Move to next question or complete interview
+            if session['currentQuestionIndex'] < len(session['questions']) - 1:
+                session['currentQuestionIndex'] += 1
+            else:
+                session['status'] = 'completed'
+                session['endTime'] = datetime.now().isoformat()
+            return session
+        
+        # Apply atomically so concurrent submissions can't lose a response
+        session = session_store.update('interview', session_id, record_response)
         
-        # Move to next question or complete interview
-        if session['currentQuestionIndex'] < len(session['questions']) - 1:
-            session['currentQuestionIndex'] += 1
+        if session['status'] != 'completed':
             next_question = session['questions'][session['currentQuestionIndex']]
             
             return format_response({
@@ -204,10 +150,6 @@ def submit_response():
                 'analysis': analysis
             })
         else:
-            # Interview completed
-            session['status'] = 'completed'
-            session['endTime'] = datetime.now().isoformat()
-            
             # Calculate final results
             results = calculate_interview_results(session)
             
@@ -225,10 +167,10 @@ def submit_response():
 def get_session(session_id):
     """Get interview session details"""
     try:
-        if session_id not in interview_sessions:
+        session = session_store.get('interview', session_id)
+        if session is None:
             return format_error('Session not found', 404)
         
-        session = interview_sessions[session_id]
         return format_response(session)
         
     except Exception as e:
@@ -239,11 +181,10 @@ def get_session(session_id):
 def get_results(session_id):
     """Get interview results"""
     try:
-        if session_id not in interview_sessions:
+        session = session_store.get('interview', session_id)
+        if session is None:
             return format_error('Session not found', 404)
         
-        session = interview_sessions[session_id]
-        
         if session['status'] != 'completed':
             return format_error('Interview not completed yet', 400)
         
@@ -405,15 +346,16 @@ def calculate_interview_results(session: Dict) -> Dict:
 def get_questions(interview_type):
     """Get available questions for an interview type"""
     try:
-        if interview_type not in INTERVIEW_QUESTIONS:
+        questions_by_type = question_catalog.questions
+        if interview_type not in questions_by_type:
             return format_error('Invalid interview type', 400)
         
-        questions = INTERVIEW_QUESTIONS[interview_type]
-        return format_response({
+        questions = questions_by_type[interview_type]
+        return static_payloads.get(('questions', interview_type), questions_by_type, lambda: {
             'type': interview_type,
             'questions': questions,
             'total': len(questions)
-        })
+        }).to_response()
         
     except Exception as e:
         logger.error(f"Error getting questions: {str(e)}")
@@ -423,20 +365,26 @@ def get_questions(interview_type):
 def get_interview_types():
     """Get available interview types"""
     try:
-        types = []
-        for interview_type, questions in INTERVIEW_QUESTIONS.items():
-            types.append({
-                'type': interview_type,
-                'name': interview_type.replace('-', ' ').title(),
-                'questionCount': len(questions),
-                'difficulties': list(set(q['difficulty'] for q in questions))
-            })
-        
-        return format_response({
-            'types': types,
-            'total': len(types)
-        })
+        questions_by_type = question_catalog.questions
+        return static_payloads.get('types', questions_by_type, lambda: build_interview_types(questions_by_type)).to_response()
         
     except Exception as e:
         logger.error(f"Error getting interview types: {str(e)}")
-        return format_error(f'Failed to get interview types: {str(e)}', 500)
\ No newline at end of file
+        return format_error(f'Failed to get interview types: {str(e)}', 500)
+
+def build_interview_types(questions_by_type: Dict[str, List[Dict]]) -> Dict:
+    """Summary of each interview type in the question catalog"""
+    types = []
+    for interview_type, questions in questions_by_type.items():
+        types.append({
+            'type': interview_type,
+            'name': interview_type.replace('-', ' ').title(),
+            'questionCount': len(questions),
+            # Sorted so the payload (and its ETag) is identical in every worker
+            'difficulties': sorted(set(q['difficulty'] for q in questions))
+        })
+    
+    return {
+        'types': types,
+        'total': len(types)
+    }
\ No newline at end of file
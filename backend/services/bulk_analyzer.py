@@ -0,0 +1,265 @@
+"""
+Bulk scoring of many resumes against one job description.
+
+Results are produced as a stream of records (one per resume, then a summary),
+suitable for NDJSON output. From the command line:
+
+    python -m services.bulk_analyzer --job-description jd.txt --input resumes.zip > results.ndjson
+    python -m services.bulk_analyzer --job-description jd.pdf --input ./resumes --output results.ndjson
+"""
+import os
+import sys
+import json
+import time
+import logging
+import zlib
+import zipfile
+import argparse
+import threading
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.extraction_pool import ExtractionPool, ExtractionError
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Fields returned per resume unless the full analysis is requested
+SUMMARY_FIELDS = ['finalScore', 'jobMatchScore', 'scores', 'foundSkills', 'missingKeywords', 'missingSections']
+
+# Reported for files larger than the per-file limit
+OVERSIZED_ERROR = 'File exceeds the size limit'
+
+# (file name, file bytes, error); bytes are None when the file was rejected before
+# extraction, and error says why
+SourceFile = Tuple[str, Optional[bytes], Optional[str]]
+
+
+def _is_resume(name: str) -> bool:
+    base = os.path.basename(name)
+    return not base.startswith('.') and base.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def iter_zip(archive: zipfile.ZipFile, max_file_bytes: int) -> Iterator[SourceFile]:
+    """Resume files inside an opened zip archive; oversized or unreadable entries are reported, not read"""
+    for info in archive.infolist():
+        if info.is_dir() or info.filename.startswith('__MACOSX/') or not _is_resume(info.filename):
+            continue
+        if info.file_size > max_file_bytes:
+            yield info.filename, None, OVERSIZED_ERROR
+            continue
+        try:
+            data = archive.read(info)
+        except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+            # CRC mismatch or truncated member; the other entries are still readable
+            yield info.filename, None, f'Corrupt archive entry: {str(e)}'
+            continue
+        except (RuntimeError, NotImplementedError) as e:
+            # Encrypted member or unsupported compression method
+            yield info.filename, None, f'Unreadable archive entry: {str(e)}'
+            continue
+        yield info.filename, data, None
+
+
+def iter_directory(path: str, max_file_bytes: int) -> Iterator[SourceFile]:
+    """Resume files under a directory, in sorted order"""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if not _is_resume(name):
+                continue
+            file_path = os.path.join(root, name)
+            relative = os.path.relpath(file_path, path)
+            if os.path.getsize(file_path) > max_file_bytes:
+                yield relative, None, OVERSIZED_ERROR
+                continue
+            with open(file_path, 'rb') as f:
+                yield relative, f.read(), None
+
+
+class BulkAnalyzer:
+    """
+    Scores a batch of resumes against a single job description.
+
+    Extraction is fanned out over the extraction pool with a bounded number of
+    files in flight. Extracted text is scored in batches with
+    ResumeAnalyzer.analyze_resumes, which processes the job description once
+    and batches spaCy with nlp.pipe. If a batch fails, its remaining resumes are
+    scored one at a time so only the resume at fault gets an error record.
+    Records are yielded as soon as each batch is scored.
+    """
+
+    def __init__(self, resume_analyzer, extraction_pool: ExtractionPool, batch_size: int = 32,
+                 max_files: int = 5000):
+        self.resume_analyzer = resume_analyzer
+        self.extraction_pool = extraction_pool
+        self.batch_size = batch_size
+        self.max_files = max_files
+
+    def analyze(self, sources: Iterable[SourceFile], job_description: str, full: bool = False) -> Iterator[Dict]:
+        """Yield one record per resume followed by a summary record"""
+        started = time.time()
+        counts = {'succeeded': 0, 'failed': 0}
+        failures = deque()
+
+        def extracted():
+            for name, text, error in self._extract_all(sources):
+                if error:
+                    failures.append(self._error_record(name, error))
+                else:
+                    yield text, name
+
+        items = extracted()
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                break
+            for name, analysis, error in self._analyze_batch(batch, job_description):
+                while failures:
+                    counts['failed'] += 1
+                    yield failures.popleft()
+                if error:
+                    counts['failed'] += 1
+                    yield self._error_record(name, error)
+                else:
+                    counts['succeeded'] += 1
+                    yield self._result_record(name, analysis, full)
+
+        while failures:
+            counts['failed'] += 1
+            yield failures.popleft()
+
+        yield {
+            'type': 'summary',
+            'total': counts['succeeded'] + counts['failed'],
+            'succeeded': counts['succeeded'],
+            'failed': counts['failed'],
+            'seconds': round(time.time() - started, 2)
+        }
+
+    def _analyze_batch(self, batch: List[Tuple[str, str]],
+                       job_description: str) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+        """Yield (name, analysis, error) for (text, name) pairs; a resume that fails does not fail the rest"""
+        done = 0
+        try:
+            results = self.resume_analyzer.analyze_resumes(
+                batch, job_description, batch_size=self.batch_size, as_tuples=True
+            )
+            for analysis, name in results:
+                done += 1
+                yield name, analysis, None
+            return
+        except Exception as e:
+            logger.warning(f"Batch analysis failed, retrying {len(batch) - done} resumes one at a time: {str(e)}")
+
+        for text, name in batch[done:]:
+            try:
+                analysis = self.resume_analyzer.analyze_resume(text, job_description)
+            except Exception as e:
+                logger.error(f"Error analyzing {name}: {str(e)}")
+                yield name, None, f'Analysis failed: {str(e)}'
+            else:
+                yield name, analysis, None
+
+    def _error_record(self, name: str, error: str) -> Dict:
+        return {'type': 'result', 'file': name, 'status': 'error', 'error': error}
+
+    def _result_record(self, name: str, analysis: Dict, full: bool) -> Dict:
+        record = {'type': 'result', 'file': name, 'status': 'ok'}
+        if full:
+            record['analysis'] = analysis
+        else:
+            record.update({field: analysis[field] for field in SUMMARY_FIELDS if field in analysis})
+        return record
+
+    def _extract_one(self, name: str, data: bytes, cancel: threading.Event) -> Tuple[str, Optional[str], Optional[str]]:
+        try:
+            text = self.extraction_pool.extract_text(data, name, cancel=cancel)
+        except ExtractionError as e:
+            return name, None, str(e)
+        if not text.strip():
+            return name, None, 'No text could be extracted'
+        return name, text, None
+
+    def _extract_all(self, sources: Iterable[SourceFile]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Extract files concurrently, yielding (name, text, error) in completion order"""
+        workers = self.extraction_pool.max_workers
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-extract')
+        # Set when the consumer stops early (e.g. the client disconnected from the stream)
+        cancel = threading.Event()
+        pending = set()
+        try:
+            for index, (name, data, error) in enumerate(sources):
+                if index >= self.max_files:
+                    yield name, None, f'Batch limit of {self.max_files} files reached; remaining files skipped'
+                    break
+                if not _is_resume(name):
+                    yield name, None, f"Unsupported file type; expected {', '.join(SUPPORTED_EXTENSIONS)}"
+                    continue
+                if error:
+                    yield name, None, error
+                    continue
+
+                pending.add(executor.submit(self._extract_one, name, data, cancel))
+                # Keep a bounded window in flight so large batches never sit in memory at once
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Score a folder or zip of resumes against one job description')
+    parser.add_argument('--job-description', required=True, help='Job description file (.txt, .pdf or .docx)')
+    parser.add_argument('--input', required=True, help='Zip archive or directory of resumes')
+    parser.add_argument('--output', help='NDJSON output file (defaults to stdout)')
+    parser.add_argument('--full', action='store_true', help='Include the full analysis for every resume')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--workers', type=int, help='Concurrent extraction processes (defaults to CPU count)')
+    parser.add_argument('--max-files', type=int, default=100000)
+    parser.add_argument('--max-file-mb', type=int, default=16)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    from services.resume_analyzer import ResumeAnalyzer
+
+    pool = ExtractionPool(max_workers=args.workers)
+    max_file_bytes = args.max_file_mb * 1024 * 1024
+
+    with open(args.job_description, 'rb') as f:
+        job_description = pool.extract_text(f.read(), os.path.basename(args.job_description))
+
+    analyzer = BulkAnalyzer(ResumeAnalyzer(), pool, batch_size=args.batch_size, max_files=args.max_files)
+    archive = None
+    if os.path.isdir(args.input):
+        sources = iter_directory(args.input, max_file_bytes)
+    else:
+        archive = zipfile.ZipFile(args.input)
+        sources = iter_zip(archive, max_file_bytes)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for record in analyzer.analyze(sources, job_description, full=args.full):
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+    finally:
+        if archive is not None:
+            archive.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
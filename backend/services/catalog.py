@@ -0,0 +1,224 @@
+"""
+On-disk course and interview question catalogs.
+
+Layout of the data directory (CATALOG_DIR, default backend/data):
+
+    courses.jsonl                 one course summary per line (no modules)
+    course_modules/<id>.json      module list for one course, loaded on demand
+    learning_paths.jsonl          one learning path per line
+    interview_questions.jsonl     one question per line, with its interview "type"
+
+Files are re-read when their mtime changes (checked at most every
+CATALOG_RELOAD_INTERVAL seconds), so the catalog can be updated without
+restarting workers. Replace files atomically (write a temp file, then rename)
+so a reload never sees a half-written file.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from services.course_index import CourseIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def read_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {str(e)}")
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class WatchedFile:
+    """A parsed data file that is reloaded when its mtime changes"""
+
+    def __init__(self, path: str, parse: Callable[[str], Any], check_interval: float,
+                 on_reload: Optional[Callable[[Any, Any], None]] = None):
+        self.path = path
+        self.parse = parse
+        self.check_interval = check_interval
+        self.on_reload = on_reload
+        self._value = None
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        if self._value is None or now - self._checked >= self.check_interval:
+            with self._lock:
+                if self._value is None or now - self._checked >= self.check_interval:
+                    self._checked = now
+                    self._refresh()
+        return self._value
+
+    def _refresh(self):
+        mtime = _mtime(self.path)
+        if self._value is not None and mtime == self._mtime:
+            return
+        if mtime is None:
+            if self._value is None:
+                logger.warning(f"Catalog file not found: {self.path}")
+                self._swap(self.parse(None))
+            return
+        try:
+            value = self.parse(self.path)
+        except Exception as e:
+            # Keep serving the previous version until the file is fixed
+            logger.error(f"Failed to load {self.path}: {str(e)}")
+            if self._value is None:
+                self._swap(self.parse(None))
+            return
+        self._mtime = mtime
+        self._swap(value)
+        logger.info(f"Loaded catalog file {self.path}")
+
+    def _swap(self, value: Any):
+        # Derived state is brought up to date before readers can see the new value
+        if self.on_reload:
+            self.on_reload(self._value, value)
+        self._value = value
+
+
+class CourseCatalog:
+    """
+    Course summaries and learning paths held in memory, module bodies read lazily.
+
+    The search index is kept in step with courses.jsonl: on reload only added,
+    changed and removed courses are re-indexed, and the new courses are only
+    published once the index matches them.
+    """
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, check_interval: float = 5, module_cache_size: int = 256):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self.module_cache_size = module_cache_size
+        self.index = CourseIndex()
+        self._courses = WatchedFile(os.path.join(data_dir, 'courses.jsonl'), self._parse_by_id,
+                                    check_interval, self._reindex)
+        self._paths = WatchedFile(os.path.join(data_dir, 'learning_paths.jsonl'), self._parse_by_id,
+                                  check_interval)
+        self._modules = OrderedDict()  # course id -> (mtime, modules), least recently used first
+        self._modules_lock = threading.Lock()
+
+    @staticmethod
+    def _parse_by_id(path: Optional[str]) -> Dict[str, Dict]:
+        if path is None:
+            return {}
+        return {str(entry['id']): entry for entry in read_jsonl(path)}
+
+    def _reindex(self, previous: Optional[Dict], current: Dict):
+        previous = previous or {}
+        self.index.update(
+            (course for course_id, course in current.items() if previous.get(course_id) != course),
+            removed=previous.keys() - current.keys()
+        )
+
+    @property
+    def courses(self) -> Dict[str, Dict]:
+        """Course summaries by id (shared; copy before modifying)"""
+        return self._courses.get()
+
+    @property
+    def learning_paths(self) -> Dict[str, Dict]:
+        return self._paths.get()
+
+    def get_index(self) -> CourseIndex:
+        """The search index, refreshed from disk if courses.jsonl changed"""
+        self._courses.get()
+        return self.index
+
+    def get_modules(self, course_id: str) -> List[Dict]:
+        """Module list for a course (shared; copy before modifying)"""
+        path = os.path.join(self.data_dir, 'course_modules', f'{os.path.basename(course_id)}.json')
+        mtime = _mtime(path)
+        if mtime is None:
+            return []
+
+        with self._modules_lock:
+            cached = self._modules.get(course_id)
+            if cached is not None and cached[0] == mtime:
+                self._modules.move_to_end(course_id)
+                return cached[1]
+
+        with open(path, encoding='utf-8') as f:
+            modules = json.load(f)
+
+        with self._modules_lock:
+            self._modules[course_id] = (mtime, modules)
+            self._modules.move_to_end(course_id)
+            while len(self._modules) > self.module_cache_size:
+                self._modules.popitem(last=False)
+        return modules
+
+
+class QuestionCatalog:
+    """Mock interview questions grouped by interview type"""
+
+    def __init__(self, data_dir: str = DEFAULT_DATA_DIR, check_interval: float = 5):
+        self._questions = WatchedFile(os.path.join(data_dir, 'interview_questions.jsonl'), self._parse,
+                                      check_interval)
+
+    @staticmethod
+    def _parse(path: Optional[str]) -> Dict[str, List[Dict]]:
+        grouped: Dict[str, List[Dict]] = {}
+        if path is None:
+            return grouped
+        for question in read_jsonl(path):
+            interview_type = question.pop('type')
+            grouped.setdefault(interview_type, []).append(question)
+        return grouped
+
+    @property
+    def questions(self) -> Dict[str, List[Dict]]:
+        """Questions by interview type (shared; copy before modifying)"""
+        return self._questions.get()
+
+
+_course_catalog: Optional[CourseCatalog] = None
+_question_catalog: Optional[QuestionCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def _catalog_settings():
+    return os.getenv('CATALOG_DIR', DEFAULT_DATA_DIR), float(os.getenv('CATALOG_RELOAD_INTERVAL', 5))
+
+
+def get_course_catalog() -> CourseCatalog:
+    """Process-wide course catalog configured from CATALOG_* environment variables"""
+    global _course_catalog
+    if _course_catalog is None:
+        with _catalog_lock:
+            if _course_catalog is None:
+                data_dir, interval = _catalog_settings()
+                _course_catalog = CourseCatalog(data_dir, interval)
+    return _course_catalog
+
+
+def get_question_catalog() -> QuestionCatalog:
+    """Process-wide interview question catalog configured from CATALOG_* environment variables"""
+    global _question_catalog
+    if _question_catalog is None:
+        with _catalog_lock:
+            if _question_catalog is None:
+                data_dir, interval = _catalog_settings()
+                _question_catalog = QuestionCatalog(data_dir, interval)
+    return _question_catalog
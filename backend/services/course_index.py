@@ -0,0 +1,260 @@
+import re
+import heapq
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Relevance weight of a query term per field it occurs in
+FIELD_WEIGHTS = {'title': 3.0, 'skills': 2.0, 'description': 1.0}
+
+# A query term that only prefixes an indexed term ("reac" -> "react") counts for less,
+# and one found elsewhere inside it ("script" -> "javascript") for less still
+PREFIX_WEIGHT = 0.5
+INFIX_WEIGHT = 0.25
+
+# Partial matches are found through a trigram index, so shorter query terms ("c", "go",
+# "c#") match whole tokens only
+MIN_PARTIAL_LENGTH = 3
+
+# sortBy value -> (course field, descending)
+SORT_FIELDS = {
+    'popular': ('students', True),
+    'rating': ('rating', True),
+    'price-low': ('price', False),
+    'price-high': ('price', True)
+}
+
+# Keeps tokens such as c++, c#, node.js and ci/cd-style fragments intact
+_TOKEN = re.compile(r'[\w+#]+(?:\.[\w+#]+)*')
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _trigrams(term: str) -> Set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def _members(bits: int) -> str:
+    """Bitmap as a string indexed by slot ('1' where the bit is set)"""
+    return bin(bits)[:1:-1]
+
+
+class CourseIndex:
+    """
+    In-memory search index over the course catalog.
+
+    Every course gets a dense integer slot. Title, description and skill tokens
+    map to postings of slot -> field-weighted score, used for matching and
+    relevance ranking. Category and difficulty facets are integer bitmaps over
+    the slots, so facet filters are a couple of ANDs regardless of catalog
+    size. Sort orders are cached and results are paginated with partial sorts.
+    Courses can be added, replaced or removed one at a time or in batches.
+    """
+
+    def __init__(self, courses: Iterable[Dict] = ()):
+        self._lock = threading.RLock()
+        self._slots: Dict[str, int] = {}           # course id -> slot
+        self._ids: List[Optional[str]] = []        # slot -> course id
+        self._free: List[int] = []                 # released slots, reused first
+        self._live = 0                             # bitmap of occupied slots
+        self._postings: Dict[str, Dict[int, float]] = {}  # term -> slot -> weight
+        self._grams: Dict[str, Set[str]] = {}      # trigram -> terms containing it
+        self._terms: Dict[int, List[str]] = {}     # slot -> indexed terms
+        self._facets: Dict[str, Dict[str, int]] = {'category': {}, 'difficulty': {}}
+        self._facet_keys: Dict[int, Dict[str, str]] = {}  # slot -> facet -> value
+        self._sort_values: Dict[str, List] = {field: [] for field, _ in SORT_FIELDS.values()}
+        self._orders: Dict[str, Tuple[List[int], Dict[int, int]]] = {}  # sortBy -> (slots, slot -> rank)
+        for course in courses:
+            self.add(course)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, course_id: str) -> bool:
+        return course_id in self._slots
+
+    def add(self, course: Dict):
+        """Index a course, replacing any previous version with the same id"""
+        with self._lock:
+            course_id = course['id']
+            if course_id in self._slots:
+                self._unindex(course_id)
+
+            slot = self._free.pop() if self._free else len(self._ids)
+            if slot == len(self._ids):
+                self._ids.append(None)
+                for values in self._sort_values.values():
+                    values.append(None)
+            self._ids[slot] = course_id
+            self._slots[course_id] = slot
+            bit = 1 << slot
+            self._live |= bit
+
+            terms: Dict[str, float] = {}
+            fields = {
+                'title': course.get('title', ''),
+                'description': course.get('description', ''),
+                'skills': ' '.join(course.get('skills', []))
+            }
+            for field, text in fields.items():
+                for term in tokenize(text):
+                    terms[term] = terms.get(term, 0.0) + FIELD_WEIGHTS[field]
+            for term, weight in terms.items():
+                if term not in self._postings:
+                    self._postings[term] = {}
+                    for gram in _trigrams(term):
+                        self._grams.setdefault(gram, set()).add(term)
+                self._postings[term][slot] = weight
+            self._terms[slot] = list(terms)
+
+            keys = {}
+            for facet, values in self._facets.items():
+                key = str(course.get(facet, '')).lower()
+                values[key] = values.get(key, 0) | bit
+                keys[facet] = key
+            self._facet_keys[slot] = keys
+
+            for field, values in self._sort_values.items():
+                values[slot] = course.get(field) or 0
+            self._orders.clear()
+
+    def remove(self, course_id: str):
+        with self._lock:
+            if course_id in self._slots:
+                self._unindex(course_id)
+                self._orders.clear()
+
+    def update(self, changed: Iterable[Dict], removed: Iterable[str] = ()):
+        """Apply a batch of additions/replacements and removals atomically with respect to searches"""
+        with self._lock:
+            for course_id in removed:
+                self.remove(course_id)
+            for course in changed:
+                self.add(course)
+
+    def _unindex(self, course_id: str):
+        slot = self._slots.pop(course_id)
+        mask = ~(1 << slot)
+        self._live &= mask
+
+        for term in self._terms.pop(slot):
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+                for gram in _trigrams(term):
+                    terms = self._grams[gram]
+                    terms.discard(term)
+                    if not terms:
+                        del self._grams[gram]
+
+        for facet, key in self._facet_keys.pop(slot).items():
+            values = self._facets[facet]
+            values[key] &= mask
+            if not values[key]:
+                del values[key]
+
+        self._ids[slot] = None
+        self._free.append(slot)
+
+    def _containing(self, term: str) -> List[str]:
+        """Indexed terms that contain term (at least MIN_PARTIAL_LENGTH characters long)"""
+        grams = sorted((self._grams.get(gram, ()) for gram in _trigrams(term)), key=len)
+        if not grams or not grams[0]:
+            return []
+        # Sharing every trigram is necessary but not sufficient ("abcab" has "abc" and "bca")
+        candidates = grams[0].intersection(*grams[1:]) if len(grams) > 1 else grams[0]
+        return [candidate for candidate in candidates if term in candidate]
+
+    def _match_term(self, term: str) -> Dict[int, float]:
+        """slot -> best weight for a query term, over exact, prefix and infix matches (do not mutate)"""
+        exact = self._postings.get(term)
+        if len(term) < MIN_PARTIAL_LENGTH:
+            return exact or {}
+        partial = [candidate for candidate in self._containing(term) if candidate != term]
+        if not partial:
+            return exact or {}
+
+        best = dict(exact) if exact else {}
+        for candidate in partial:
+            factor = PREFIX_WEIGHT if candidate.startswith(term) else INFIX_WEIGHT
+            for slot, weight in self._postings[candidate].items():
+                weight *= factor
+                if weight > best.get(slot, 0.0):
+                    best[slot] = weight
+        return best
+
+    def _order(self, sort_by: str) -> Tuple[List[int], Dict[int, int]]:
+        order = self._orders.get(sort_by)
+        if order is None:
+            field, descending = SORT_FIELDS[sort_by]
+            values = self._sort_values[field]
+            slots = [slot for slot, course_id in enumerate(self._ids) if course_id is not None]
+            slots.sort(key=lambda slot: values[slot], reverse=descending)
+            order = (slots, {slot: rank for rank, slot in enumerate(slots)})
+            self._orders[sort_by] = order
+        return order
+
+    def search(self, query: str = '', category: str = 'all', difficulty: str = 'all',
+               sort_by: Optional[str] = None, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[str], int]:
+        """
+        Return (course ids for the requested page, total matches).
+
+        Every query term must match a title, description or skill token, either
+        exactly or, for terms of MIN_PARTIAL_LENGTH or more characters, as part
+        of it (prefix matches rank above other substrings). Results are ranked
+        by relevance (ties broken by popularity) when there is a query and
+        ``sort_by`` is None or 'relevance'; otherwise by ``sort_by`` (see
+        SORT_FIELDS), defaulting to popularity.
+        """
+        with self._lock:
+            bits = self._live
+            if category and category != 'all':
+                bits &= self._facets['category'].get(category.lower(), 0)
+            if difficulty and difficulty != 'all':
+                bits &= self._facets['difficulty'].get(difficulty.lower(), 0)
+            if not bits:
+                return [], 0
+            members = _members(bits)
+            order_by = sort_by if sort_by in SORT_FIELDS else 'popular'
+            terms = list(dict.fromkeys(tokenize(query)))
+
+            if not terms:
+                # Walk the cached sort order and keep slots that pass the facets
+                total = bits.bit_count()
+                end = offset + limit if limit is not None else total
+                page = []
+                seen = 0
+                for slot in self._order(order_by)[0]:
+                    if slot < len(members) and members[slot] == '1':
+                        if seen >= offset:
+                            page.append(self._ids[slot])
+                        seen += 1
+                        if seen >= end:
+                            break
+                return page, total
+
+            # Intersect term matches smallest first, summing their weights
+            matches = sorted((self._match_term(term) for term in terms), key=len)
+            if bits == self._live:
+                scores = dict(matches[0])
+            else:
+                scores = {slot: weight for slot, weight in matches[0].items()
+                          if slot < len(members) and members[slot] == '1'}
+            for other in matches[1:]:
+                if not scores:
+                    break
+                scores = {slot: weight + other[slot] for slot, weight in scores.items() if slot in other}
+
+            total = len(scores)
+            end = offset + limit if limit is not None else total
+            if sort_by in (None, 'relevance'):
+                ranks = self._order('popular')[1]
+                ranked = heapq.nlargest(end, scores, key=lambda slot: (scores[slot], -ranks[slot]))
+            else:
+                ranked = heapq.nsmallest(end, scores, key=self._order(order_by)[1].__getitem__)
+            return [self._ids[slot] for slot in ranked[offset:]], total
@@ -0,0 +1,282 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from services.worker_processes import get_worker_context
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting request checks for cancellation
+POLL_INTERVAL = 0.1
+
+
+class ExtractionError(Exception):
+    """Raised when a document could not be extracted in the worker process"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when extraction exceeded its wall-clock limit"""
+
+
+class ExtractionCancelled(ExtractionError):
+    """Raised when the caller cancelled an in-flight extraction"""
+
+
+class _ParserError(ExtractionError):
+    """The parser rejected the document; the worker that reported it is still usable"""
+
+
+def _address_space_size() -> int:
+    """Current virtual memory size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _out_of_memory(error: BaseException) -> bool:
+    """Whether a MemoryError caused this error (FileProcessor re-wraps parser errors)"""
+    while error is not None:
+        if isinstance(error, MemoryError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _worker_main(conn, memory_limit: int):
+    """Worker process entry point: apply limits once, then extract documents until told to stop"""
+    if resource is not None and memory_limit:
+        # The budget is on top of what the worker needs at start-up (interpreter and parsers)
+        limit = _address_space_size() + memory_limit
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    from services.file_processor import FileProcessor
+    processor = FileProcessor()
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+
+        method, data, filename = task
+        try:
+            conn.send(('ok', getattr(processor, method)(data, filename)))
+        except Exception as e:
+            if _out_of_memory(e):
+                # The heap may be left fragmented near the limit; report and let the pool replace us
+                conn.send(('fatal', 'Document exceeded the extraction memory limit'))
+                break
+            conn.send(('error', str(e)))
+    conn.close()
+
+
+class _Worker:
+    """One long-lived extraction process and the pipe used to talk to it"""
+
+    def __init__(self, context, memory_limit: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_limit), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self):
+        """Ask the worker to exit after its current task; kill it if it does not"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Runs PDF/DOCX extraction in a pool of long-lived worker processes.
+
+    Workers are started on demand (at most ``max_workers``) from the shared
+    fork server (see services.worker_processes), so the threaded server
+    process is never forked. Each worker handles up to ``max_tasks_per_worker``
+    files and is then replaced, which bounds memory creep. A file that hangs,
+    exceeds the memory limit, crashes the parser or is cancelled by the caller
+    gets its worker killed and replaced; other files in flight are not affected.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: float = 30, memory_limit_mb: int = 512,
+                 max_tasks_per_worker: int = 100):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._idle: List[_Worker] = []
+        self._busy = set()
+        self._lock = threading.Lock()
+        self._metrics = {'completed': 0, 'failed': 0, 'timeouts': 0, 'cancelled': 0,
+                         'workers_started': 0, 'workers_replaced': 0}
+
+        self._context = get_worker_context()
+
+    def extract_document(self, data: bytes, filename: str, timeout: Optional[float] = None,
+                         cancel: Optional[threading.Event] = None) -> Dict:
+        """FileProcessor.extract_document in a worker process"""
+        return self._run('extract_document', data, filename, timeout, cancel)
+
+    def extract_text(self, data: bytes, filename: str, timeout: Optional[float] = None,
+                     cancel: Optional[threading.Event] = None) -> str:
+        """FileProcessor.extract_text in a worker process"""
+        return self._run('extract_text', data, filename, timeout, cancel)
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                worker.kill()
+            worker = _Worker(self._context, self.memory_limit)
+            self._count('workers_started')
+        with self._lock:
+            self._busy.add(worker)
+        return worker
+
+    def _checkin(self, worker: _Worker, healthy: bool):
+        with self._lock:
+            self._busy.discard(worker)
+            keep = healthy and worker.tasks < self.max_tasks_per_worker
+            if keep:
+                self._idle.append(worker)
+        if not keep:
+            if healthy:
+                worker.stop()
+            else:
+                worker.kill()
+                self._count('workers_replaced')
+
+    def _run(self, method: str, data: bytes, filename: str, timeout: Optional[float],
+             cancel: Optional[threading.Event]):
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        # Waiting for a free slot counts against the same deadline
+        if not self._slots.acquire(timeout=timeout):
+            self._count('timeouts')
+            raise ExtractionTimeout(f"No extraction worker became available within {timeout}s")
+
+        try:
+            worker = self._checkout()
+            healthy = False
+            try:
+                worker.conn.send((method, data, filename))
+                result = self._wait(worker, filename, deadline, timeout, cancel)
+                healthy = True
+                return result
+            except _ParserError:
+                # Parser errors leave the worker usable; timeouts, cancels and crashes do not
+                healthy = True
+                raise
+            except (OSError, ValueError) as e:
+                self._count('failed')
+                raise ExtractionError(f"Extraction worker for {filename} is unavailable: {str(e)}")
+            finally:
+                worker.tasks += 1
+                self._checkin(worker, healthy)
+        finally:
+            self._slots.release()
+
+    def _wait(self, worker: _Worker, filename: str, deadline: float, timeout: float,
+              cancel: Optional[threading.Event]):
+        conn, process = worker.conn, worker.process
+        while True:
+            if cancel is not None and cancel.is_set():
+                self._count('cancelled')
+                raise ExtractionCancelled(f"Extraction of {filename} was cancelled")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count('timeouts')
+                logger.warning(f"Extraction of {filename} exceeded {timeout}s; killing worker {process.pid}")
+                raise ExtractionTimeout(f"Extraction of {filename} timed out after {timeout}s")
+
+            if conn.poll(min(POLL_INTERVAL, remaining)):
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    break
+                if status == 'ok':
+                    self._count('completed')
+                    return payload
+                self._count('failed')
+                raise (_ParserError if status == 'error' else ExtractionError)(payload)
+
+            if not process.is_alive() and not conn.poll():
+                break
+
+        # The worker exited without reporting back (crash or hard memory kill)
+        process.join()
+        self._count('failed')
+        raise ExtractionError(f"Extraction worker for {filename} exited unexpectedly (code {process.exitcode})")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def shutdown(self):
+        """Stop idle workers and kill any in-flight extractions"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            busy = list(self._busy)
+        for worker in idle:
+            worker.stop()
+        for worker in busy:
+            if worker.process.is_alive():
+                worker.process.kill()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._metrics)
+            stats['active'] = len(self._busy)
+            stats['idle'] = len(self._idle)
+        stats['max_workers'] = self.max_workers
+        stats['max_tasks_per_worker'] = self.max_tasks_per_worker
+        stats['timeout'] = self.timeout
+        stats['memory_limit_mb'] = self.memory_limit // (1024 * 1024)
+        return stats
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide extraction pool configured from EXTRACTION_* environment variables"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool(
+                    max_workers=int(os.getenv('EXTRACTION_WORKERS', 0)) or None,
+                    timeout=float(os.getenv('EXTRACTION_TIMEOUT', 30)),
+                    memory_limit_mb=int(os.getenv('EXTRACTION_MEMORY_MB', 512)),
+                    max_tasks_per_worker=int(os.getenv('EXTRACTION_MAX_TASKS_PER_WORKER', 100))
+                )
+    return _pool
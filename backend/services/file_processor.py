@@ -1,51 +1,163 @@
 import os
+import io
 import fitz  # PyMuPDF
 import docx
 import logging
-from typing import Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import tempfile
 import shutil
+from utils.text_normalizer import normalize
 
 logger = logging.getLogger(__name__)
 
+# A path on disk, raw file bytes (e.g. an upload buffer) or a readable binary stream
+Source = Union[str, bytes, BinaryIO]
+
+# (page number, text) for one page or block of a document
+Block = Tuple[int, str]
+
 class FileProcessor:
     def __init__(self):
         """Initialize file processor"""
         self.supported_extensions = ['.pdf', '.docx', '.txt']
+        # Extraction cutoffs so oversized documents can't pin a worker (0 disables)
+        self.max_pages = int(os.getenv('EXTRACT_MAX_PAGES', 50))
+        self.max_chars = int(os.getenv('EXTRACT_MAX_CHARS', 200000))
+    
+    def _resolve_source(self, source: Source, filename: Optional[str] = None) -> Tuple[Union[str, bytes], str, str]:
+        """Normalize a path, bytes or stream to (path or bytes, extension, display name)"""
+        if isinstance(source, str):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"File not found: {source}")
+            name = filename or source
+        else:
+            name = filename or getattr(source, 'filename', None) or getattr(source, 'name', None)
+            if not name:
+                raise ValueError("A filename is required to extract text from an in-memory upload")
+            if hasattr(source, 'read'):
+                source = source.read()
+            source = bytes(source)
         
-    def extract_text(self, file_path: str) -> str:
-        """Extract text from various file formats"""
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+        return source, os.path.splitext(name)[1].lower(), os.path.basename(name)
+    
+    def extract_document(self, source: Source, filename: Optional[str] = None) -> Dict:
+        """Extract text plus per-page character offsets into that text"""
+        source, file_extension, name = self._resolve_source(source, filename)
         
-        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension == '.pdf':
+            try:
+                pages = [text for _, text in self._limit(self._iter_pdf_pages(source))]
+            except Exception as e:
+                logger.error(f"Error extracting text from {name}: {str(e)}")
+                raise Exception(f"Failed to extract text: {str(e)}")
+            if not ''.join(pages).strip():
+                raise Exception("Failed to extract text: No text content found in PDF")
+        else:
+            pages = [self.extract_text(source, name)]
+        
+        text, page_index = self._assemble_pages(pages)
+        return {
+            'text': text,
+            'pages': page_index,
+            'format': file_extension.lstrip('.'),
+            'source': name,
+            'chars': len(text)
+        }
+    
+    def _assemble_pages(self, pages: List[str]):
+        """Join page texts and record where each page starts and ends in the result"""
+        parts = []
+        page_index = []
+        offset = 0
+        for page_number, page_text in enumerate(pages, 1):
+            parts.append(page_text)
+            page_index.append({'page': page_number, 'start': offset, 'end': offset + len(page_text)})
+            offset += len(page_text) + 1  # newline separator
+        
+        text = '\n'.join(parts)
+        stripped = text.strip()
+        lead = len(text) - len(text.lstrip())
+        for entry in page_index:
+            entry['start'] = min(max(0, entry['start'] - lead), len(stripped))
+            entry['end'] = min(max(0, entry['end'] - lead), len(stripped))
+        return stripped, page_index
+    
+    def iter_blocks(self, source: Source, filename: Optional[str] = None,
+                    max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Iterator[Block]:
+        """
+        Stream (page, text) blocks: one per page for PDFs, one per paragraph or
+        table row for DOCX, and a single block for TXT. Extraction stops once
+        ``max_pages`` pages or ``max_chars`` characters have been produced.
+        """
+        source, file_extension, name = self._resolve_source(source, filename)
+        
+        if file_extension == '.pdf':
+            blocks = self._iter_pdf_pages(source, max_pages)
+        elif file_extension == '.docx':
+            blocks = self._iter_docx_blocks(source)
+        elif file_extension == '.txt':
+            blocks = iter([(1, self._extract_from_txt(source))])
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        
+        return self._limit(blocks, max_chars)
+    
+    def _limit(self, blocks: Iterator[Block], max_chars: Optional[int] = None) -> Iterator[Block]:
+        """Stop a block stream once it has produced max_chars characters"""
+        max_chars = self.max_chars if max_chars is None else max_chars
+        total = 0
+        try:
+            for page, text in blocks:
+                if max_chars and total + len(text) > max_chars:
+                    yield page, text[:max_chars - total]
+                    logger.warning(f"Extraction truncated at {max_chars} characters (page {page})")
+                    return
+                total += len(text)
+                yield page, text
+        finally:
+            if hasattr(blocks, 'close'):
+                blocks.close()
+    
+    def extract_text(self, source: Source, filename: Optional[str] = None) -> str:
+        """Extract text from a file path, raw bytes or a stream (bytes/streams need a filename)"""
+        source, file_extension, name = self._resolve_source(source, filename)
         
         try:
             if file_extension == '.pdf':
-                return self._extract_from_pdf(file_path)
+                return self._extract_from_pdf(source)
             elif file_extension == '.docx':
-                return self._extract_from_docx(file_path)
+                return self._extract_from_docx(source)
             elif file_extension == '.txt':
-                return self._extract_from_txt(file_path)
+                text = self._extract_from_txt(source)
+                return text[:self.max_chars] if self.max_chars else text
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
                 
         except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {str(e)}")
+            logger.error(f"Error extracting text from {name}: {str(e)}")
             raise Exception(f"Failed to extract text: {str(e)}")
     
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
+    def _iter_pdf_pages(self, source: Union[str, bytes], max_pages: Optional[int] = None) -> Iterator[Block]:
+        """Yield the text of each PDF page, loading pages lazily"""
+        max_pages = self.max_pages if max_pages is None else max_pages
+        if isinstance(source, bytes):
+            doc = fitz.open(stream=source, filetype='pdf')
+        else:
+            doc = fitz.open(source)
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text += page.get_text()
-                text += "\n"  # Add page break
-            
+            page_count = len(doc)
+            if max_pages and page_count > max_pages:
+                logger.warning(f"PDF has {page_count} pages; extracting the first {max_pages}")
+                page_count = max_pages
+            for page_num in range(page_count):
+                yield page_num + 1, doc.load_page(page_num).get_text()
+        finally:
             doc.close()
+    
+    def _extract_from_pdf(self, source: Union[str, bytes]) -> str:
+        """Extract text from PDF file"""
+        try:
+            text = "\n".join(text for _, text in self._limit(self._iter_pdf_pages(source)))
             
             if not text.strip():
                 raise Exception("No text content found in PDF")
@@ -57,22 +169,10 @@ class FileProcessor:
             logger.error(f"Error reading PDF file: {str(e)}")
             raise Exception(f"Failed to read PDF: {str(e)}")
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    def _extract_from_docx(self, source: Union[str, bytes]) -> str:
         """Extract text from DOCX file"""
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
+            text = "\n".join(text for _, text in self._limit(self._iter_docx_blocks(source)))
             
             if not text.strip():
                 raise Exception("No text content found in DOCX")
@@ -84,10 +184,25 @@ class FileProcessor:
             logger.error(f"Error reading DOCX file: {str(e)}")
             raise Exception(f"Failed to read DOCX: {str(e)}")
     
-    def _extract_from_txt(self, file_path: str) -> str:
+    def _iter_docx_blocks(self, source: Union[str, bytes]) -> Iterator[Block]:
+        """Yield each DOCX paragraph, then each table row with its cells space-separated"""
+        doc = docx.Document(io.BytesIO(source) if isinstance(source, bytes) else source)
+        
+        # DOCX has no fixed pagination, so every block is reported on page 1
+        for paragraph in doc.paragraphs:
+            yield 1, paragraph.text
+        
+        for table in doc.tables:
+            for row in table.rows:
+                yield 1, "".join(cell.text + " " for cell in row.cells)
+    
+    def _extract_from_txt(self, source: Union[str, bytes]) -> str:
         """Extract text from TXT file"""
+        if isinstance(source, bytes):
+            return self._decode_txt(source)
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with open(source, 'r', encoding='utf-8') as file:
                 text = file.read()
             
             if not text.strip():
@@ -99,7 +214,7 @@ class FileProcessor:
         except UnicodeDecodeError:
             # Try with different encoding
             try:
-                with open(file_path, 'r', encoding='latin-1') as file:
+                with open(source, 'r', encoding='latin-1') as file:
                     text = file.read()
                 logger.info(f"Successfully extracted {len(text)} characters from TXT (latin-1)")
                 return text.strip()
@@ -110,6 +225,21 @@ class FileProcessor:
             logger.error(f"Error reading TXT file: {str(e)}")
             raise Exception(f"Failed to read TXT: {str(e)}")
     
+    def _decode_txt(self, data: bytes) -> str:
+        """Decode an in-memory TXT upload"""
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            text = data.decode('latin-1')
+        # Match the newline handling of text-mode reads from disk
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        if not text.strip():
+            raise Exception("No text content found in TXT file")
+        
+        logger.info(f"Successfully extracted {len(text)} characters from TXT")
+        return text.strip()
+    
     def validate_file_size(self, file_path: str, max_size_mb: int = 16) -> bool:
         """Validate file size"""
         try:
@@ -136,17 +266,7 @@ class FileProcessor:
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters that might cause issues
-        text = re.sub(r'[^\w\s\-\.\,\;\:\(\)\[\]\/\@\+\#\%\&\*]', '', text)
-        
-        # Normalize line breaks
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
-        
-        return text.strip()
+        return normalize(text).clean
     
     def create_temp_file(self, original_filename: str) -> str:
         """Create a temporary file path"""
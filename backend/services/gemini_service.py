@@ -2,23 +2,138 @@ import google.generativeai as genai
 import os
 from dotenv import load_dotenv
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 import json
 import time
+import threading
+from services.response_cache import ResponseCache
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+class LocalFakeModel:
+    """Offline stand-in for GenerativeModel used in development and tests"""
+    
+    class _Response:
+        def __init__(self, text: str):
+            self.text = text
+    
+    def __init__(self, delay: float = 0.0, reply: Optional[str] = None):
+        self.delay = delay
+        self.reply = reply
+    
+    def generate_content(self, prompt: str, stream: bool = False):
+        if self.delay:
+            time.sleep(self.delay)
+        text = self.reply if self.reply is not None else (
+            "1. Quantify achievements with concrete metrics\n"
+            "2. Lead each bullet with a strong action verb\n"
+            "3. Group technical skills by category\n"
+            f"(local fake model, prompt length {len(prompt)})"
+        )
+        if stream:
+            return [self._Response(line + "\n") for line in text.split("\n")]
+        return self._Response(text)
+
+class GeminiUnavailableError(Exception):
+    """Raised without calling the model while the circuit breaker is open"""
+
+class CircuitBreaker:
+    """
+    Tracks Gemini availability from real calls.
+    
+    After ``failure_threshold`` consecutive failures the breaker opens and callers
+    fail fast. Once ``reset_timeout`` seconds have passed a single trial call is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_success = None
+        self.last_failure = None
+        self.last_error = None
+        self.avg_latency = None
+        self.total_calls = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Whether a call may go to the model right now"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected_calls += 1
+            return False
+    
+    def record_success(self, latency: float):
+        with self._lock:
+            self.total_calls += 1
+            self.consecutive_failures = 0
+            self.state = 'closed'
+            self._trial_in_flight = False
+            self.last_success = time.time()
+            self._record_latency(latency)
+    
+    def record_failure(self, latency: float, error: str):
+        with self._lock:
+            self.total_calls += 1
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_failure = time.time()
+            self.last_error = error
+            self._record_latency(latency)
+            if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.time()
+            self._trial_in_flight = False
+    
+    def _record_latency(self, latency: float):
+        # Exponentially weighted moving average of call latency
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+    
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == 'open' and time.time() - self.opened_at < self.reset_timeout
+    
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'total_calls': self.total_calls,
+                'total_failures': self.total_failures,
+                'rejected_calls': self.rejected_calls,
+                'avg_latency_ms': round(self.avg_latency * 1000, 1) if self.avg_latency is not None else None,
+                'last_success': self.last_success,
+                'last_failure': self.last_failure,
+                'last_error': self.last_error
+            }
+
 class GeminiService:
-    def __init__(self):
-        """Initialize Gemini AI service"""
+    def __init__(self, model=None):
+        """Initialize Gemini AI service (optionally with an injected model)"""
         self.api_key = os.getenv('GEMINI_API_KEY')
-        self.model = None
-        self.is_configured_flag = False
+        self.model = model
+        self.is_configured_flag = model is not None
         
-        if self.api_key:
+        if self.model is None and os.getenv('GEMINI_FAKE_MODEL', '').lower() in ('1', 'true', 'yes'):
+            self.model = LocalFakeModel(delay=float(os.getenv('GEMINI_FAKE_DELAY', 0)))
+            self.is_configured_flag = True
+            logger.info("Using local fake Gemini model")
+        elif self.model is None and self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel("gemini-1.5-flash")
@@ -26,25 +141,98 @@ class GeminiService:
                 logger.info("Gemini AI service initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Gemini AI: {str(e)}")
-        else:
+        elif self.model is None:
             logger.warning("Gemini API key not found in environment variables")
+        
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv('GEMINI_BREAKER_THRESHOLD', 3)),
+            reset_timeout=float(os.getenv('GEMINI_BREAKER_RESET_SECONDS', 30))
+        )
+        self.response_cache = ResponseCache(
+            methods=[m.strip() for m in os.getenv(
+                'GEMINI_CACHE_METHODS', 'get_targeted_suggestions,optimize_for_ats,generate_cover_letter'
+            ).split(',') if m.strip()],
+            ttl=float(os.getenv('GEMINI_CACHE_TTL', 24 * 3600)),
+            max_bytes=int(os.getenv('GEMINI_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+            directory=os.getenv('GEMINI_CACHE_DIR') or None,
+            input_cost_per_1k=float(os.getenv('GEMINI_COST_PER_1K_INPUT_TOKENS', 0.000075)),
+            output_cost_per_1k=float(os.getenv('GEMINI_COST_PER_1K_OUTPUT_TOKENS', 0.0003))
+        )
+        self._probe_thread = None
+        self._probe_interval = 0
+        self._probe_stop = threading.Event()
+        self._probe_lock = threading.Lock()
     
     def is_configured(self) -> bool:
         """Check if Gemini service is properly configured"""
         return self.is_configured_flag
     
     def is_available(self) -> bool:
-        """Check if Gemini service is available"""
-        if not self.is_configured():
-            return False
+        """Check if Gemini service is available (cached breaker state, no network call)"""
+        return self.is_configured() and not self.breaker.is_open()
+    
+    def get_status(self) -> Dict:
+        """Detailed availability info for health reporting"""
+        status = self.breaker.snapshot()
+        status['configured'] = self.is_configured()
+        status['available'] = self.is_available()
+        status['probe_interval'] = self._probe_interval if self._probe_thread else None
+        return status
+    
+    def _generate(self, prompt: str):
+        """Call the model through the circuit breaker, recording outcome and latency"""
+        if not self.breaker.allow_request():
+            raise GeminiUnavailableError("Gemini AI service temporarily unavailable")
         
+        start = time.perf_counter()
         try:
-            # Test with a simple prompt
-            response = self.model.generate_content("Test connection")
-            return True
+            response = self.model.generate_content(prompt)
         except Exception as e:
-            logger.error(f"Gemini service unavailable: {str(e)}")
-            return False
+            self.breaker.record_failure(time.perf_counter() - start, str(e))
+            raise
+        self.breaker.record_success(time.perf_counter() - start)
+        return response
+    
+    def _generate_text(self, prompt: str, method: str) -> str:
+        """Generate response text, served from the response cache when the method opts in"""
+        use_cache = self.response_cache.enabled_for(method)
+        if use_cache:
+            cached = self.response_cache.get(method, prompt)
+            if cached is not None:
+                logger.info(f"Gemini response cache hit for {method}")
+                return cached
+        
+        start = time.perf_counter()
+        response_text = self._generate(prompt).text
+        if use_cache and response_text:
+            self.response_cache.put(method, prompt, response_text, time.perf_counter() - start)
+        return response_text
+    
+    def start_health_probe(self, interval: float):
+        """Probe Gemini in the background every ``interval`` seconds when there is no real traffic (idempotent)"""
+        if interval <= 0 or not self.is_configured() or self._probe_thread is not None:
+            return
+        
+        with self._probe_lock:
+            if self._probe_thread is not None:
+                return
+            self._probe_interval = interval
+            self._probe_thread = threading.Thread(target=self._probe_loop, name='gemini-probe', daemon=True)
+            self._probe_thread.start()
+        logger.info(f"Started Gemini health probe every {interval}s")
+    
+    def stop_health_probe(self):
+        self._probe_stop.set()
+    
+    def _probe_loop(self):
+        while not self._probe_stop.wait(self._probe_interval):
+            last_success = self.breaker.last_success
+            if last_success and time.time() - last_success < self._probe_interval:
+                continue  # Recent real calls already prove availability
+            try:
+                self._generate("Test connection")
+            except Exception as e:
+                logger.warning(f"Gemini health probe failed: {str(e)}")
     
     def rewrite_resume(self, resume_text: str, suggestions: List[str], missing_skills: List[str]) -> str:
         """Rewrite resume using Gemini AI with improvement suggestions"""
@@ -56,18 +244,48 @@ class GeminiService:
             prompt = self._create_rewrite_prompt(resume_text, suggestions, missing_skills)
             
             logger.info("Sending resume rewrite request to Gemini...")
-            response = self.model.generate_content(prompt)
+            response_text = self._generate_text(prompt, 'rewrite_resume')
             
-            if response.text:
+            if response_text:
                 logger.info("Resume rewrite completed successfully")
-                return response.text.strip()
+                return response_text.strip()
             else:
                 raise Exception("Empty response from Gemini AI")
                 
+        except GeminiUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error rewriting resume with Gemini: {str(e)}")
             raise Exception(f"Resume rewrite failed: {str(e)}")
     
+    def stream_rewrite_resume(self, resume_text: str, suggestions: List[str], missing_skills: List[str]) -> Iterator[str]:
+        """Rewrite resume with Gemini, yielding text chunks as the model produces them"""
+        if not self.is_configured():
+            raise Exception("Gemini AI service not configured")
+        
+        if not self.breaker.allow_request():
+            raise GeminiUnavailableError("Gemini AI service temporarily unavailable")
+        
+        prompt = self._create_rewrite_prompt(resume_text, suggestions, missing_skills)
+        
+        logger.info("Streaming resume rewrite from Gemini...")
+        start = time.perf_counter()
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except GeneratorExit:
+            # Client went away mid-stream; the model itself answered fine
+            self.breaker.record_success(time.perf_counter() - start)
+            raise
+        except Exception as e:
+            self.breaker.record_failure(time.perf_counter() - start, str(e))
+            logger.error(f"Error streaming resume rewrite from Gemini: {str(e)}")
+            raise Exception(f"Resume rewrite failed: {str(e)}")
+        
+        self.breaker.record_success(time.perf_counter() - start)
+        logger.info("Resume rewrite stream completed")
+    
     def get_targeted_suggestions(self, analysis_result: Dict, focus_area: str) -> List[str]:
         """Get targeted suggestions for specific areas of improvement"""
         if not self.is_configured():
@@ -77,16 +295,18 @@ class GeminiService:
             prompt = self._create_suggestions_prompt(analysis_result, focus_area)
             
             logger.info(f"Getting targeted suggestions for: {focus_area}")
-            response = self.model.generate_content(prompt)
+            response_text = self._generate_text(prompt, 'get_targeted_suggestions')
             
-            if response.text:
+            if response_text:
                 # Parse the response to extract suggestions
-                suggestions = self._parse_suggestions_response(response.text)
+                suggestions = self._parse_suggestions_response(response_text)
                 logger.info(f"Generated {len(suggestions)} targeted suggestions")
                 return suggestions
             else:
                 raise Exception("Empty response from Gemini AI")
                 
+        except GeminiUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error getting suggestions from Gemini: {str(e)}")
             raise Exception(f"Failed to get suggestions: {str(e)}")
@@ -100,16 +320,18 @@ class GeminiService:
             prompt = self._create_analysis_prompt(resume_text)
             
             logger.info("Requesting detailed content analysis from Gemini...")
-            response = self.model.generate_content(prompt)
+            response_text = self._generate_text(prompt, 'analyze_resume_content')
             
-            if response.text:
+            if response_text:
                 # Parse structured response
-                analysis = self._parse_analysis_response(response.text)
+                analysis = self._parse_analysis_response(response_text)
                 logger.info("Content analysis completed")
                 return analysis
             else:
                 raise Exception("Empty response from Gemini AI")
                 
+        except GeminiUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing content with Gemini: {str(e)}")
             raise Exception(f"Content analysis failed: {str(e)}")
@@ -123,15 +345,17 @@ class GeminiService:
             prompt = self._create_ats_optimization_prompt(resume_text, job_description)
             
             logger.info("Optimizing resume for ATS...")
-            response = self.model.generate_content(prompt)
+            response_text = self._generate_text(prompt, 'optimize_for_ats')
             
-            if response.text:
-                optimization = self._parse_ats_response(response.text)
+            if response_text:
+                optimization = self._parse_ats_response(response_text)
                 logger.info("ATS optimization completed")
                 return optimization
             else:
                 raise Exception("Empty response from Gemini AI")
                 
+        except GeminiUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error optimizing for ATS: {str(e)}")
             raise Exception(f"ATS optimization failed: {str(e)}")
@@ -310,14 +534,16 @@ Format as a complete cover letter ready to send.
 """
             
             logger.info(f"Generating cover letter for {company_name}")
-            response = self.model.generate_content(prompt)
+            response_text = self._generate_text(prompt, 'generate_cover_letter')
             
-            if response.text:
+            if response_text:
                 logger.info("Cover letter generated successfully")
-                return response.text.strip()
+                return response_text.strip()
             else:
                 raise Exception("Empty response from Gemini AI")
                 
+        except GeminiUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error generating cover letter: {str(e)}")
             raise Exception(f"Cover letter generation failed: {str(e)}")
\ No newline at end of file
@@ -1,62 +1,28 @@
 import logging
 import json
-from typing import Dict, List, Optional, Tuple
-from collections import Counter
-import re
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, List, Optional, Tuple, Union
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from services.tfidf_model import create_vectorizer, load_tfidf_model
+from services.skill_matcher import get_skill_matcher
+from services.skill_taxonomy import SKILL_CATEGORIES
+from utils.text_normalizer import NormalizedText, normalize
+
+# Filler words ignored by the keyword scorers
+COMMON_WORDS = frozenset({'with', 'have', 'will', 'work', 'team', 'experience', 'skills'})
 
 logger = logging.getLogger(__name__)
 
 class JobMatcher:
     def __init__(self):
-        """Initialize the Job Matcher with NLP models and data"""
-        self.setup_spacy()
+        """Initialize the Job Matcher with keyword data and the TF-IDF model"""
         self.setup_job_keywords()
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        self.tfidf_model = load_tfidf_model()
         
-    def setup_spacy(self):
-        """Load spaCy model"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.error("spaCy English model not found. Please install it with: python -m spacy download en_core_web_sm")
-            raise
-    
     def setup_job_keywords(self):
         """Initialize job-related keywords and categories"""
-        self.skill_categories = {
-            'programming_languages': [
-                'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
-                'Swift', 'Kotlin', 'PHP', 'Ruby', 'Scala', 'R', 'MATLAB', 'SQL'
-            ],
-            'frameworks': [
-                'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Django', 'Flask',
-                'FastAPI', 'Spring', 'Laravel', 'Rails', 'ASP.NET', 'jQuery', 'Bootstrap'
-            ],
-            'databases': [
-                'MongoDB', 'PostgreSQL', 'MySQL', 'SQLite', 'Redis', 'Cassandra',
-                'DynamoDB', 'Oracle', 'SQL Server', 'Firebase', 'Supabase'
-            ],
-            'cloud_devops': [
-                'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins',
-                'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible'
-            ],
-            'ai_ml': [
-                'Machine Learning', 'Deep Learning', 'Neural Networks', 'TensorFlow',
-                'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter'
-            ],
-            'tools': [
-                'Git', 'Linux', 'Unix', 'Bash', 'VS Code', 'IntelliJ', 'Postman',
-                'Swagger', 'REST API', 'GraphQL', 'Microservices'
-            ]
-        }
+        self.skill_categories = {category: list(skills) for category, skills in SKILL_CATEGORIES.items()}
+        self.skill_matcher = get_skill_matcher()
         
         self.experience_levels = {
             'entry': ['entry', 'junior', 'graduate', 'intern', '0-1', '0-2'],
@@ -65,6 +31,15 @@ class JobMatcher:
             'principal': ['principal', 'staff', 'architect', '8+', '10+']
         }
         
+        self.experience_hierarchy = {'entry': 1, 'mid': 2, 'senior': 3, 'principal': 4, 'unknown': 0}
+        
+        self.score_weights = {
+            'skills': 0.4,
+            'experience': 0.2,
+            'semantic': 0.25,
+            'keywords': 0.15
+        }
+        
         self.job_types = ['full-time', 'part-time', 'contract', 'remote', 'hybrid']
         
         self.salary_ranges = {
@@ -81,19 +56,19 @@ class JobMatcher:
         logger.info("Starting job match analysis...")
         
         try:
-            # Clean and preprocess texts
-            resume_clean = self.clean_text(resume_text)
-            job_clean = self.clean_text(job_description)
+            # Clean and tokenize each text once; the scorers below share the result
+            resume = normalize(resume_text)
+            job = normalize(job_description)
             
             # Extract features from both texts
-            resume_features = self.extract_features(resume_clean)
-            job_features = self.extract_features(job_clean)
+            resume_features = self.extract_features(resume)
+            job_features = self.extract_features(job)
             
             # Calculate various match scores
             skills_match = self.calculate_skills_match(resume_features, job_features)
             experience_match = self.calculate_experience_match(resume_features, job_features)
-            semantic_match = self.calculate_semantic_similarity(resume_clean, job_clean)
-            keyword_match = self.calculate_keyword_match(resume_clean, job_clean)
+            semantic_match = self.calculate_semantic_similarity(resume.lower, job.lower)
+            keyword_match = self.calculate_keyword_match(resume, job)
             
             # Calculate overall match score
             overall_score = self.calculate_overall_score(
@@ -107,7 +82,7 @@ class JobMatcher:
             
             # Identify missing skills and keywords
             missing_skills = self.identify_missing_skills(resume_features, job_features)
-            missing_keywords = self.identify_missing_keywords(resume_clean, job_clean)
+            missing_keywords = self.identify_missing_keywords(resume, job)
             
             result = {
                 'overall_score': round(overall_score, 1),
@@ -132,46 +107,36 @@ class JobMatcher:
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters but keep important punctuation
-        text = re.sub(r'[^\w\s\-\.\,\;\:\(\)\[\]\/\@\+\#]', '', text)
-        return text.lower()
+        return normalize(text).lower
     
-    def extract_features(self, text: str) -> Dict:
-        """Extract relevant features from text"""
-        doc = self.nlp(text)
+    def extract_features(self, text: Union[str, NormalizedText]) -> Dict:
+        """Extract relevant features from text (keyword-based; no spaCy parse needed)"""
+        text = normalize(text)
+        # One matcher pass finds skills, education, certifications and titles; it needs the
+        # original capitalization to tell skills like "Go" and "R" from ordinary words
+        tagged = self.skill_matcher.find_by_tag(text.clean)
         
         # Extract skills by category
         skills = {}
-        for category, skill_list in self.skill_categories.items():
-            found_skills = []
-            for skill in skill_list:
-                if skill.lower() in text:
-                    found_skills.append(skill)
-            skills[category] = found_skills
+        for category in self.skill_categories:
+            skills[category] = tagged.get(f'skill:{category}', [])
         
         # Extract experience level
-        experience_level = self.extract_experience_level(text)
-        
-        # Extract education
-        education = self.extract_education(text)
-        
-        # Extract certifications
-        certifications = self.extract_certifications(text)
-        
-        # Extract job titles/roles
-        job_titles = self.extract_job_titles(text)
+        experience_level = self.extract_experience_level(text.lower)
         
         return {
             'skills': skills,
             'experience_level': experience_level,
-            'education': education,
-            'certifications': certifications,
-            'job_titles': job_titles,
+            'education': tagged.get('education', []),
+            'certifications': tagged.get('certification', []),
+            'job_titles': tagged.get('title', []),
             'total_skills': sum(len(skills_list) for skills_list in skills.values())
         }
     
+    def extract_features_batch(self, texts: List[Union[str, NormalizedText]]) -> List[Dict]:
+        """Extract features from many texts, in input order"""
+        return [self.extract_features(text) for text in texts]
+    
     def extract_experience_level(self, text: str) -> str:
         """Extract experience level from text"""
         for level, keywords in self.experience_levels.items():
@@ -182,39 +147,15 @@ class JobMatcher:
     
     def extract_education(self, text: str) -> List[str]:
         """Extract education information"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'degree', 'university',
-            'college', 'computer science', 'engineering', 'mathematics'
-        ]
-        found_education = []
-        for keyword in education_keywords:
-            if keyword in text:
-                found_education.append(keyword)
-        return list(set(found_education))
+        return self.skill_matcher.find_by_tag(text).get('education', [])
     
     def extract_certifications(self, text: str) -> List[str]:
         """Extract certifications"""
-        cert_keywords = [
-            'aws certified', 'azure certified', 'google cloud', 'cissp',
-            'pmp', 'scrum master', 'kubernetes', 'docker certified'
-        ]
-        found_certs = []
-        for cert in cert_keywords:
-            if cert in text:
-                found_certs.append(cert)
-        return found_certs
+        return self.skill_matcher.find_by_tag(text).get('certification', [])
     
     def extract_job_titles(self, text: str) -> List[str]:
         """Extract job titles/roles"""
-        title_keywords = [
-            'developer', 'engineer', 'architect', 'manager', 'lead',
-            'senior', 'junior', 'principal', 'director', 'analyst'
-        ]
-        found_titles = []
-        for title in title_keywords:
-            if title in text:
-                found_titles.append(title)
-        return list(set(found_titles))
+        return self.skill_matcher.find_by_tag(text).get('title', [])
     
     def calculate_skills_match(self, resume_features: Dict, job_features: Dict) -> Dict:
         """Calculate skills match score"""
@@ -249,8 +190,7 @@ class JobMatcher:
         resume_exp = resume_features['experience_level']
         job_exp = job_features['experience_level']
         
-        # Define experience level hierarchy
-        exp_hierarchy = {'entry': 1, 'mid': 2, 'senior': 3, 'principal': 4, 'unknown': 0}
+        exp_hierarchy = self.experience_hierarchy
         
         resume_level = exp_hierarchy.get(resume_exp, 0)
         job_level = exp_hierarchy.get(job_exp, 0)
@@ -273,9 +213,7 @@ class JobMatcher:
     def calculate_semantic_similarity(self, resume_text: str, job_text: str) -> float:
         """Calculate semantic similarity using TF-IDF and cosine similarity"""
         try:
-            # Fit vectorizer on both texts
-            corpus = [resume_text, job_text]
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
+            tfidf_matrix = self._vectorize([resume_text, job_text])
             
             # Calculate cosine similarity
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
@@ -286,16 +224,20 @@ class JobMatcher:
             logger.warning(f"Error calculating semantic similarity: {str(e)}")
             return 0.0
     
-    def calculate_keyword_match(self, resume_text: str, job_text: str) -> float:
-        """Calculate keyword overlap percentage"""
-        # Extract important keywords from job description
-        job_words = set(word for word in job_text.split() if len(word) > 3)
-        resume_words = set(word for word in resume_text.split() if len(word) > 3)
+    def _vectorize(self, corpus: List[str]):
+        """Vectorize texts with the pre-fitted model, or a throwaway fit when none is available"""
+        if self.tfidf_model is not None:
+            return self.tfidf_model.transform(corpus)
         
-        # Remove common words
-        common_words = {'with', 'have', 'will', 'work', 'team', 'experience', 'skills'}
-        job_words -= common_words
-        resume_words -= common_words
+        # Local vectorizer so concurrent requests never share fitted state
+        return create_vectorizer().fit_transform(corpus)
+    
+    def calculate_keyword_match(self, resume_text: Union[str, NormalizedText],
+                                job_text: Union[str, NormalizedText]) -> float:
+        """Calculate keyword overlap percentage"""
+        # Important keywords from the job description, minus common words
+        job_words = normalize(job_text).token_set(4) - COMMON_WORDS
+        resume_words = normalize(resume_text).token_set(4)
         
         if not job_words:
             return 0
@@ -307,12 +249,7 @@ class JobMatcher:
     def calculate_overall_score(self, skills_match: Dict, experience_match: Dict, 
                               semantic_match: float, keyword_match: float) -> float:
         """Calculate weighted overall match score"""
-        weights = {
-            'skills': 0.4,
-            'experience': 0.2,
-            'semantic': 0.25,
-            'keywords': 0.15
-        }
+        weights = self.score_weights
         
         overall = (
             skills_match['score'] * weights['skills'] +
@@ -337,22 +274,20 @@ class JobMatcher:
         missing = job_skills - resume_skills
         return list(missing)[:10]  # Return top 10
     
-    def identify_missing_keywords(self, resume_text: str, job_text: str) -> List[str]:
+    def identify_missing_keywords(self, resume_text: Union[str, NormalizedText],
+                                  job_text: Union[str, NormalizedText]) -> List[str]:
         """Identify important keywords missing from resume"""
         # Get word frequency from job description
-        job_words = [word for word in job_text.split() if len(word) > 3]
-        word_freq = Counter(job_words)
+        word_freq = normalize(job_text).token_counts(4)
         
         # Get resume words
-        resume_words = set(resume_text.split())
+        resume_words = normalize(resume_text).token_set()
         
         # Find missing important words
         missing_keywords = []
         for word, freq in word_freq.most_common(50):
-            if freq > 1 and word not in resume_words:
-                # Filter out common words
-                if word not in ['with', 'have', 'will', 'work', 'team', 'experience']:
-                    missing_keywords.append(word)
+            if freq > 1 and word not in resume_words and word not in COMMON_WORDS:
+                missing_keywords.append(word)
         
         return missing_keywords[:15]
     
@@ -406,15 +341,16 @@ class JobMatcher:
         try:
             # Create user profile text
             user_text = self.create_profile_text(user_profile)
+            job_texts = [
+                f"{job['title']} {job['description']} {' '.join(job.get('skills', []))}"
+                for job in job_listings
+            ]
+            
+            # Score every listing in one batch
+            match_results = self.score_jobs_batch(user_text, job_texts)
             
-            # Calculate similarity with each job
             job_scores = []
-            for job in job_listings:
-                job_text = f"{job['title']} {job['description']} {' '.join(job.get('skills', []))}"
-                
-                # Calculate match score
-                match_result = self.analyze_job_match(user_text, job_text)
-                
+            for job, match_result in zip(job_listings, match_results):
                 job_with_score = job.copy()
                 job_with_score['match_score'] = match_result['overall_score']
                 job_with_score['skills_match'] = match_result['skills_match']
@@ -432,6 +368,98 @@ class JobMatcher:
             logger.error(f"Error finding similar jobs: {str(e)}")
             return []
     
+    def score_jobs_batch(self, resume_text: str, job_texts: List[str]) -> List[Dict]:
+        """
+        Score one resume against many job texts in a single vectorized pass.
+        
+        Resume features are extracted once and the skills, experience and overall
+        scores are computed as array operations. TF-IDF vectors come from the
+        shipped pre-fitted model (transform only), so semantic scores match
+        analyze_job_match. Without the model, a vectorizer is fitted once over
+        the resume and the whole batch; document frequencies then depend on the
+        batch, so semantic scores differ slightly from analyze_job_match, which
+        fits over the resume and a single job. Returns one result per job text,
+        in input order.
+        """
+        if not job_texts:
+            return []
+        
+        resume = normalize(resume_text)
+        jobs = [normalize(text) for text in job_texts]
+        job_cleans = [job.lower for job in jobs]
+        
+        resume_features = self.extract_features(resume)
+        job_features = self.extract_features_batch(jobs)
+        
+        # Skills: binary job x skill matrix against the resume skill vector
+        skill_vocab = list(dict.fromkeys(
+            skill.lower() for skill_list in self.skill_categories.values() for skill in skill_list
+        ))
+        skill_index = {skill: i for i, skill in enumerate(skill_vocab)}
+        
+        resume_vector = np.zeros(len(skill_vocab), dtype=bool)
+        for category_skills in resume_features['skills'].values():
+            for skill in category_skills:
+                resume_vector[skill_index[skill.lower()]] = True
+        
+        job_matrix = np.zeros((len(job_cleans), len(skill_vocab)), dtype=bool)
+        for row, features in enumerate(job_features):
+            for category_skills in features['skills'].values():
+                for skill in category_skills:
+                    job_matrix[row, skill_index[skill.lower()]] = True
+        
+        job_totals = job_matrix.sum(axis=1)
+        matching_counts = (job_matrix & resume_vector).sum(axis=1)
+        skills_scores = np.where(job_totals > 0, matching_counts / np.maximum(job_totals, 1) * 100, 0.0)
+        missing_matrix = job_matrix & ~resume_vector
+        
+        # Experience: compare hierarchy levels for all jobs at once
+        resume_level = self.experience_hierarchy.get(resume_features['experience_level'], 0)
+        job_levels = np.array([self.experience_hierarchy.get(f['experience_level'], 0) for f in job_features])
+        experience_scores = np.select(
+            [job_levels == 0, resume_level >= job_levels, resume_level == job_levels - 1],
+            [50, 100, 75],
+            default=np.maximum(0, 100 - (job_levels - resume_level) * 25)
+        ).astype(float)
+        
+        # Semantic: one TF-IDF fit over the batch, one similarity row
+        semantic_scores = self._batch_semantic_similarity(resume.lower, job_cleans)
+        
+        # The resume's token set is built on the first job and reused for the rest
+        keyword_scores = np.array([self.calculate_keyword_match(resume, job) for job in jobs])
+        
+        weights = self.score_weights
+        overall_scores = (
+            skills_scores * weights['skills'] +
+            experience_scores * weights['experience'] +
+            semantic_scores * weights['semantic'] +
+            keyword_scores * weights['keywords']
+        )
+        
+        results = []
+        for row in range(len(job_cleans)):
+            results.append({
+                'overall_score': round(float(overall_scores[row]), 1),
+                'skills_match': round(float(skills_scores[row]), 1),
+                'experience_match': round(float(experience_scores[row]), 1),
+                'semantic_match': round(float(semantic_scores[row]), 1),
+                'keyword_match': round(float(keyword_scores[row]), 1),
+                'matching_skills': [skill_vocab[i] for i in np.flatnonzero(job_matrix[row] & resume_vector)],
+                'missing_skills': [skill_vocab[i] for i in np.flatnonzero(missing_matrix[row])][:10]
+            })
+        
+        return results
+    
+    def _batch_semantic_similarity(self, resume_text: str, job_texts: List[str]) -> np.ndarray:
+        """Cosine similarity of the resume against every job text, as percentages"""
+        try:
+            tfidf_matrix = self._vectorize([resume_text] + job_texts)
+            return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).ravel() * 100
+            
+        except Exception as e:
+            logger.warning(f"Error calculating batch semantic similarity: {str(e)}")
+            return np.zeros(len(job_texts))
+    
     def create_profile_text(self, user_profile: Dict) -> str:
         """Create text representation of user profile"""
         text_parts = []
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from services.session_store import SessionStore, get_session_store
+
+logger = logging.getLogger(__name__)
+
+# Session store namespace holding job records
+JOBS_NAMESPACE = 'jobs'
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs"""
+
+
+class JobQueue:
+    """
+    Bounded background executor for slow calls (e.g. Gemini round trips).
+
+    Requests submit work and get a job id back immediately; clients then poll the
+    job status and fetch the result once it completes. Job records live in the
+    session store, so any worker process can answer a poll; only the executor
+    and its pending count are local to the process that accepted the job.
+    Finished jobs are kept for ``result_ttl`` seconds.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100, result_ttl: int = 3600,
+                 store: Optional[SessionStore] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.store = store or get_session_store()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-queue')
+        self._pending = 0
+        self._counts = {'completed': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable, *args, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return the new job id"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self._pending} pending jobs)")
+            self._pending += 1
+
+        job_id = str(uuid.uuid4())
+        try:
+            self.store.set(JOBS_NAMESPACE, job_id, {
+                'id': job_id,
+                'kind': kind,
+                'status': 'queued',
+                'created': time.time(),
+                'started': None,
+                'finished': None,
+                'result': None,
+                'error': None
+            }, ttl=self.result_ttl)
+            self._executor.submit(self._run, job_id, fn, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        logger.info(f"Queued {kind} job {job_id}")
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable, args, kwargs):
+        outcome = 'failed'
+        try:
+            self._update(job_id, status='running', started=time.time())
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {str(e)}")
+                self._update(job_id, status='failed', error=str(e), finished=time.time())
+            else:
+                self._update(job_id, status='completed', result=result, finished=time.time())
+                outcome = 'completed'
+        except Exception as e:
+            logger.error(f"Failed to record state of job {job_id}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._counts[outcome] += 1
+
+    def _update(self, job_id: str, **fields):
+        def apply(job):
+            job.update(fields)
+            return job
+
+        # Every update restarts the TTL, so finished jobs are kept for result_ttl after they finish
+        if self.store.get(JOBS_NAMESPACE, job_id) is not None:
+            self.store.update(JOBS_NAMESPACE, job_id, apply, ttl=self.result_ttl)
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """Public view of a job without its result payload"""
+        job = self.store.get(JOBS_NAMESPACE, job_id)
+        if job is None:
+            return None
+        status = {key: value for key, value in job.items() if key != 'result'}
+
+        if status['started'] and status['finished']:
+            status['duration'] = round(status['finished'] - status['started'], 3)
+        return status
+
+    def get_result(self, job_id: str) -> Optional[Any]:
+        """Result of a completed job, or None"""
+        job = self.store.get(JOBS_NAMESPACE, job_id)
+        return job['result'] if job and job['status'] == 'completed' else None
+
+    def stats(self) -> Dict:
+        """Counts for jobs accepted by this process"""
+        with self._lock:
+            counts = dict(self._counts)
+            counts['pending'] = self._pending
+        counts['max_workers'] = self.max_workers
+        counts['max_pending'] = self.max_pending
+        return counts
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
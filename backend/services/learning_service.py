@@ -1,92 +1,36 @@
 import logging
 import json
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 import uuid
 
+from services.session_store import SessionStore, get_session_store
+from services.catalog import CourseCatalog, get_course_catalog
+
 logger = logging.getLogger(__name__)
 
+# Session store namespaces; learner state never expires
+PROGRESS_NAMESPACE = 'learning_progress'
+ACHIEVEMENTS_NAMESPACE = 'learning_achievements'
+
 class LearningService:
-    def __init__(self):
+    def __init__(self, store: Optional[SessionStore] = None, catalog: Optional[CourseCatalog] = None):
         """Initialize Learning Service"""
-        self.setup_course_data()
-        
-    def setup_course_data(self):
-        """Initialize course and learning path data"""
-        self.courses = {
-            '1': {
-                'id': '1',
-                'title': 'Complete React Developer Course',
-                'description': 'Master React from basics to advanced concepts with real-world projects',
-                'instructor': {
-                    'name': 'Sarah Johnson',
-                    'title': 'Senior Frontend Engineer at Google',
-                    'rating': 4.8,
-                    'students': 15420
-                },
-                'duration': '42 hours',
-                'difficulty': 'Intermediate',
-                'rating': 4.8,
-                'students': 15420,
-                'certificate': True,
-                'price': 89.99,
-                'skills': ['React', 'JavaScript', 'Redux', 'React Router', 'Testing'],
-                'category': 'Web Development',
-                'modules': [
-                    {
-                        'id': '1',
-                        'title': 'Introduction to React',
-                        'type': 'video',
-                        'duration': '15:30',
-                        'completed': False,
-                        'videoUrl': 'https://www.youtube.com/embed/Ke90Tje7VS0',
-                        'description': 'Learn what React is and why it\'s popular',
-                        'resources': [
-                            {'title': 'React Documentation', 'type': 'link', 'url': 'https://react.dev'},
-                            {'title': 'Course Slides', 'type': 'pdf', 'url': '/resources/react-intro.pdf'}
-                        ]
-                    },
-                    {
-                        'id': '2',
-                        'title': 'React Fundamentals Quiz',
-                        'type': 'quiz',
-                        'duration': '15:00',
-                        'completed': False,
-                        'quiz': {
-                            'questions': [
-                                {
-                                    'id': 'q1',
-                                    'type': 'multiple-choice',
-                                    'question': 'What is React?',
-                                    'options': ['A framework', 'A library', 'A programming language'],
-                                    'correctAnswer': 'A library',
-                                    'points': 10
-                                }
-                            ],
-                            'timeLimit': 900,
-                            'passingScore': 70
-                        }
-                    }
-                ]
-            }
-        }
+        self.store = store or get_session_store()
+        self.catalog = catalog or get_course_catalog()
         
-        self.learning_paths = {
-            '1': {
-                'id': '1',
-                'title': 'Full Stack Web Developer',
-                'description': 'Complete path from frontend to backend development',
-                'courses': ['1'],
-                'duration': '6 months',
-                'difficulty': 'Intermediate',
-                'skills': ['React', 'Node.js', 'Python', 'MongoDB'],
-                'jobRoles': ['Full Stack Developer', 'Web Developer'],
-                'estimatedSalary': '$70,000 - $120,000'
-            }
-        }
-        
-        self.user_progress = {}
-        self.achievements = {}
+    @property
+    def courses(self) -> Dict[str, Dict]:
+        """Course summaries by id; module bodies come from get_course_modules"""
+        return self.catalog.courses
+    
+    @property
+    def learning_paths(self) -> Dict[str, Dict]:
+        return self.catalog.learning_paths
+    
+    def get_course_modules(self, course_id: str) -> List[Dict]:
+        """Modules of a course, loaded from the catalog on first use"""
+        return self.catalog.get_modules(course_id)
         
     def get_user_dashboard(self, user_id: str) -> Dict:
         """Get user dashboard data"""
@@ -124,27 +68,32 @@ class LearningService:
     
     def get_courses(self, filters: Optional[Dict] = None) -> List[Dict]:
         """Get courses with optional filtering"""
+        return self.search_courses(filters)['courses']
+    
+    def search_courses(self, filters: Optional[Dict] = None, page: int = 1,
+                       page_size: Optional[int] = None) -> Dict:
+        """Filtered, ranked and paginated courses from the course index"""
         try:
-            courses = list(self.courses.values())
-            
-            if filters:
-                search = filters.get('search', '').lower()
-                category = filters.get('category', 'all')
-                difficulty = filters.get('difficulty', 'all')
-                
-                if search:
-                    courses = [c for c in courses if 
-                             search in c['title'].lower() or 
-                             search in c['description'].lower() or
-                             any(search in skill.lower() for skill in c['skills'])]
-                
-                if category != 'all':
-                    courses = [c for c in courses if c['category'].lower() == category.lower()]
-                
-                if difficulty != 'all':
-                    courses = [c for c in courses if c['difficulty'].lower() == difficulty.lower()]
-            
-            return courses
+            filters = filters or {}
+            page = max(page, 1)
+            offset = (page - 1) * page_size if page_size else 0
+            
+            course_ids, total = self.catalog.get_index().search(
+                query=filters.get('search', ''),
+                category=filters.get('category', 'all'),
+                difficulty=filters.get('difficulty', 'all'),
+                sort_by=filters.get('sortBy'),
+                offset=offset,
+                limit=page_size
+            )
+            
+            courses = self.courses
+            return {
+                'courses': [courses[course_id] for course_id in course_ids if course_id in courses],
+                'total': total,
+                'page': page,
+                'pageSize': page_size or total
+            }
             
         except Exception as e:
             logger.error(f"Error getting courses: {str(e)}")
@@ -157,6 +106,7 @@ class LearningService:
                 raise Exception("Course not found")
             
             course = self.courses[course_id].copy()
+            course['modules'] = [module.copy() for module in self.get_course_modules(course_id)]
             
             # Add user-specific data
             user_progress = self.get_user_course_progress(user_id, course_id)
@@ -182,18 +132,14 @@ class LearningService:
                 raise Exception("Course not found")
             
             # Initialize user progress if not exists
-            if user_id not in self.user_progress:
-                self.user_progress[user_id] = {}
-            
-            if course_id not in self.user_progress[user_id]:
-                self.user_progress[user_id][course_id] = {
-                    'enrolled': True,
-                    'enrolledDate': datetime.now().isoformat(),
-                    'progress': 0,
-                    'completedModules': {},
-                    'lastAccessed': datetime.now().isoformat(),
-                    'timeSpent': 0
-                }
+            record = self._update_progress(user_id, course_id, {
+                'enrolled': True,
+                'enrolledDate': datetime.now().isoformat(),
+                'progress': 0,
+                'completedModules': {},
+                'lastAccessed': datetime.now().isoformat(),
+                'timeSpent': 0
+            })
             
             # Award enrollment achievement
             self.award_achievement(user_id, 'first_enrollment')
@@ -202,7 +148,7 @@ class LearningService:
                 'success': True,
                 'message': 'Successfully enrolled in course',
                 'courseId': course_id,
-                'enrolledDate': self.user_progress[user_id][course_id]['enrolledDate']
+                'enrolledDate': record.get('enrolledDate')
             }
             
         except Exception as e:
@@ -215,31 +161,29 @@ class LearningService:
             if course_id not in self.courses:
                 raise Exception("Course not found")
             
-            # Initialize progress if needed
-            if user_id not in self.user_progress:
-                self.user_progress[user_id] = {}
-            if course_id not in self.user_progress[user_id]:
-                self.user_progress[user_id][course_id] = {
-                    'enrolled': True,
-                    'progress': 0,
-                    'completedModules': {},
-                    'lastAccessed': datetime.now().isoformat()
-                }
+            total_modules = len(self.get_course_modules(course_id))
             
-            # Mark module as completed
-            self.user_progress[user_id][course_id]['completedModules'][module_id] = {
-                'completed': True,
-                'completedDate': datetime.now().isoformat()
-            }
+            def mark_completed(record: Dict):
+                # Mark module as completed
+                record.setdefault('completedModules', {})[module_id] = {
+                    'completed': True,
+                    'completedDate': datetime.now().isoformat()
+                }
+                
+                # Update course progress
+                record['progress'] = (len(record['completedModules']) / total_modules) * 100
+                record['lastAccessed'] = datetime.now().isoformat()
             
-            # Update course progress
-            course = self.courses[course_id]
-            total_modules = len(course['modules'])
-            completed_modules = len(self.user_progress[user_id][course_id]['completedModules'])
-            progress = (completed_modules / total_modules) * 100
+            # Initialize progress if needed
+            record = self._update_progress(user_id, course_id, {
+                'enrolled': True,
+                'progress': 0,
+                'completedModules': {},
+                'lastAccessed': datetime.now().isoformat()
+            }, mark_completed)
             
-            self.user_progress[user_id][course_id]['progress'] = progress
-            self.user_progress[user_id][course_id]['lastAccessed'] = datetime.now().isoformat()
+            completed_modules = len(record['completedModules'])
+            progress = record['progress']
             
             # Check for achievements
             if completed_modules == 1:
@@ -268,7 +212,7 @@ class LearningService:
             if not course:
                 raise Exception("Course not found")
             
-            module = next((m for m in course['modules'] if m['id'] == module_id), None)
+            module = next((m for m in self.get_course_modules(course_id) if m['id'] == module_id), None)
             if not module or module['type'] != 'quiz':
                 raise Exception("Quiz module not found")
             
@@ -289,20 +233,18 @@ class LearningService:
             passed = score_percentage >= quiz['passingScore']
             
             # Save quiz result
-            if user_id not in self.user_progress:
-                self.user_progress[user_id] = {}
-            if course_id not in self.user_progress[user_id]:
-                self.user_progress[user_id][course_id] = {'quizResults': {}}
-            if 'quizResults' not in self.user_progress[user_id][course_id]:
-                self.user_progress[user_id][course_id]['quizResults'] = {}
-            
-            self.user_progress[user_id][course_id]['quizResults'][module_id] = {
-                'score': score_percentage,
-                'passed': passed,
-                'attempts': self.user_progress[user_id][course_id]['quizResults'].get(module_id, {}).get('attempts', 0) + 1,
-                'submittedDate': datetime.now().isoformat(),
-                'answers': answers
-            }
+            def save_result(record: Dict):
+                quiz_results = record.setdefault('quizResults', {})
+                quiz_results[module_id] = {
+                    'score': score_percentage,
+                    'passed': passed,
+                    'attempts': quiz_results.get(module_id, {}).get('attempts', 0) + 1,
+                    'submittedDate': datetime.now().isoformat(),
+                    'answers': answers
+                }
+            
+            record = self._update_progress(user_id, course_id, {'quizResults': {}}, save_result)
+            attempts = record['quizResults'][module_id]['attempts']
             
             # If passed, mark module as completed
             if passed:
@@ -315,7 +257,7 @@ class LearningService:
                 'passingScore': quiz['passingScore'],
                 'earnedPoints': earned_points,
                 'totalPoints': total_points,
-                'canRetake': self.user_progress[user_id][course_id]['quizResults'][module_id]['attempts'] < quiz.get('maxAttempts', 3)
+                'canRetake': attempts < quiz.get('maxAttempts', 3)
             }
             
         except Exception as e:
@@ -329,30 +271,27 @@ class LearningService:
             if not course:
                 raise Exception("Course not found")
             
-            module = next((m for m in course['modules'] if m['id'] == module_id), None)
+            module = next((m for m in self.get_course_modules(course_id) if m['id'] == module_id), None)
             if not module or module['type'] != 'assignment':
                 raise Exception("Assignment module not found")
             
             # Save assignment submission
-            if user_id not in self.user_progress:
-                self.user_progress[user_id] = {}
-            if course_id not in self.user_progress[user_id]:
-                self.user_progress[user_id][course_id] = {'assignments': {}}
-            if 'assignments' not in self.user_progress[user_id][course_id]:
-                self.user_progress[user_id][course_id]['assignments'] = {}
-            
             submission_id = str(uuid.uuid4())
-            self.user_progress[user_id][course_id]['assignments'][module_id] = {
-                'submissionId': submission_id,
-                'submittedDate': datetime.now().isoformat(),
-                'projectUrl': submission_data.get('projectUrl'),
-                'demoUrl': submission_data.get('demoUrl'),
-                'comments': submission_data.get('comments'),
-                'files': submission_data.get('files', []),
-                'status': 'submitted',
-                'grade': None,
-                'feedback': None
-            }
+            
+            def save_submission(record: Dict):
+                record.setdefault('assignments', {})[module_id] = {
+                    'submissionId': submission_id,
+                    'submittedDate': datetime.now().isoformat(),
+                    'projectUrl': submission_data.get('projectUrl'),
+                    'demoUrl': submission_data.get('demoUrl'),
+                    'comments': submission_data.get('comments'),
+                    'files': submission_data.get('files', []),
+                    'status': 'submitted',
+                    'grade': None,
+                    'feedback': None
+                }
+            
+            self._update_progress(user_id, course_id, {'assignments': {}}, save_submission)
             
             # Mark module as completed
             self.complete_module(user_id, course_id, module_id)
@@ -439,7 +378,7 @@ class LearningService:
                 }
             ]
             
-            user_achievements = self.achievements.get(user_id, {})
+            user_achievements = self.store.get(ACHIEVEMENTS_NAMESPACE, user_id, {})
             
             for achievement in all_achievements:
                 achievement_id = achievement['id']
@@ -493,7 +432,7 @@ class LearningService:
     def get_user_enrolled_courses(self, user_id: str) -> List[Dict]:
         """Get courses user is enrolled in"""
         enrolled_courses = []
-        user_data = self.user_progress.get(user_id, {})
+        user_data = self.store.get(PROGRESS_NAMESPACE, user_id, {})
         
         for course_id, progress_data in user_data.items():
             if progress_data.get('enrolled', False):
@@ -509,7 +448,19 @@ class LearningService:
     
     def get_user_course_progress(self, user_id: str, course_id: str) -> Dict:
         """Get user progress for specific course"""
-        return self.user_progress.get(user_id, {}).get(course_id, {})
+        return self.store.get(PROGRESS_NAMESPACE, user_id, {}).get(course_id, {})
+    
+    def _update_progress(self, user_id: str, course_id: str, initial: Dict,
+                         apply: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Atomically create (from initial) and/or modify one course's progress record"""
+        def update(user_data: Optional[Dict]) -> Dict:
+            user_data = user_data or {}
+            record = user_data.setdefault(course_id, initial)
+            if apply:
+                apply(record)
+            return user_data
+        
+        return self.store.update(PROGRESS_NAMESPACE, user_id, update, ttl=0)[course_id]
     
     def calculate_learning_streak(self, user_id: str) -> int:
         """Calculate user's current learning streak"""
@@ -518,7 +469,7 @@ class LearningService:
     
     def get_recent_achievements(self, user_id: str) -> List[Dict]:
         """Get recently earned achievements"""
-        user_achievements = self.achievements.get(user_id, {})
+        user_achievements = self.store.get(ACHIEVEMENTS_NAMESPACE, user_id, {})
         recent = []
         
         for achievement_id, data in user_achievements.items():
@@ -557,12 +508,12 @@ class LearningService:
     
     def is_module_locked(self, user_id: str, course_id: str, module_id: str) -> bool:
         """Check if module is locked for user"""
-        course = self.courses.get(course_id)
-        if not course:
+        if course_id not in self.courses:
             return True
+        modules = self.get_course_modules(course_id)
         
         # Find module index
-        module_index = next((i for i, m in enumerate(course['modules']) if m['id'] == module_id), -1)
+        module_index = next((i for i, m in enumerate(modules) if m['id'] == module_id), -1)
         if module_index == -1:
             return True
         
@@ -571,7 +522,7 @@ class LearningService:
             return False
         
         # Check if previous module is completed
-        previous_module = course['modules'][module_index - 1]
+        previous_module = modules[module_index - 1]
         user_progress = self.get_user_course_progress(user_id, course_id)
         completed_modules = user_progress.get('completedModules', {})
         
@@ -579,25 +530,27 @@ class LearningService:
     
     def get_next_module(self, course_id: str, current_module_id: str) -> Optional[Dict]:
         """Get next module in course"""
-        course = self.courses.get(course_id)
-        if not course:
+        if course_id not in self.courses:
             return None
+        modules = self.get_course_modules(course_id)
         
-        current_index = next((i for i, m in enumerate(course['modules']) if m['id'] == current_module_id), -1)
-        if current_index == -1 or current_index >= len(course['modules']) - 1:
+        current_index = next((i for i, m in enumerate(modules) if m['id'] == current_module_id), -1)
+        if current_index == -1 or current_index >= len(modules) - 1:
             return None
         
-        return course['modules'][current_index + 1]
+        return modules[current_index + 1]
     
     def award_achievement(self, user_id: str, achievement_id: str):
         """Award achievement to user"""
-        if user_id not in self.achievements:
-            self.achievements[user_id] = {}
+        def award(user_achievements: Optional[Dict]) -> Dict:
+            user_achievements = user_achievements or {}
+            if achievement_id not in user_achievements:
+                user_achievements[achievement_id] = {
+                    'earnedDate': datetime.now().isoformat(),
+                    'title': achievement_id.replace('_', ' ').title(),
+                    'points': 100  # Default points
+                }
+                logger.info(f"Achievement '{achievement_id}' awarded to user {user_id}")
+            return user_achievements
         
-        if achievement_id not in self.achievements[user_id]:
-            self.achievements[user_id][achievement_id] = {
-                'earnedDate': datetime.now().isoformat(),
-                'title': achievement_id.replace('_', ' ').title(),
-                'points': 100  # Default points
-            }
-            logger.info(f"Achievement '{achievement_id}' awarded to user {user_id}")
\ No newline at end of file
+        self.store.update(ACHIEVEMENTS_NAMESPACE, user_id, award, ttl=0)
\ No newline at end of file
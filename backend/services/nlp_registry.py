@@ -0,0 +1,122 @@
+import os
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Defaults for nlp.pipe batching; NLP_N_PROCESS > 1 runs the pipeline in worker processes
+PIPE_BATCH_SIZE = int(os.getenv('NLP_BATCH_SIZE', 32))
+PIPE_N_PROCESS = int(os.getenv('NLP_N_PROCESS', 1))
+
+# Components that must run for another component to produce its annotations.
+# In en_core_web_sm the tagger and parser listen to the shared tok2vec layer and
+# the rule-based lemmatizer relies on the POS tags set by the attribute ruler.
+COMPONENT_DEPENDENCIES = {
+    'tagger': ['tok2vec'],
+    'parser': ['tok2vec'],
+    'attribute_ruler': ['tagger'],
+    'lemmatizer': ['tagger', 'attribute_ruler'],
+    'ner': [],
+    'senter': [],
+}
+
+_models: Dict[str, "spacy.language.Language"] = {}
+_lock = threading.Lock()
+
+
+def load_model(model_name: str = DEFAULT_MODEL):
+    """Load a spaCy model once per process and return the shared instance"""
+    nlp = _models.get(model_name)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        nlp = _models.get(model_name)
+        if nlp is None:
+            try:
+                logger.info(f"Loading spaCy model: {model_name}")
+                nlp = spacy.load(model_name)
+            except OSError:
+                logger.error(f"spaCy English model not found. Please install it with: python -m spacy download {model_name}")
+                raise
+            _models[model_name] = nlp
+    return nlp
+
+
+def resolve_components(components: Iterable[str]) -> List[str]:
+    """Expand requested components with the components they depend on"""
+    resolved = []
+    pending = list(components)
+    while pending:
+        name = pending.pop()
+        if name in resolved:
+            continue
+        resolved.append(name)
+        pending.extend(COMPONENT_DEPENDENCIES.get(name, []))
+    return resolved
+
+
+class PipelineView:
+    """Lightweight handle onto the shared model that only runs selected components.
+
+    The underlying model is loaded on first use, so constructing a view is free.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, components: Optional[Iterable[str]] = None,
+                 disable: Optional[Iterable[str]] = None):
+        self.model_name = model_name
+        self.components = list(components) if components is not None else None
+        self.extra_disable = list(disable or [])
+        self._disabled = None
+
+    @property
+    def model(self):
+        """Shared spaCy Language instance backing this view"""
+        return load_model(self.model_name)
+
+    @property
+    def disabled(self) -> List[str]:
+        """Pipeline components skipped when this view processes text"""
+        if self._disabled is None:
+            pipe_names = self.model.pipe_names
+            if self.components is None:
+                disabled = [name for name in pipe_names if name in self.extra_disable]
+            else:
+                wanted = resolve_components(self.components)
+                disabled = [name for name in pipe_names
+                            if name not in wanted or name in self.extra_disable]
+            self._disabled = disabled
+        return self._disabled
+
+    def __call__(self, text: str):
+        return self.model(text, disable=self.disabled)
+
+    def pipe(self, texts: Iterable, batch_size: Optional[int] = None, n_process: Optional[int] = None, **kwargs):
+        """Process a stream of texts with the same component selection"""
+        return self.model.pipe(
+            texts,
+            disable=self.disabled,
+            batch_size=batch_size or PIPE_BATCH_SIZE,
+            n_process=n_process or PIPE_N_PROCESS,
+            **kwargs
+        )
+
+
+def get_pipeline(components: Optional[Iterable[str]] = None, disable: Optional[Iterable[str]] = None,
+                 model_name: str = DEFAULT_MODEL) -> PipelineView:
+    """Get a view of the shared pipeline restricted to the given components.
+
+    Example: ``get_pipeline(components=['tagger', 'lemmatizer'])`` runs POS tagging and
+    lemmatization with the parser and NER disabled.
+    """
+    return PipelineView(model_name=model_name, components=components, disable=disable)
+
+
+def loaded_models() -> List[str]:
+    """Names of models currently loaded in this process"""
+    return list(_models.keys())
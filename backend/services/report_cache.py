@@ -0,0 +1,161 @@
+import os
+import json
+import logging
+import threading
+from typing import BinaryIO, Dict, Optional
+
+from services.job_queue import JobQueue, QueueFullError
+from utils.cache import DiskCache, content_key
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so stale PDFs are not served
+REPORT_VERSION = '2'
+
+# Report kind -> ReportGenerator method returning PDF bytes
+RENDERERS = {
+    'analysis': 'render_pdf_report',
+    'job_match': 'render_job_match_report'
+}
+
+# How long a download waits for a render already in progress before rendering itself
+RENDER_WAIT_SECONDS = 60
+
+
+class ReportCache:
+    """
+    Rendered PDF reports, keyed on a hash of the result they were rendered from.
+
+    Downloads get the path of a cached PDF and send it as is. A report is
+    rendered on the first request for it, and concurrent requests for the same
+    report wait for that single render. With ``prerender`` enabled, reports can
+    also be rendered on a background queue as soon as an analysis finishes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, prerender: bool = False, workers: int = 1,
+                 max_pending: int = 100):
+        self.disk = DiskCache(directory, max_bytes)
+        self.jobs = JobQueue(max_workers=workers, max_pending=max_pending) if prerender else None
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'renders': 0, 'failures': 0, 'prerenders_queued': 0}
+
+    def key(self, kind: str, result: Dict) -> str:
+        data = json.dumps(result, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+        return content_key(data, 'report', kind, REPORT_VERSION)
+
+    def get_path(self, kind: str, result: Dict) -> str:
+        """Path of the rendered report, rendering it first if it is not cached yet"""
+        key = self.key(kind, result)
+        path = self.disk.get_path(key)
+        if path is not None:
+            self._count('hits')
+            return path
+
+        with self._lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+
+        if owner:
+            try:
+                return self._render(kind, result, key)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+        event.wait(RENDER_WAIT_SECONDS)
+        path = self.disk.get_path(key)
+        if path is not None:
+            self._count('hits')
+            return path
+        return self._render(kind, result, key)
+
+    def open_report(self, kind: str, result: Dict) -> BinaryIO:
+        """
+        Open handle on the rendered report, rendering it if needed.
+
+        The handle stays readable even if the cache evicts the file afterwards.
+        If the file is evicted between the lookup and the open, it is rendered again.
+        """
+        for attempt in range(2):
+            path = self.get_path(kind, result)
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                logger.info(f"Cached {kind} report was evicted before it could be opened; rendering again")
+
+    def cached_path(self, kind: str, result: Dict) -> Optional[str]:
+        """Path of the rendered report if it is already cached, without rendering it"""
+        path = self.disk.get_path(self.key(kind, result))
+        if path is not None:
+            self._count('hits')
+        return path
+
+    def put(self, kind: str, result: Dict, data: bytes):
+        """Store a report rendered elsewhere (e.g. by the bulk exporter)"""
+        self.disk.set(self.key(kind, result), data)
+
+    def _render(self, kind: str, result: Dict, key: str) -> str:
+        from services.report_generator import get_report_generator
+
+        try:
+            data = getattr(get_report_generator(), RENDERERS[kind])(result)
+            self.disk.set(key, data)
+        except Exception as e:
+            self._count('failures')
+            logger.error(f"Error rendering {kind} report: {str(e)}")
+            raise Exception(f"Rendering the {kind} report failed: {str(e)}")
+
+        self._count('renders')
+        path = self.disk.get_path(key)
+        if path is None:
+            raise Exception(f"Rendered {kind} report does not fit in the report cache")
+        return path
+
+    def prerender(self, kind: str, result: Dict) -> Optional[str]:
+        """Queue a background render; returns the job id, or None when pre-rendering is off or busy"""
+        if self.jobs is None:
+            return None
+        try:
+            job_id = self.jobs.submit(f'{kind}_report', self.get_path, kind, result)
+        except QueueFullError as e:
+            logger.warning(f"Skipping report pre-render: {str(e)}")
+            return None
+        self._count('prerenders_queued')
+        return job_id
+
+    def _count(self, name: str):
+        with self._lock:
+            self._metrics[name] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._metrics)
+        stats['entries'] = len(self.disk)
+        stats['bytes'] = self.disk.total_bytes
+        stats['prerender'] = self.jobs is not None
+        return stats
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Process-wide report cache configured from REPORT_* environment variables"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache(
+                    os.getenv('REPORT_CACHE_FOLDER', 'cache/reports'),
+                    int(os.getenv('REPORT_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+                    prerender=os.getenv('REPORT_PRERENDER', '').lower() in ('1', 'true', 'yes'),
+                    workers=int(os.getenv('REPORT_WORKERS', 1))
+                )
+    return _cache
@@ -0,0 +1,192 @@
+import io
+import os
+import json
+import logging
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from services.report_cache import ReportCache, get_report_cache
+from services.worker_processes import get_worker_context
+
+logger = logging.getLogger(__name__)
+
+# Report kind -> (ReportGenerator method, file name prefix inside the archive)
+EXPORTS = {
+    'analysis': ('generate_pdf_report', 'Resume_Analysis_Report'),
+    'job_match': ('generate_job_match_report', 'Job_Match_Report')
+}
+
+# Renders kept in flight per worker process
+WINDOW_PER_WORKER = 2
+
+
+def _render_in_worker(kind: str, result: Dict) -> bytes:
+    """Worker process entry point: render one report into memory"""
+    from services.report_generator import get_report_generator
+
+    buffer = io.BytesIO()
+    if not getattr(get_report_generator(), EXPORTS[kind][0])(result, buffer):
+        raise Exception(f"Rendering the {kind} report failed")
+    return buffer.getvalue()
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting archive bytes until they are drained"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# (session id, result, open cached PDF or pending render)
+_Entry = Tuple[str, Dict, Union[BinaryIO, Future]]
+
+
+class ReportExporter:
+    """
+    Streams the reports of many sessions as a single zip archive.
+
+    Reports missing from the report cache are rendered on a process pool, with
+    a bounded number in flight. Entries are written in request order as soon as
+    they are ready and the archive bytes are yielded entry by entry, so neither
+    the PDFs nor the archive are ever held in memory as a whole. zipfile writes
+    to a non-seekable sink, so sizes and CRCs go into data descriptors after
+    each entry. Sessions that are missing or fail to render are listed in an
+    errors.json entry at the end of the archive.
+    """
+
+    def __init__(self, report_cache: ReportCache, max_workers: Optional[int] = None):
+        self.report_cache = report_cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._context = get_worker_context()
+
+    def _submit(self, kind: str, result: Dict) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+            executor = self._executor
+        try:
+            return executor.submit(_render_in_worker, kind, result)
+        except BrokenProcessPool:
+            # A worker died in an earlier export; start a fresh pool and retry once
+            self._discard(executor)
+            return self._submit(kind, result)
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def export(self, session_ids: Iterable[str], kind: str,
+               load_result: Callable[[str], Optional[Dict]]) -> Iterator[bytes]:
+        """Yield the bytes of a zip archive with one report per session"""
+        if kind not in EXPORTS:
+            raise ValueError(f"Unknown report type: {kind}")
+
+        sink = _ChunkSink()
+        errors = []
+        pending = deque()
+        window = self.max_workers * WINDOW_PER_WORKER
+
+        def ready() -> bool:
+            return bool(pending) and (len(pending) > window or not isinstance(pending[0][2], Future)
+                                      or pending[0][2].done())
+
+        try:
+            with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+                for session_id in session_ids:
+                    result = load_result(session_id)
+                    if result is None:
+                        errors.append({'session_id': session_id, 'error': 'Session not found'})
+                        continue
+                    pending.append((session_id, result, self._start(kind, result)))
+
+                    while ready():
+                        self._write(archive, pending.popleft(), kind, errors)
+                        yield sink.drain()
+
+                while pending:
+                    self._write(archive, pending.popleft(), kind, errors)
+                    yield sink.drain()
+
+                if errors:
+                    archive.writestr('errors.json', json.dumps(errors, indent=2))
+            yield sink.drain()
+        finally:
+            # Client went away or the export failed: drop outstanding work
+            for _, _, source in pending:
+                if isinstance(source, Future):
+                    source.cancel()
+                else:
+                    source.close()
+
+    def _start(self, kind: str, result: Dict) -> Union[BinaryIO, Future]:
+        """Open the cached report, or queue a render for it"""
+        path = self.report_cache.cached_path(kind, result)
+        if path is not None:
+            try:
+                # An open handle stays readable even if the cache evicts the file meanwhile
+                return open(path, 'rb')
+            except OSError:
+                pass
+        return self._submit(kind, result)
+
+    def _write(self, archive: zipfile.ZipFile, entry: _Entry, kind: str, errors: list):
+        session_id, result, source = entry
+        name = f'{EXPORTS[kind][1]}_{session_id}.pdf'
+
+        if not isinstance(source, Future):
+            with source, archive.open(name, 'w') as target:
+                while True:
+                    block = source.read(64 * 1024)
+                    if not block:
+                        break
+                    target.write(block)
+            return
+
+        try:
+            data = source.result()
+        except Exception as e:
+            # A crashed worker breaks the pool; the next submit replaces it
+            logger.error(f"Error exporting {kind} report for session {session_id}: {str(e)}")
+            errors.append({'session_id': session_id, 'error': f'Report generation failed: {str(e)}'})
+            return
+
+        archive.writestr(name, data)
+        try:
+            self.report_cache.put(kind, result, data)
+        except OSError as e:
+            logger.warning(f"Failed to cache exported {kind} report: {str(e)}")
+
+
+_exporter: Optional[ReportExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def get_report_exporter() -> ReportExporter:
+    """Process-wide report exporter configured from REPORT_EXPORT_* environment variables"""
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                workers = int(os.getenv('REPORT_EXPORT_WORKERS', 0)) or None
+                _exporter = ReportExporter(get_report_cache(), max_workers=workers)
+    return _exporter
@@ -1,156 +1,232 @@
 from fpdf import FPDF
-import os
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Core font used throughout (what FPDF substitutes for Arial anyway)
+FONT = 'helvetica'
+
+# Score bars: drawn as rectangles to the right of the label and score cells
+BAR_OFFSET = 80
+BAR_WIDTH = 80
+BAR_HEIGHT = 3.5
+ROW_HEIGHT = 8
+BAR_TRACK_COLOR = (225, 225, 225)
+
+FOOTER_TEXT = (
+    'This report was generated by SIPA (Smart Interview Preparation Assistant) using advanced AI analysis. '
+    'The recommendations are based on industry best practices and current hiring trends. '
+    'For best results, customize your resume for each specific job application.'
+)
+
+# Where a report is written: a file path or a writable binary stream
+Output = Union[str, BinaryIO]
+
+Op = Tuple[str, tuple]
+
+
+class Template:
+    """A fixed sequence of FPDF calls, built once and replayed onto every document"""
+
+    def __init__(self, *ops: Op):
+        self.ops = ops
+
+    def replay(self, pdf: FPDF):
+        for method, args in self.ops:
+            getattr(pdf, method)(*args)
+
+
+def _header_template(title: str) -> Template:
+    return Template(
+        ('set_font', (FONT, 'B', 20)),
+        ('set_text_color', (0, 51, 102)),  # Dark blue
+        ('cell', (0, 15, title, 0, 1, 'C')),
+        ('set_font', (FONT, '', 12)),
+        ('set_text_color', (128, 128, 128)),  # Gray
+    )
+
+
+def _section_template(title: str) -> Template:
+    return Template(
+        ('set_font', (FONT, 'B', 16)),
+        ('set_text_color', (0, 0, 0)),
+        ('cell', (0, 10, title, 0, 1, 'L')),
+        ('ln', (5,)),
+    )
+
+
+def _score_color(score: float) -> Tuple[int, int, int]:
+    if score >= 80:
+        return (0, 128, 0)  # Green
+    if score >= 60:
+        return (255, 165, 0)  # Orange
+    return (255, 0, 0)  # Red
+
+
 class ReportGenerator:
+    """
+    Renders analysis and job match reports as PDFs.
+
+    Each render builds its own FPDF document and passes it through the section
+    helpers, so a single instance can be shared by any number of threads.
+    Headers, section titles and the footer (with its line breaks already
+    computed) are prepared once as templates and replayed into each document.
+    """
+
     def __init__(self):
         """Initialize PDF report generator"""
-        self.pdf = None
-        
-    def generate_pdf_report(self, analysis_result: Dict, output_path: str) -> bool:
-        """Generate comprehensive PDF report"""
+        self.analysis_header = _header_template('SIPA Resume Analysis Report')
+        self.match_header = _header_template('SIPA Job Match Analysis Report')
+        self.sections = {
+            title: _section_template(title) for title in (
+                'Executive Summary', 'Job Match Summary', 'Score Breakdown', 'Match Score Breakdown',
+                'Skills Analysis', 'Skills Comparison', 'AI Recommendations', 'Improvement Recommendations',
+                'Job Match Analysis'
+            )
+        }
+
+        # Page geometry and footer line breaks only depend on the font, so measure them once
+        scratch = self._new_document()
+        scratch.set_font(FONT, 'I', 10)
+        self.content_width = scratch.epw
+        footer_lines = scratch.multi_cell(0, 6, FOOTER_TEXT, split_only=True)
+        self.footer = Template(
+            ('ln', (20,)),
+            ('set_font', (FONT, 'I', 10)),
+            ('set_text_color', (128, 128, 128)),
+            *(('cell', (0, 6, line, 0, 1, 'L')) for line in footer_lines)
+        )
+
+    def _new_document(self) -> FPDF:
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        return pdf
+
+    def render_pdf_report(self, analysis_result: Dict) -> bytes:
+        """Render the resume analysis report to PDF bytes"""
+        pdf = self._new_document()
+
+        # Add content sections
+        self._add_header(pdf, self.analysis_header)
+        self._add_executive_summary(pdf, analysis_result)
+        self._add_score_breakdown(pdf, analysis_result)
+        self._add_skills_analysis(pdf, analysis_result)
+        self._add_recommendations(pdf, analysis_result)
+
+        if analysis_result.get('jobMatchScore'):
+            self._add_job_match_analysis(pdf, analysis_result)
+
+        self._add_footer(pdf)
+        return bytes(pdf.output())
+
+    def render_job_match_report(self, match_result: Dict) -> bytes:
+        """Render the job match report to PDF bytes"""
+        pdf = self._new_document()
+
+        # Add content sections
+        self._add_header(pdf, self.match_header)
+        self._add_match_summary(pdf, match_result)
+        self._add_match_breakdown(pdf, match_result)
+        self._add_skills_comparison(pdf, match_result)
+        self._add_match_recommendations(pdf, match_result)
+        self._add_footer(pdf)
+        return bytes(pdf.output())
+
+    def generate_pdf_report(self, analysis_result: Dict, output: Output) -> bool:
+        """Generate comprehensive PDF report into a file path or binary stream"""
         try:
-            self.pdf = FPDF()
-            self.pdf.add_page()
-            self.pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Add content sections
-            self._add_header()
-            self._add_executive_summary(analysis_result)
-            self._add_score_breakdown(analysis_result)
-            self._add_skills_analysis(analysis_result)
-            self._add_recommendations(analysis_result)
-            
-            if analysis_result.get('jobMatchScore'):
-                self._add_job_match_analysis(analysis_result)
-            
-            self._add_footer()
-            
-            # Save the PDF
-            self.pdf.output(output_path)
-            logger.info(f"PDF report generated successfully: {output_path}")
+            self._write(self.render_pdf_report(analysis_result), output)
+            logger.info("PDF report generated successfully")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error generating PDF report: {str(e)}")
             return False
 
-    def generate_job_match_report(self, match_result: Dict, output_path: str) -> bool:
-        """Generate job match analysis PDF report"""
+    def generate_job_match_report(self, match_result: Dict, output: Output) -> bool:
+        """Generate job match analysis PDF report into a file path or binary stream"""
         try:
-            self.pdf = FPDF()
-            self.pdf.add_page()
-            self.pdf.set_auto_page_break(auto=True, margin=15)
-            
-            # Add content sections
-            self._add_match_header()
-            self._add_match_summary(match_result)
-            self._add_match_breakdown(match_result)
-            self._add_skills_comparison(match_result)
-            self._add_match_recommendations(match_result)
-            self._add_footer()
-            
-            # Save the PDF
-            self.pdf.output(output_path)
-            logger.info(f"Job match PDF report generated successfully: {output_path}")
+            self._write(self.render_job_match_report(match_result), output)
+            logger.info("Job match PDF report generated successfully")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error generating job match PDF report: {str(e)}")
             return False
-    
-    def _add_header(self):
+
+    def _write(self, data: bytes, output: Output):
+        if isinstance(output, str):
+            with open(output, 'wb') as f:
+                f.write(data)
+        else:
+            output.write(data)
+
+    def _add_header(self, pdf: FPDF, template: Template):
         """Add report header"""
-        # Title
-        self.pdf.set_font('Arial', 'B', 20)
-        self.pdf.set_text_color(0, 51, 102)  # Dark blue
-        self.pdf.cell(0, 15, 'SIPA Resume Analysis Report', 0, 1, 'C')
-        
-        # Subtitle
-        self.pdf.set_font('Arial', '', 12)
-        self.pdf.set_text_color(128, 128, 128)  # Gray
-        self.pdf.cell(0, 10, f'Generated on {datetime.now().strftime("%B %d, %Y")}', 0, 1, 'C')
-        self.pdf.ln(10)
-
-    def _add_match_header(self):
-        """Add job match report header"""
-        # Title
-        self.pdf.set_font('Arial', 'B', 20)
-        self.pdf.set_text_color(0, 51, 102)  # Dark blue
-        self.pdf.cell(0, 15, 'SIPA Job Match Analysis Report', 0, 1, 'C')
-        
-        # Subtitle
-        self.pdf.set_font('Arial', '', 12)
-        self.pdf.set_text_color(128, 128, 128)  # Gray
-        self.pdf.cell(0, 10, f'Generated on {datetime.now().strftime("%B %d, %Y")}', 0, 1, 'C')
-        self.pdf.ln(10)
-    
-    def _add_executive_summary(self, analysis_result: Dict):
-        """Add executive summary section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.set_text_color(0, 0, 0)
-        self.pdf.cell(0, 10, 'Executive Summary', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        # Overall score
-        final_score = analysis_result.get('finalScore', 0)
-        self.pdf.set_font('Arial', '', 12)
-        
+        template.replay(pdf)
+        pdf.cell(0, 10, f'Generated on {datetime.now().strftime("%B %d, %Y")}', 0, 1, 'C')
+        pdf.ln(10)
+
+    def _add_score_summary(self, pdf: FPDF, title: str, score_text: str, score: float, interpretations: List[str]):
+        """Section with a color-coded headline score and its interpretation"""
+        self.sections[title].replay(pdf)
+        pdf.set_font(FONT, '', 12)
+
         # Score interpretation
-        if final_score >= 80:
-            interpretation = "Excellent - Your resume is well-optimized and ready for applications."
-            color = (0, 128, 0)  # Green
-        elif final_score >= 60:
-            interpretation = "Good - Your resume has strong foundations with room for improvement."
-            color = (255, 165, 0)  # Orange
+        if score >= 80:
+            interpretation = interpretations[0]
+        elif score >= 60:
+            interpretation = interpretations[1]
         else:
-            interpretation = "Needs Improvement - Focus on the recommendations below to strengthen your resume."
-            color = (255, 0, 0)  # Red
-        
-        self.pdf.set_text_color(*color)
-        self.pdf.cell(0, 8, f'Overall Score: {final_score}/100', 0, 1, 'L')
-        self.pdf.set_text_color(0, 0, 0)
-        self.pdf.multi_cell(0, 6, interpretation)
-        self.pdf.ln(10)
-
-    def _add_match_summary(self, match_result: Dict):
+            interpretation = interpretations[2]
+
+        pdf.set_text_color(*_score_color(score))
+        pdf.cell(0, 8, score_text, 0, 1, 'L')
+        pdf.set_text_color(0, 0, 0)
+        pdf.multi_cell(0, 6, interpretation)
+        pdf.ln(10)
+
+    def _add_executive_summary(self, pdf: FPDF, analysis_result: Dict):
+        """Add executive summary section"""
+        final_score = analysis_result.get('finalScore', 0)
+        self._add_score_summary(pdf, 'Executive Summary', f'Overall Score: {final_score}/100', final_score, [
+            "Excellent - Your resume is well-optimized and ready for applications.",
+            "Good - Your resume has strong foundations with room for improvement.",
+            "Needs Improvement - Focus on the recommendations below to strengthen your resume."
+        ])
+
+    def _add_match_summary(self, pdf: FPDF, match_result: Dict):
         """Add job match summary section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.set_text_color(0, 0, 0)
-        self.pdf.cell(0, 10, 'Job Match Summary', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        # Overall match score
         overall_score = match_result.get('overall_score', 0)
-        self.pdf.set_font('Arial', '', 12)
-        
-        # Score interpretation
-        if overall_score >= 80:
-            interpretation = "Excellent Match - You are a strong candidate for this position."
-            color = (0, 128, 0)  # Green
-        elif overall_score >= 60:
-            interpretation = "Good Match - You meet most requirements with some areas to strengthen."
-            color = (255, 165, 0)  # Orange
-        else:
-            interpretation = "Moderate Match - Consider developing missing skills for better alignment."
-            color = (255, 0, 0)  # Red
-        
-        self.pdf.set_text_color(*color)
-        self.pdf.cell(0, 8, f'Overall Match Score: {overall_score}%', 0, 1, 'L')
-        self.pdf.set_text_color(0, 0, 0)
-        self.pdf.multi_cell(0, 6, interpretation)
-        self.pdf.ln(10)
-    
-    def _add_score_breakdown(self, analysis_result: Dict):
+        self._add_score_summary(pdf, 'Job Match Summary', f'Overall Match Score: {overall_score}%', overall_score, [
+            "Excellent Match - You are a strong candidate for this position.",
+            "Good Match - You meet most requirements with some areas to strengthen.",
+            "Moderate Match - Consider developing missing skills for better alignment."
+        ])
+
+    def _add_score_row(self, pdf: FPDF, label: str, score_text: str, score: float):
+        """One breakdown line: label, score and a filled bar scaled to 0-100"""
+        pdf.cell(60, ROW_HEIGHT, f'{label}:', 0, 0, 'L')
+        pdf.cell(20, ROW_HEIGHT, score_text, 0, 0, 'L')
+
+        x = pdf.l_margin + BAR_OFFSET
+        y = pdf.get_y() + (ROW_HEIGHT - BAR_HEIGHT) / 2
+        filled = BAR_WIDTH * max(0, min(score, 100)) / 100
+        pdf.set_fill_color(*BAR_TRACK_COLOR)
+        pdf.rect(x, y, BAR_WIDTH, BAR_HEIGHT, style='F')
+        if filled:
+            pdf.set_fill_color(*_score_color(score))
+            pdf.rect(x, y, filled, BAR_HEIGHT, style='F')
+        pdf.ln(ROW_HEIGHT)
+
+    def _add_score_breakdown(self, pdf: FPDF, analysis_result: Dict):
         """Add detailed score breakdown"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Score Breakdown', 0, 1, 'L')
-        self.pdf.ln(5)
-        
+        self.sections['Score Breakdown'].replay(pdf)
+
         scores = analysis_result.get('scores', {})
         score_labels = {
             'skillsMatch': 'Skills Match',
@@ -159,223 +235,150 @@ class ReportGenerator:
             'verbStrength': 'Verb Strength',
             'formatting': 'Formatting'
         }
-        
-        self.pdf.set_font('Arial', '', 11)
+
+        pdf.set_font(FONT, '', 11)
         for key, score in scores.items():
-            label = score_labels.get(key, key)
-            
-            # Score bar visualization (text-based)
-            bar_length = int(score / 5)  # Scale to 20 characters max
-            bar = '█' * bar_length + '░' * (20 - bar_length)
-            
-            self.pdf.cell(60, 8, f'{label}:', 0, 0, 'L')
-            self.pdf.cell(20, 8, f'{score}/100', 0, 0, 'L')
-            self.pdf.set_font('Arial', '', 8)
-            self.pdf.cell(0, 8, bar, 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 11)
-        
-        self.pdf.ln(10)
-
-    def _add_match_breakdown(self, match_result: Dict):
+            self._add_score_row(pdf, score_labels.get(key, key), f'{score}/100', score)
+
+        pdf.ln(10)
+
+    def _add_match_breakdown(self, pdf: FPDF, match_result: Dict):
         """Add match score breakdown"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Match Score Breakdown', 0, 1, 'L')
-        self.pdf.ln(5)
-        
+        self.sections['Match Score Breakdown'].replay(pdf)
+
         scores = {
             'Skills Match': match_result.get('skills_match', 0),
             'Experience Match': match_result.get('experience_match', 0),
             'Semantic Match': match_result.get('semantic_match', 0),
             'Keyword Match': match_result.get('keyword_match', 0)
         }
-        
-        self.pdf.set_font('Arial', '', 11)
+
+        pdf.set_font(FONT, '', 11)
         for label, score in scores.items():
-            # Score bar visualization (text-based)
-            bar_length = int(score / 5)  # Scale to 20 characters max
-            bar = '█' * bar_length + '░' * (20 - bar_length)
-            
-            self.pdf.cell(60, 8, f'{label}:', 0, 0, 'L')
-            self.pdf.cell(20, 8, f'{score:.1f}%', 0, 0, 'L')
-            self.pdf.set_font('Arial', '', 8)
-            self.pdf.cell(0, 8, bar, 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 11)
-        
-        self.pdf.ln(10)
-    
-    def _add_skills_analysis(self, analysis_result: Dict):
+            self._add_score_row(pdf, label, f'{score:.1f}%', score)
+
+        pdf.ln(10)
+
+    def _add_item_list(self, pdf: FPDF, heading: str, items: List[str], color: Tuple[int, int, int],
+                       space_after: bool = True, count: Optional[int] = None):
+        """Colored heading with a count, followed by a comma-separated list"""
+        pdf.set_font(FONT, 'B', 12)
+        pdf.set_text_color(*color)
+        pdf.cell(0, 8, f'{heading} ({len(items) if count is None else count}):', 0, 1, 'L')
+        pdf.set_font(FONT, '', 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.multi_cell(0, 6, ', '.join(items))
+        if space_after:
+            pdf.ln(5)
+
+    def _add_skills_analysis(self, pdf: FPDF, analysis_result: Dict):
         """Add skills analysis section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Skills Analysis', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        # Found skills
+        self.sections['Skills Analysis'].replay(pdf)
+
         found_skills = analysis_result.get('foundSkills', [])
         if found_skills:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(0, 128, 0)
-            self.pdf.cell(0, 8, f'Skills Found ({len(found_skills)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            skills_text = ', '.join(found_skills)
-            self.pdf.multi_cell(0, 6, skills_text)
-            self.pdf.ln(5)
-        
+            self._add_item_list(pdf, 'Skills Found', found_skills, (0, 128, 0))
+
         # Missing/Recommended skills
         missing_skills = analysis_result.get('missingSkills', [])
         if missing_skills:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(255, 140, 0)
-            self.pdf.cell(0, 8, f'Recommended Skills ({len(missing_skills)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            skills_text = ', '.join(missing_skills)
-            self.pdf.multi_cell(0, 6, skills_text)
-            self.pdf.ln(5)
-        
-        # Strong verbs
+            self._add_item_list(pdf, 'Recommended Skills', missing_skills, (255, 140, 0))
+
         strong_verbs = analysis_result.get('strongVerbs', [])
         if strong_verbs:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(0, 0, 255)
-            self.pdf.cell(0, 8, f'Strong Action Verbs Used ({len(strong_verbs)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            verbs_text = ', '.join(strong_verbs)
-            self.pdf.multi_cell(0, 6, verbs_text)
-        
-        self.pdf.ln(10)
-
-    def _add_skills_comparison(self, match_result: Dict):
+            self._add_item_list(pdf, 'Strong Action Verbs Used', strong_verbs, (0, 0, 255), space_after=False)
+
+        pdf.ln(10)
+
+    def _add_skills_comparison(self, pdf: FPDF, match_result: Dict):
         """Add skills comparison section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Skills Comparison', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        # Matching skills
+        self.sections['Skills Comparison'].replay(pdf)
+
         matching_skills = match_result.get('matching_skills', [])
         if matching_skills:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(0, 128, 0)
-            self.pdf.cell(0, 8, f'Matching Skills ({len(matching_skills)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            skills_text = ', '.join(matching_skills)
-            self.pdf.multi_cell(0, 6, skills_text)
-            self.pdf.ln(5)
-        
-        # Missing skills
+            self._add_item_list(pdf, 'Matching Skills', matching_skills, (0, 128, 0))
+
         missing_skills = match_result.get('missing_skills', [])
         if missing_skills:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(255, 140, 0)
-            self.pdf.cell(0, 8, f'Skills to Develop ({len(missing_skills)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            skills_text = ', '.join(missing_skills)
-            self.pdf.multi_cell(0, 6, skills_text)
-            self.pdf.ln(5)
-        
-        # Missing keywords
+            self._add_item_list(pdf, 'Skills to Develop', missing_skills, (255, 140, 0))
+
         missing_keywords = match_result.get('missing_keywords', [])
         if missing_keywords:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.set_text_color(255, 0, 0)
-            self.pdf.cell(0, 8, f'Important Keywords to Include ({len(missing_keywords)}):', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            self.pdf.set_text_color(0, 0, 0)
-            
-            keywords_text = ', '.join(missing_keywords[:10])  # Limit to first 10
-            self.pdf.multi_cell(0, 6, keywords_text)
-        
-        self.pdf.ln(10)
-    
-    def _add_recommendations(self, analysis_result: Dict):
-        """Add recommendations section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'AI Recommendations', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        suggestions = analysis_result.get('suggestions', [])
-        if suggestions:
-            self.pdf.set_font('Arial', '', 11)
-            for i, suggestion in enumerate(suggestions, 1):
-                self.pdf.set_font('Arial', 'B', 11)
-                self.pdf.cell(10, 8, f'{i}.', 0, 0, 'L')
-                self.pdf.set_font('Arial', '', 11)
-                
-                # Handle long suggestions
-                remaining_width = self.pdf.w - self.pdf.l_margin - self.pdf.r_margin - 10
-                self.pdf.multi_cell(remaining_width, 6, suggestion, 0, 'L')
-                self.pdf.ln(2)
+            # The heading counts every keyword; only the first 10 are listed
+            self._add_item_list(pdf, 'Important Keywords to Include', missing_keywords[:10], (255, 0, 0),
+                                space_after=False, count=len(missing_keywords))
+
+        pdf.ln(10)
+
+    def _add_numbered_list(self, pdf: FPDF, items: List[str], empty_text: str):
+        """Numbered paragraphs, or a single line when there are none"""
+        if items:
+            pdf.set_font(FONT, '', 11)
+            for i, item in enumerate(items, 1):
+                pdf.set_font(FONT, 'B', 11)
+                pdf.cell(10, 8, f'{i}.', 0, 0, 'L')
+                pdf.set_font(FONT, '', 11)
+                pdf.multi_cell(self.content_width - 10, 6, item, 0, 'L')
+                pdf.ln(2)
         else:
-            self.pdf.set_font('Arial', '', 11)
-            self.pdf.multi_cell(0, 6, 'Great job! Your resume shows strong optimization across all areas.')
-        
-        self.pdf.ln(10)
+            pdf.set_font(FONT, '', 11)
+            pdf.multi_cell(0, 6, empty_text)
+
+        pdf.ln(10)
 
-    def _add_match_recommendations(self, match_result: Dict):
+    def _add_recommendations(self, pdf: FPDF, analysis_result: Dict):
+        """Add recommendations section"""
+        self.sections['AI Recommendations'].replay(pdf)
+        self._add_numbered_list(
+            pdf, analysis_result.get('suggestions', []),
+            'Great job! Your resume shows strong optimization across all areas.'
+        )
+
+    def _add_match_recommendations(self, pdf: FPDF, match_result: Dict):
         """Add match-specific recommendations section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Improvement Recommendations', 0, 1, 'L')
-        self.pdf.ln(5)
-        
-        recommendations = match_result.get('recommendations', [])
-        if recommendations:
-            self.pdf.set_font('Arial', '', 11)
-            for i, recommendation in enumerate(recommendations, 1):
-                self.pdf.set_font('Arial', 'B', 11)
-                self.pdf.cell(10, 8, f'{i}.', 0, 0, 'L')
-                self.pdf.set_font('Arial', '', 11)
-                
-                # Handle long recommendations
-                remaining_width = self.pdf.w - self.pdf.l_margin - self.pdf.r_margin - 10
-                self.pdf.multi_cell(remaining_width, 6, recommendation, 0, 'L')
-                self.pdf.ln(2)
-        else:
-            self.pdf.set_font('Arial', '', 11)
-            self.pdf.multi_cell(0, 6, 'Excellent match! You appear to be well-qualified for this position.')
-        
-        self.pdf.ln(10)
-    
-    def _add_job_match_analysis(self, analysis_result: Dict):
+        self.sections['Improvement Recommendations'].replay(pdf)
+        self._add_numbered_list(
+            pdf, match_result.get('recommendations', []),
+            'Excellent match! You appear to be well-qualified for this position.'
+        )
+
+    def _add_job_match_analysis(self, pdf: FPDF, analysis_result: Dict):
         """Add job match analysis section"""
-        self.pdf.set_font('Arial', 'B', 16)
-        self.pdf.cell(0, 10, 'Job Match Analysis', 0, 1, 'L')
-        self.pdf.ln(5)
-        
+        self.sections['Job Match Analysis'].replay(pdf)
+
         job_match_score = analysis_result.get('jobMatchScore', 0)
-        self.pdf.set_font('Arial', '', 12)
-        self.pdf.cell(0, 8, f'Job Match Score: {job_match_score}%', 0, 1, 'L')
-        self.pdf.ln(3)
-        
+        pdf.set_font(FONT, '', 12)
+        pdf.cell(0, 8, f'Job Match Score: {job_match_score}%', 0, 1, 'L')
+        pdf.ln(3)
+
         missing_keywords = analysis_result.get('missingKeywords', [])
         if missing_keywords:
-            self.pdf.set_font('Arial', 'B', 12)
-            self.pdf.cell(0, 8, 'Missing Keywords for Better Match:', 0, 1, 'L')
-            self.pdf.set_font('Arial', '', 10)
-            
-            keywords_text = ', '.join(missing_keywords)
-            self.pdf.multi_cell(0, 6, keywords_text)
-        
-        self.pdf.ln(10)
-    
-    def _add_footer(self):
+            pdf.set_font(FONT, 'B', 12)
+            pdf.cell(0, 8, 'Missing Keywords for Better Match:', 0, 1, 'L')
+            pdf.set_font(FONT, '', 10)
+            pdf.multi_cell(0, 6, ', '.join(missing_keywords))
+
+        pdf.ln(10)
+
+    def _add_footer(self, pdf: FPDF):
         """Add report footer"""
-        self.pdf.ln(20)
-        self.pdf.set_font('Arial', 'I', 10)
-        self.pdf.set_text_color(128, 128, 128)
-        self.pdf.multi_cell(0, 6, 
-            'This report was generated by SIPA (Smart Interview Preparation Assistant) using advanced AI analysis. '
-            'The recommendations are based on industry best practices and current hiring trends. '
-            'For best results, customize your resume for each specific job application.')
-        
+        self.footer.replay(pdf)
+
         # Add page number
-        self.pdf.set_y(-15)
-        self.pdf.set_font('Arial', 'I', 8)
-        self.pdf.cell(0, 10, f'Page {self.pdf.page_no()}', 0, 0, 'C')
\ No newline at end of file
+        pdf.set_y(-15)
+        pdf.set_font(FONT, 'I', 8)
+        pdf.cell(0, 10, f'Page {pdf.page_no()}', 0, 0, 'C')
+
+
+_generator: Optional[ReportGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_report_generator() -> ReportGenerator:
+    """Process-wide shared report generator"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = ReportGenerator()
+    return _generator
@@ -0,0 +1,69 @@
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from utils.cache import LRUCache, DiskCache, TieredCache, content_key
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate used for cost reporting (Gemini averages ~4 chars per token)
+CHARS_PER_TOKEN = 4
+
+
+class ResponseCache:
+    """
+    Prompt-hash-keyed cache of LLM responses with TTL and a byte bound.
+
+    Only methods listed in ``methods`` are cached. Every hit is credited with the
+    latency and estimated cost of the original call, so the metrics show how much
+    time and money the cache has saved.
+    """
+
+    def __init__(self, methods: Iterable[str], ttl: float = 24 * 3600, max_bytes: int = 32 * 1024 * 1024,
+                 directory: Optional[str] = None, input_cost_per_1k: float = 0.0, output_cost_per_1k: float = 0.0):
+        self.methods = set(methods)
+        self.input_cost_per_1k = input_cost_per_1k
+        self.output_cost_per_1k = output_cost_per_1k
+        self.cache = TieredCache(
+            LRUCache(max_items=10000, max_bytes=max_bytes, ttl=ttl),
+            DiskCache(directory, max_bytes, ttl=ttl) if directory else None
+        )
+        self.savings = {'latency_seconds': 0.0, 'estimated_cost': 0.0}
+        self._lock = threading.Lock()
+
+    def enabled_for(self, method: str) -> bool:
+        return method in self.methods
+
+    def _key(self, method: str, prompt: str) -> str:
+        return content_key(prompt.encode('utf-8'), 'gemini', method)
+
+    def estimate_cost(self, prompt: str, response_text: str) -> float:
+        input_tokens = len(prompt) / CHARS_PER_TOKEN
+        output_tokens = len(response_text) / CHARS_PER_TOKEN
+        return (input_tokens * self.input_cost_per_1k + output_tokens * self.output_cost_per_1k) / 1000
+
+    def get(self, method: str, prompt: str) -> Optional[str]:
+        """Cached response text for this prompt, or None"""
+        entry = self.cache.get(self._key(method, prompt))
+        if entry is None:
+            return None
+
+        with self._lock:
+            self.savings['latency_seconds'] += entry.get('latency', 0.0)
+            self.savings['estimated_cost'] += entry.get('cost', 0.0)
+        return entry['text']
+
+    def put(self, method: str, prompt: str, response_text: str, latency: float):
+        self.cache.set(self._key(method, prompt), {
+            'text': response_text,
+            'latency': latency,
+            'cost': self.estimate_cost(prompt, response_text)
+        })
+
+    def stats(self) -> Dict:
+        stats = self.cache.stats()
+        with self._lock:
+            stats['saved_latency_seconds'] = round(self.savings['latency_seconds'], 3)
+            stats['saved_estimated_cost'] = round(self.savings['estimated_cost'], 6)
+        stats['methods'] = sorted(self.methods)
+        return stats
@@ -1,14 +1,19 @@
-import spacy
 import textstat
 import nltk
-from collections import Counter
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from services.nlp_registry import get_pipeline
+from services.skill_matcher import get_skill_matcher
+from services.skill_taxonomy import TECHNICAL_KEYWORDS
+from utils.text_normalizer import NormalizedText, normalize
 
 logger = logging.getLogger(__name__)
 
 class ResumeAnalyzer:
+    # Bump whenever scoring changes so cached analyses are invalidated
+    VERSION = '1.3'
+    
     def __init__(self):
         """Initialize the Resume Analyzer with NLP models and data"""
         self.setup_nltk()
@@ -28,43 +33,13 @@ class ResumeAnalyzer:
             nltk.download('stopwords', quiet=True)
     
     def setup_spacy(self):
-        """Load spaCy model"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.error("spaCy English model not found. Please install it with: python -m spacy download en_core_web_sm")
-            raise
+        """Attach the shared spaCy pipeline (POS tags and lemmas only)"""
+        self.nlp = get_pipeline(components=['tagger', 'attribute_ruler', 'lemmatizer'])
     
     def setup_keywords(self):
         """Initialize keyword lists for analysis"""
-        self.technical_keywords = [
-            # Programming Languages
-            "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin",
-            "PHP", "Ruby", "Scala", "R", "MATLAB", "SQL", "HTML", "CSS", "Dart", "Perl",
-            
-            # Frameworks & Libraries
-            "React", "Angular", "Vue.js", "Node.js", "Express.js", "Django", "Flask", "FastAPI",
-            "Spring", "Laravel", "Rails", "ASP.NET", "jQuery", "Bootstrap", "Tailwind CSS",
-            "Next.js", "Nuxt.js", "Svelte", "Flutter", "React Native", "Ionic",
-            
-            # Databases
-            "MongoDB", "PostgreSQL", "MySQL", "SQLite", "Redis", "Cassandra", "DynamoDB",
-            "Oracle", "SQL Server", "Firebase", "Supabase", "Neo4j", "InfluxDB",
-            
-            # Cloud & DevOps
-            "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI",
-            "GitHub Actions", "Terraform", "Ansible", "Chef", "Puppet", "Vagrant",
-            
-            # AI/ML & Data Science
-            "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch",
-            "Scikit-learn", "Pandas", "NumPy", "Matplotlib", "Seaborn", "Jupyter",
-            "Apache Spark", "Hadoop", "Kafka", "Airflow", "MLflow", "Kubeflow",
-            
-            # Tools & Technologies
-            "Git", "Linux", "Unix", "Bash", "PowerShell", "Vim", "VS Code", "IntelliJ",
-            "Postman", "Swagger", "REST API", "GraphQL", "Microservices", "Agile", "Scrum",
-            "JIRA", "Confluence", "Slack", "Teams", "Figma", "Adobe Creative Suite"
-        ]
+        self.technical_keywords = list(TECHNICAL_KEYWORDS)
+        self.skill_matcher = get_skill_matcher()
         
         self.strong_verbs = [
             "achieved", "administered", "analyzed", "architected", "automated", "built",
@@ -85,16 +60,47 @@ class ResumeAnalyzer:
         """Main analysis function that processes the resume"""
         logger.info("Starting comprehensive resume analysis...")
         
-        # Clean and preprocess text
-        cleaned_text = self.clean_text(resume_text)
-        doc = self.nlp(cleaned_text)
+        # Clean and tokenize once; every scorer below reuses these buffers
+        text = normalize(resume_text)
+        doc = self.nlp(text.clean)
+        
+        job_profile = self.prepare_job_description(job_desc_text) if job_desc_text else None
+        result = self._analyze_parsed(text, doc, job_profile)
         
+        logger.info(f"Analysis completed. Final score: {result['finalScore']}")
+        return result
+    
+    def analyze_resumes(self, items: Iterable, job_desc_text: Optional[str] = None,
+                        batch_size: Optional[int] = None, n_process: Optional[int] = None,
+                        as_tuples: bool = False) -> Iterator:
+        """
+        Analyze a stream of resumes against one job description.
+        
+        The job description is processed once and spaCy runs over the resumes in
+        batches via nlp.pipe (batch size and worker processes default to
+        NLP_BATCH_SIZE / NLP_N_PROCESS). Results are yielded in input order as
+        each batch finishes. With ``as_tuples`` the items are (text, context)
+        pairs and (result, context) pairs are yielded, as in spaCy's pipe.
+        """
+        job_profile = self.prepare_job_description(job_desc_text) if job_desc_text else None
+        if not as_tuples:
+            items = ((text, None) for text in items)
+        
+        normalized = ((normalize(text), context) for text, context in items)
+        pairs = ((text.clean, (text, context)) for text, context in normalized)
+        docs = self.nlp.pipe(pairs, as_tuples=True, batch_size=batch_size, n_process=n_process)
+        for doc, (text, context) in docs:
+            result = self._analyze_parsed(text, doc, job_profile)
+            yield (result, context) if as_tuples else result
+    
+    def _analyze_parsed(self, text: NormalizedText, doc, job_profile: Optional[Dict]) -> Dict:
+        """Score one resume whose spaCy doc has already been computed"""
         # Perform all analyses
-        skills_analysis = self.analyze_skills(cleaned_text)
-        sections_analysis = self.analyze_sections(cleaned_text)
-        writing_analysis = self.analyze_writing_quality(cleaned_text, doc)
+        skills_analysis = self.analyze_skills(text.clean)
+        sections_analysis = self.analyze_sections(text)
+        writing_analysis = self.analyze_writing_quality(text, doc)
         verb_analysis = self.analyze_verb_strength(doc)
-        formatting_analysis = self.analyze_formatting(resume_text)
+        formatting_analysis = self.analyze_formatting(text.original)
         
         # Calculate individual scores
         scores = {
@@ -110,8 +116,8 @@ class ResumeAnalyzer:
         
         # Job matching analysis if job description provided
         job_match_analysis = None
-        if job_desc_text:
-            job_match_analysis = self.analyze_job_match(cleaned_text, job_desc_text)
+        if job_profile:
+            job_match_analysis = self._match_job_profile(text, job_profile)
         
         # Generate suggestions
         suggestions = self.generate_suggestions(
@@ -144,28 +150,18 @@ class ResumeAnalyzer:
             result["missingKeywords"] = job_match_analysis['missing_keywords']
             result["detailedAnalysis"]["jobMatchAnalysis"] = job_match_analysis
         
-        logger.info(f"Analysis completed. Final score: {final_score}")
         return result
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text for analysis"""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters but keep important punctuation
-        text = re.sub(r'[^\w\s\-\.\,\;\:\(\)\[\]\/\@\+\#]', '', text)
-        return text
+        return normalize(text).clean
     
     def analyze_skills(self, text: str) -> Dict:
         """Analyze technical skills mentioned in the resume"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.technical_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        found_skills = self.skill_matcher.find_by_tag(text).get('technical', [])
         
         # Remove duplicates and sort
-        found_skills = sorted(list(set(found_skills)))
+        found_skills = sorted(set(found_skills))
         
         # Suggest additional skills based on found ones
         recommended_skills = self.suggest_related_skills(found_skills)
@@ -233,9 +229,9 @@ class ResumeAnalyzer:
         
         return {k: v for k, v in categories.items() if v}  # Remove empty categories
     
-    def analyze_sections(self, text: str) -> Dict:
+    def analyze_sections(self, text: Union[str, NormalizedText]) -> Dict:
         """Analyze resume sections completeness"""
-        text_lower = text.lower()
+        text_lower = normalize(text).lower
         found_sections = []
         missing_sections = []
         
@@ -251,19 +247,22 @@ class ResumeAnalyzer:
             "completeness_score": (len(found_sections) / len(self.expected_sections)) * 100
         }
     
-    def analyze_writing_quality(self, text: str, doc) -> Dict:
+    def analyze_writing_quality(self, text: Union[str, NormalizedText], doc) -> Dict:
         """Analyze writing quality and readability"""
+        normalized = normalize(text)
+        text = normalized.clean
+        
         # Readability scores
         flesch_score = textstat.flesch_reading_ease(text)
         flesch_kincaid = textstat.flesch_kincaid_grade(text)
         
         # Sentence analysis
         sentences = nltk.sent_tokenize(text)
-        avg_sentence_length = sum(len(sentence.split()) for sentence in sentences) / len(sentences)
+        avg_sentence_length = sum(len(sentence.split()) for sentence in sentences) / len(sentences) if sentences else 0
         
-        # Word analysis
-        words = text.split()
-        avg_word_length = sum(len(word) for word in words) / len(words)
+        # Word analysis (punctuation-only text has no words)
+        words = normalized.tokens
+        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
         
         # Calculate overall writing score
         readability_score = max(0, min(100, flesch_score))
@@ -365,19 +364,30 @@ class ResumeAnalyzer:
     
     def analyze_job_match(self, resume_text: str, job_desc_text: str) -> Dict:
         """Analyze how well the resume matches the job description"""
-        # Tokenize and clean both texts
-        resume_words = set(word.lower() for word in resume_text.split() if len(word) > 2)
-        job_words = set(word.lower() for word in job_desc_text.split() if len(word) > 2)
+        return self._match_job_profile(resume_text, self.prepare_job_description(job_desc_text))
+    
+    def prepare_job_description(self, job_desc_text: Union[str, NormalizedText]) -> Dict:
+        """Tokenize a job description once so it can be matched against many resumes"""
+        job_text = normalize(job_desc_text)
+        job_word_freq = job_text.token_counts(3)
+        return {
+            'words': job_text.token_set(3),
+            'most_common': job_word_freq.most_common(20)
+        }
+    
+    def _match_job_profile(self, resume_text: Union[str, NormalizedText], job_profile: Dict) -> Dict:
+        """Match a resume against a prepared job description"""
+        resume_words = normalize(resume_text).token_set(3)
+        job_words = job_profile['words']
         
         # Find overlapping keywords
         overlap = resume_words.intersection(job_words)
         match_score = round((len(overlap) / len(job_words)) * 100, 1)
         
         # Find missing important keywords
-        job_word_freq = Counter(word.lower() for word in job_desc_text.split() if len(word) > 2)
         important_missing = []
         
-        for word, freq in job_word_freq.most_common(20):
+        for word, freq in job_profile['most_common']:
             if freq > 2 and word not in resume_words and word not in ['the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by']:
                 important_missing.append(word)
         
@@ -0,0 +1,76 @@
+import time
+import logging
+import threading
+from typing import Dict
+
+from services.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class SessionJanitor:
+    """
+    Background sweep that drops expired session store entries.
+
+    Expired entries are already invisible to readers; the sweep only reclaims
+    their space. Disk caches (analysis results, rendered reports) enforce their
+    own size limits and need no sweeping.
+    """
+
+    def __init__(self, session_store: SessionStore, interval: float = 300):
+        self.session_store = session_store
+        self.interval = interval
+        self._metrics = {
+            'sweeps': 0,
+            'expired_entries_purged': 0,
+            'last_sweep': None,
+            'last_sweep_seconds': 0.0
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Run sweeps in a daemon thread every ``interval`` seconds (no-op if already running)"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='session-janitor', daemon=True)
+            self._thread.start()
+        logger.info(f"Started session janitor (interval={self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        self.sweep()
+        while not self._stop.wait(self.interval):
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Purge expired entries once and return how many were removed"""
+        started = time.time()
+        try:
+            purged = self.session_store.purge_expired()
+        except Exception as e:
+            logger.warning(f"Failed to purge expired session entries: {str(e)}")
+            purged = 0
+
+        with self._lock:
+            self._metrics['sweeps'] += 1
+            self._metrics['expired_entries_purged'] += purged
+            self._metrics['last_sweep'] = started
+            self._metrics['last_sweep_seconds'] = round(time.time() - started, 3)
+
+        if purged:
+            logger.info(f"Session janitor purged {purged} expired entries")
+        return purged
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._metrics)
+        stats['interval'] = self.interval
+        stats['running'] = self._thread is not None
+        return stats
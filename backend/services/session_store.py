@@ -0,0 +1,239 @@
+"""
+Pluggable storage for per-session and per-user state.
+
+Backends:
+    memory             in-process dict (single worker, tests)
+    sqlite:///<path>   SQLite in WAL mode, shared by every worker on the host
+
+Select one with the SESSION_STORE_URL environment variable.
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_URL = 'sqlite:///temp/sessions.db'
+DEFAULT_TTL = int(os.getenv('SESSION_TTL_SECONDS', 24 * 3600))
+
+# Values above this size are zlib-compressed before storage
+COMPRESS_THRESHOLD = 1024
+
+_RAW = b'j'
+_COMPRESSED = b'z'
+
+
+def serialize(value: Any) -> bytes:
+    """Compact JSON, compressed when large"""
+    data = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+    if len(data) > COMPRESS_THRESHOLD:
+        return _COMPRESSED + zlib.compress(data, 6)
+    return _RAW + data
+
+
+def deserialize(blob: bytes) -> Any:
+    blob = bytes(blob)
+    if blob[:1] == _COMPRESSED:
+        return json.loads(zlib.decompress(blob[1:]))
+    return json.loads(blob[1:])
+
+
+class SessionStore(ABC):
+    """
+    Key-value store partitioned by namespace, with TTL and atomic updates.
+
+    A ``ttl`` of None uses the store default; 0 means the entry never expires.
+    Values are always returned as fresh copies, so callers may mutate them freely.
+    """
+
+    def __init__(self, default_ttl: int = DEFAULT_TTL):
+        self.default_ttl = default_ttl
+
+    def _expires_at(self, ttl: Optional[int]) -> Optional[float]:
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Value for key, or default if it is missing or expired"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None):
+        """Store value under key, expiring after ttl seconds"""
+
+    @abstractmethod
+    def update(self, namespace: str, key: str, fn: Callable[[Any], Any], default: Any = None,
+               ttl: Optional[int] = None) -> Any:
+        """Atomically replace the value with fn(current value) and return the new value"""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str):
+        """Remove key if present"""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Drop expired entries and return how many were removed"""
+
+    def exists(self, namespace: str, key: str) -> bool:
+        return self.get(namespace, key) is not None
+
+
+class MemorySessionStore(SessionStore):
+    """In-process backend; state is lost on restart and not shared across workers"""
+
+    def __init__(self, default_ttl: int = DEFAULT_TTL):
+        super().__init__(default_ttl)
+        self._data: Dict = {}
+        self._lock = threading.RLock()
+
+    def _read(self, namespace: str, key: str):
+        entry = self._data.get((namespace, key))
+        if entry is None:
+            return None
+        blob, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            del self._data[(namespace, key)]
+            return None
+        return blob
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            blob = self._read(namespace, key)
+        return deserialize(blob) if blob is not None else default
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None):
+        blob = serialize(value)
+        with self._lock:
+            self._data[(namespace, key)] = (blob, self._expires_at(ttl))
+
+    def update(self, namespace: str, key: str, fn: Callable[[Any], Any], default: Any = None,
+               ttl: Optional[int] = None) -> Any:
+        with self._lock:
+            blob = self._read(namespace, key)
+            current = deserialize(blob) if blob is not None else default
+            new_value = fn(current)
+            self._data[(namespace, key)] = (serialize(new_value), self._expires_at(ttl))
+        return new_value
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def purge_expired(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, expires_at) in self._data.items()
+                       if expires_at is not None and expires_at < now]
+            for k in expired:
+                del self._data[k]
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite backend in WAL mode; safe to share between processes on one host"""
+
+    def __init__(self, path: str, default_ttl: int = DEFAULT_TTL):
+        super().__init__(default_ttl)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            ' namespace TEXT NOT NULL,'
+            ' key TEXT NOT NULL,'
+            ' value BLOB NOT NULL,'
+            ' expires_at REAL,'
+            ' PRIMARY KEY (namespace, key)'
+            ') WITHOUT ROWID'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly where needed
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _select(self, conn: sqlite3.Connection, namespace: str, key: str):
+        row = conn.execute(
+            'SELECT value FROM sessions WHERE namespace = ? AND key = ? '
+            'AND (expires_at IS NULL OR expires_at >= ?)',
+            (namespace, key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _upsert(self, conn: sqlite3.Connection, namespace: str, key: str, value: Any, ttl: Optional[int]):
+        conn.execute(
+            'INSERT OR REPLACE INTO sessions (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)',
+            (namespace, key, serialize(value), self._expires_at(ttl))
+        )
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        blob = self._select(self._connection(), namespace, key)
+        return deserialize(blob) if blob is not None else default
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None):
+        self._upsert(self._connection(), namespace, key, value, ttl)
+
+    def update(self, namespace: str, key: str, fn: Callable[[Any], Any], default: Any = None,
+               ttl: Optional[int] = None) -> Any:
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front so concurrent updates serialize
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            blob = self._select(conn, namespace, key)
+            current = deserialize(blob) if blob is not None else default
+            new_value = fn(current)
+            self._upsert(conn, namespace, key, new_value, ttl)
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return new_value
+
+    def delete(self, namespace: str, key: str):
+        self._connection().execute('DELETE FROM sessions WHERE namespace = ? AND key = ?', (namespace, key))
+
+    def purge_expired(self) -> int:
+        cursor = self._connection().execute(
+            'DELETE FROM sessions WHERE expires_at IS NOT NULL AND expires_at < ?', (time.time(),)
+        )
+        return cursor.rowcount
+
+
+def create_session_store(url: str) -> SessionStore:
+    """Build a store from a URL such as 'memory' or 'sqlite:///temp/sessions.db'"""
+    if url == 'memory':
+        return MemorySessionStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteSessionStore(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported session store URL: {url}")
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide session store configured from SESSION_STORE_URL"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = os.getenv('SESSION_STORE_URL', DEFAULT_STORE_URL)
+                _store = create_session_store(url)
+                logger.info(f"Session store initialized: {url}")
+    return _store
@@ -0,0 +1,128 @@
+import re
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+from services.skill_taxonomy import (
+    TECHNICAL_KEYWORDS, SKILL_CATEGORIES, EDUCATION_KEYWORDS,
+    CERTIFICATION_KEYWORDS, TITLE_KEYWORDS
+)
+
+logger = logging.getLogger(__name__)
+
+KeywordHit = namedtuple('KeywordHit', ['term', 'start', 'end'])
+
+# Characters that continue a token: a keyword must not be preceded or followed by
+# one of these, so "Go" does not match inside "Google", "R" not inside "React"
+# and "R" not inside "R&D".
+_TOKEN_CHARS = r'[\w+#&]'
+_BOUNDARY_BEFORE = rf'(?<!{_TOKEN_CHARS})'
+_BOUNDARY_AFTER = rf'(?!{_TOKEN_CHARS})'
+
+# Plural/possessive endings allowed after keywords longer than one character
+_SUFFIX = r"(?:'s|s)?"
+
+# Alphabetic keywords this short ("R", "Go") are also ordinary words or
+# abbreviations, so they only match with the capitalization they are listed in.
+CASE_SENSITIVE_MAX_LENGTH = 2
+
+
+def _is_ambiguous(term: str) -> bool:
+    return len(term) <= CASE_SENSITIVE_MAX_LENGTH and term.isalpha()
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher compiled once from a tagged vocabulary.
+
+    All keywords are combined into a single case-insensitive, word-boundary-aware
+    regular expression, so one scan of the text finds every keyword regardless of
+    vocabulary size. Keywords nested inside longer ones ("React" in "React Native")
+    are reported as well, using offsets precomputed at build time. Short
+    alphabetic keywords (see CASE_SENSITIVE_MAX_LENGTH) must match case-sensitively,
+    so pass text with its original capitalization.
+    """
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]):
+        # term (lowercase) -> {tag: display form}
+        self.labels: Dict[str, Dict[str, str]] = {}
+        for tag, keywords in vocabulary.items():
+            for keyword in keywords:
+                self.labels.setdefault(keyword.lower(), {}).setdefault(tag, keyword)
+
+        # term (lowercase) -> the exact spellings it may appear in, for ambiguous terms
+        self.case_forms: Dict[str, frozenset] = {
+            term: frozenset(displays.values()) for term, displays in self.labels.items() if _is_ambiguous(term)
+        }
+
+        terms = sorted(self.labels, key=len, reverse=True)
+        alternation = '|'.join(self._alternative(term) for term in terms)
+        self.pattern = re.compile(f'{_BOUNDARY_BEFORE}({alternation})', re.IGNORECASE)
+        self.nested = self._build_nested(terms)
+
+    def _alternative(self, term: str) -> str:
+        """Pattern for one keyword, including its trailing boundary"""
+        if term in self.case_forms:
+            forms = '|'.join(re.escape(form) for form in sorted(self.case_forms[term], key=len, reverse=True))
+            return f'(?-i:{forms}){_BOUNDARY_AFTER}'
+        suffix = _SUFFIX if len(term) > 1 else ''
+        # The suffix is checked but not consumed, so the match covers the keyword only
+        return f'{re.escape(term)}(?={suffix}{_BOUNDARY_AFTER})'
+
+    def _build_nested(self, terms: List[str]) -> Dict[str, List[KeywordHit]]:
+        """Precompute shorter keywords that occur as whole words inside longer ones"""
+        nested = {}
+        for term in terms:
+            inner_hits = []
+            for other in terms:
+                if len(other) >= len(term) or other not in term:
+                    continue
+                other_pattern = re.compile(f'{_BOUNDARY_BEFORE}{re.escape(other)}{_BOUNDARY_AFTER}')
+                for match in other_pattern.finditer(term):
+                    inner_hits.append(KeywordHit(other, match.start(), match.end()))
+            if inner_hits:
+                nested[term] = inner_hits
+        return nested
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """Return every keyword occurrence with its character offsets, in text order"""
+        hits = []
+        for match in self.pattern.finditer(text):
+            term = match.group(1).lower()
+            start = match.start(1)
+            hits.append(KeywordHit(term, start, match.end(1)))
+            for inner in self.nested.get(term, ()):
+                inner_start, inner_end = start + inner.start, start + inner.end
+                forms = self.case_forms.get(inner.term)
+                if forms is not None and text[inner_start:inner_end] not in forms:
+                    continue
+                hits.append(KeywordHit(inner.term, inner_start, inner_end))
+        return hits
+
+    def find_by_tag(self, text: str) -> Dict[str, List[str]]:
+        """Group unique matched keywords (in their display form) by vocabulary tag"""
+        found: Dict[str, List[str]] = {}
+        seen = set()
+        for hit in self.find_all(text):
+            if hit.term in seen:
+                continue
+            seen.add(hit.term)
+            for tag, display in self.labels[hit.term].items():
+                found.setdefault(tag, []).append(display)
+        return found
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> KeywordMatcher:
+    """Shared matcher over every skill, education, certification and title keyword"""
+    vocabulary = {'technical': TECHNICAL_KEYWORDS}
+    for category, skills in SKILL_CATEGORIES.items():
+        vocabulary[f'skill:{category}'] = skills
+    vocabulary['education'] = EDUCATION_KEYWORDS
+    vocabulary['certification'] = CERTIFICATION_KEYWORDS
+    vocabulary['title'] = TITLE_KEYWORDS
+
+    matcher = KeywordMatcher(vocabulary)
+    logger.info(f"Built skill matcher with {len(matcher.labels)} keywords")
+    return matcher
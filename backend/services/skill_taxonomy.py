@@ -0,0 +1,74 @@
+"""
+Shared skill and keyword vocabularies used by the resume analyzer and job matcher.
+"""
+
+TECHNICAL_KEYWORDS = [
+    # Programming Languages
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Swift", "Kotlin",
+    "PHP", "Ruby", "Scala", "R", "MATLAB", "SQL", "HTML", "CSS", "Dart", "Perl",
+
+    # Frameworks & Libraries
+    "React", "Angular", "Vue.js", "Node.js", "Express.js", "Django", "Flask", "FastAPI",
+    "Spring", "Laravel", "Rails", "ASP.NET", "jQuery", "Bootstrap", "Tailwind CSS",
+    "Next.js", "Nuxt.js", "Svelte", "Flutter", "React Native", "Ionic",
+
+    # Databases
+    "MongoDB", "PostgreSQL", "MySQL", "SQLite", "Redis", "Cassandra", "DynamoDB",
+    "Oracle", "SQL Server", "Firebase", "Supabase", "Neo4j", "InfluxDB",
+
+    # Cloud & DevOps
+    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Jenkins", "GitLab CI",
+    "GitHub Actions", "Terraform", "Ansible", "Chef", "Puppet", "Vagrant",
+
+    # AI/ML & Data Science
+    "Machine Learning", "Deep Learning", "Neural Networks", "TensorFlow", "PyTorch",
+    "Scikit-learn", "Pandas", "NumPy", "Matplotlib", "Seaborn", "Jupyter",
+    "Apache Spark", "Hadoop", "Kafka", "Airflow", "MLflow", "Kubeflow",
+
+    # Tools & Technologies
+    "Git", "Linux", "Unix", "Bash", "PowerShell", "Vim", "VS Code", "IntelliJ",
+    "Postman", "Swagger", "REST API", "GraphQL", "Microservices", "Agile", "Scrum",
+    "JIRA", "Confluence", "Slack", "Teams", "Figma", "Adobe Creative Suite"
+]
+
+SKILL_CATEGORIES = {
+    'programming_languages': [
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
+        'Swift', 'Kotlin', 'PHP', 'Ruby', 'Scala', 'R', 'MATLAB', 'SQL'
+    ],
+    'frameworks': [
+        'React', 'Angular', 'Vue.js', 'Node.js', 'Express.js', 'Django', 'Flask',
+        'FastAPI', 'Spring', 'Laravel', 'Rails', 'ASP.NET', 'jQuery', 'Bootstrap'
+    ],
+    'databases': [
+        'MongoDB', 'PostgreSQL', 'MySQL', 'SQLite', 'Redis', 'Cassandra',
+        'DynamoDB', 'Oracle', 'SQL Server', 'Firebase', 'Supabase'
+    ],
+    'cloud_devops': [
+        'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes', 'Jenkins',
+        'GitLab CI', 'GitHub Actions', 'Terraform', 'Ansible'
+    ],
+    'ai_ml': [
+        'Machine Learning', 'Deep Learning', 'Neural Networks', 'TensorFlow',
+        'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy', 'Jupyter'
+    ],
+    'tools': [
+        'Git', 'Linux', 'Unix', 'Bash', 'VS Code', 'IntelliJ', 'Postman',
+        'Swagger', 'REST API', 'GraphQL', 'Microservices'
+    ]
+}
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'doctorate', 'degree', 'university',
+    'college', 'computer science', 'engineering', 'mathematics'
+]
+
+CERTIFICATION_KEYWORDS = [
+    'aws certified', 'azure certified', 'google cloud', 'cissp',
+    'pmp', 'scrum master', 'kubernetes', 'docker certified'
+]
+
+TITLE_KEYWORDS = [
+    'developer', 'engineer', 'architect', 'manager', 'lead',
+    'senior', 'junior', 'principal', 'director', 'analyst'
+]
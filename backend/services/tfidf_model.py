@@ -0,0 +1,192 @@
+"""
+Offline-fitted TF-IDF vocabulary used for semantic similarity scoring.
+
+The model is fitted once on a corpus of job descriptions, saved to disk and loaded
+once per process. Requests only ever call ``transform``, so IDF weights reflect the
+corpus rather than the two documents being compared, and no shared state is mutated.
+
+Rebuild the artifact with:
+
+    python -m services.tfidf_model build --corpus job_descriptions.jsonl
+    python -m services.tfidf_model info
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import re
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+CURRENT_MODEL_NAME = 'tfidf_vocabulary.pkl'
+DEFAULT_MODEL_PATH = os.getenv('TFIDF_MODEL_PATH', os.path.join(MODEL_DIR, CURRENT_MODEL_NAME))
+
+VECTORIZER_PARAMS = {
+    'max_features': 1000,
+    'stop_words': 'english',
+    'ngram_range': (1, 2)
+}
+
+
+def create_vectorizer(**overrides) -> TfidfVectorizer:
+    """Create an unfitted vectorizer with the project's default parameters"""
+    params = dict(VECTORIZER_PARAMS)
+    params.update(overrides)
+    return TfidfVectorizer(**params)
+
+
+class TfidfModel:
+    def __init__(self, vectorizer: TfidfVectorizer, version: str, metadata: Optional[Dict] = None):
+        """Wrap a fitted vectorizer together with its version metadata"""
+        self.vectorizer = vectorizer
+        self.version = version
+        self.metadata = metadata or {}
+
+    def transform(self, texts: List[str]):
+        """Vectorize texts against the fixed vocabulary (never refits)"""
+        return self.vectorizer.transform(texts)
+
+    def save(self, path: str):
+        """Write the model to disk atomically"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        payload = {
+            'version': self.version,
+            'metadata': self.metadata,
+            'vectorizer': self.vectorizer
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TfidfModel':
+        """Load a model previously written with save()"""
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+        return cls(payload['vectorizer'], payload['version'], payload.get('metadata'))
+
+    def info(self) -> Dict:
+        """Summary of the artifact for logs and the CLI"""
+        return {
+            'version': self.version,
+            'vocabulary_size': len(self.vectorizer.vocabulary_),
+            **self.metadata
+        }
+
+
+def build_model(documents: Iterable[str], version: Optional[str] = None, **params) -> TfidfModel:
+    """Fit a new model on a corpus of job descriptions"""
+    corpus = [re.sub(r'\s+', ' ', doc).strip().lower() for doc in documents]
+    corpus = [doc for doc in corpus if doc]
+    if not corpus:
+        raise ValueError("Corpus is empty")
+
+    vectorizer = create_vectorizer(**params)
+    vectorizer.fit(corpus)
+
+    version = version or datetime.utcnow().strftime('%Y%m%d%H%M%S')
+    metadata = {
+        'created': datetime.utcnow().isoformat(),
+        'documents': len(corpus),
+        'params': {
+            'max_features': vectorizer.max_features,
+            'stop_words': vectorizer.stop_words,
+            'ngram_range': list(vectorizer.ngram_range)
+        }
+    }
+    return TfidfModel(vectorizer, version, metadata)
+
+
+def read_corpus(path: str) -> Iterator[str]:
+    """Read documents from a .jsonl file, a .txt file (one per line) or a directory of .txt files"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.txt'):
+                with open(os.path.join(path, name), 'r', encoding='utf-8') as f:
+                    yield f.read()
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, str):
+                    yield record
+                else:
+                    yield ' '.join(str(record.get(field, '')) for field in ('title', 'description', 'text'))
+        else:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+_model_cache: Dict[str, Optional[TfidfModel]] = {}
+_model_lock = threading.Lock()
+
+
+def load_tfidf_model(path: str = DEFAULT_MODEL_PATH) -> Optional[TfidfModel]:
+    """Load the model once per process; returns None when no artifact exists"""
+    if path in _model_cache:
+        return _model_cache[path]
+
+    with _model_lock:
+        if path not in _model_cache:
+            model = None
+            if os.path.exists(path):
+                try:
+                    model = TfidfModel.load(path)
+                    logger.info(f"Loaded TF-IDF model version {model.version} from {path}")
+                except Exception as e:
+                    logger.error(f"Failed to load TF-IDF model from {path}: {str(e)}")
+            else:
+                logger.warning(f"TF-IDF model not found at {path}; falling back to per-request fitting")
+            _model_cache[path] = model
+    return _model_cache[path]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Build and inspect the TF-IDF vocabulary artifact')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Fit a new vocabulary from a job description corpus')
+    build_parser.add_argument('--corpus', required=True, help='.jsonl, .txt or directory of .txt files')
+    build_parser.add_argument('--output-dir', default=MODEL_DIR, help='Directory for model artifacts')
+    build_parser.add_argument('--version', help='Version label (defaults to a UTC timestamp)')
+    build_parser.add_argument('--max-features', type=int, default=VECTORIZER_PARAMS['max_features'])
+
+    info_parser = subparsers.add_parser('info', help='Show the current artifact')
+    info_parser.add_argument('--path', default=DEFAULT_MODEL_PATH)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'build':
+        model = build_model(read_corpus(args.corpus), version=args.version, max_features=args.max_features)
+        versioned_path = os.path.join(args.output_dir, f'tfidf_vocabulary-{model.version}.pkl')
+        model.save(versioned_path)
+        model.save(os.path.join(args.output_dir, CURRENT_MODEL_NAME))
+        logger.info(f"Saved TF-IDF model {model.version} to {versioned_path}")
+        print(json.dumps(model.info(), indent=2))
+        return 0
+
+    if not os.path.exists(args.path):
+        print(f"No model at {args.path}", file=sys.stderr)
+        return 1
+    print(json.dumps(TfidfModel.load(args.path).info(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
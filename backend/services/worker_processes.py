@@ -0,0 +1,31 @@
+"""
+Start method shared by the worker process pools (extraction, report export).
+
+The threaded server process is never forked. Where available, workers are
+forked from a single fork server that has imported PRELOAD_MODULES once, so
+they start with them already loaded. Elsewhere (Windows) workers are spawned
+and import them on first use.
+
+Either way, multiprocessing re-runs the main script as ``__mp_main__`` in each
+worker while it starts up. A ``'__main__'`` entry in the fork server preload
+would avoid that, but CPython 3.11 never passes the main script's path to the
+fork server, so the entry is ignored. That is why app.py and its blueprints
+build no services at import (see utils.lazy): re-running app.py in a worker
+only repeats its imports and route definitions.
+"""
+import multiprocessing
+
+# Imported once by the fork server (document parsers, report renderer); every worker
+# forked from it starts warm
+PRELOAD_MODULES = ['services.file_processor', 'services.report_generator']
+
+
+def get_worker_context() -> multiprocessing.context.BaseContext:
+    """Context for starting worker processes"""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+
+    context = multiprocessing.get_context('forkserver')
+    # The preload list is process-wide and only read when the fork server starts
+    context.set_forkserver_preload(PRELOAD_MODULES)
+    return context
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(data: bytes, *namespace: str) -> str:
+    """Build a content-addressed cache key from raw bytes and optional version tags"""
+    digest = hashlib.sha256(data).hexdigest()
+    return '-'.join(list(namespace) + [digest])
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU bounded by entry count and optionally by bytes and age"""
+
+    def __init__(self, max_items: int = 256, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int = 0):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self.total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_items or
+                (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    On-disk cache of byte payloads with size-based, oldest-first eviction.
+
+    The directory is scanned once at startup; after that the total size is kept
+    up to date incrementally on every write and eviction.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._index = OrderedDict()  # key -> size, oldest first
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[-2:], f'{key}.bin')
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.bin'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) + self.ttl < time.time():
+                self.delete(key)
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return data
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Path of a live entry (for serving it directly from disk), or None"""
+        path = self._path(key)
+        try:
+            if self.ttl and os.path.getmtime(path) + self.ttl < time.time():
+                self.delete(key)
+                return None
+            if not os.path.isfile(path):
+                return None
+        except OSError:
+            return None
+
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        return path
+
+    def temp_path(self, key: str) -> str:
+        """Scratch path on the cache's filesystem for building an entry before set_file"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+    def set(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        self.set_file(key, tmp_path)
+
+    def set_file(self, key: str, source_path: str):
+        """Move a finished file into the cache under key"""
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            os.remove(source_path)
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+
+        with self._lock:
+            self.total_bytes -= self._index.pop(key, 0)
+            self._index[key] = size
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and self._index:
+                oldest, size = self._index.popitem(last=False)
+                self.total_bytes -= size
+                self._unlink(oldest)
+
+    def delete(self, key: str):
+        with self._lock:
+            self.total_bytes -= self._index.pop(key, 0)
+        self._unlink(key)
+
+    def _unlink(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self._index)
+
+
+class TieredCache:
+    """JSON-serializable values cached in memory first, then on disk, with hit/miss counters"""
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                try:
+                    value = json.loads(data)
+                except ValueError:
+                    self.disk.delete(key)
+                else:
+                    self.memory.set(key, value, len(data))
+                    self._count('disk_hits')
+                    return value
+
+        self._count('misses')
+        return None
+
+    def set(self, key: str, value: Any):
+        data = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+        self.memory.set(key, value, len(data))
+        if self.disk is not None:
+            try:
+                self.disk.set(key, data)
+            except OSError as e:
+                logger.warning(f"Failed to write cache entry {key}: {str(e)}")
+        self._count('writes')
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0
+        stats['memory_entries'] = len(self.memory)
+        stats['memory_bytes'] = self.memory.total_bytes
+        if self.disk is not None:
+            stats['disk_entries'] = len(self.disk)
+            stats['disk_bytes'] = self.disk.total_bytes
+        return stats
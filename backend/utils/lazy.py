@@ -0,0 +1,27 @@
+"""
+Module-level services that are built on first use rather than at import.
+
+Pool worker processes re-run the main script (app.py) as ``__mp_main__`` while
+they start up (see services.worker_processes), so the app and its blueprints
+declare their services through lazy_service: importing them only defines
+routes, and each service is built in the process that first uses it.
+"""
+import threading
+from typing import Any, Callable
+
+from werkzeug.local import LocalProxy
+
+
+def lazy_service(factory: Callable[[], Any]) -> LocalProxy:
+    """Proxy to the object returned by factory(), which is called once, on first use"""
+    instance = []
+    lock = threading.Lock()
+
+    def resolve():
+        if not instance:
+            with lock:
+                if not instance:
+                    instance.append(factory())
+        return instance[0]
+
+    return LocalProxy(resolve)
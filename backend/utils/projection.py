@@ -0,0 +1,69 @@
+"""
+Field selection for analysis responses.
+
+Clients pass either ``?fields=finalScore,scores,suggestions`` (top-level keys,
+or dotted paths into nested results such as
+``detailedAnalysis.skillsAnalysis``) or a named ``?profile=``. Without either
+the full result is returned. The full result always stays in the session store
+and can be fetched later, in part or whole, from the result endpoints.
+"""
+from typing import Dict, List, Mapping, Optional
+
+# Returned with every projection so the client can fetch the rest later
+IDENTITY_FIELDS = ['session_id', 'analysis_id', 'timestamp']
+
+# Result kind -> profile name -> fields (None means the full result)
+PROFILES = {
+    'analysis': {
+        'summary': ['finalScore', 'jobMatchScore', 'scores', 'readabilityScore', 'suggestions',
+                    'missingSections', 'missingKeywords'],
+        'full': None
+    },
+    'job_match': {
+        'summary': ['overall_score', 'skills_match', 'experience_match', 'semantic_match', 'keyword_match',
+                    'missing_skills', 'recommendations'],
+        'full': None
+    }
+}
+
+# Upper bound on the number of entries in ?fields=
+MAX_FIELDS = 50
+
+
+def requested_fields(kind: str, args: Mapping[str, str]) -> Optional[List[str]]:
+    """Fields selected by the fields/profile query parameters, or None for the full result"""
+    fields = args.get('fields')
+    if fields:
+        selected = [field.strip() for field in fields.split(',') if field.strip()]
+        if len(selected) > MAX_FIELDS:
+            raise ValueError(f"At most {MAX_FIELDS} fields can be requested")
+        return selected or None
+
+    profile = args.get('profile')
+    if not profile:
+        return None
+    profiles = PROFILES[kind]
+    if profile not in profiles:
+        raise ValueError(f"profile must be one of: {', '.join(profiles)}")
+    return profiles[profile]
+
+
+def project(result: Dict, fields: Optional[List[str]]) -> Dict:
+    """Copy of result holding only the given fields; unknown fields are skipped"""
+    if fields is None:
+        return result
+
+    projected = {}
+    for field in IDENTITY_FIELDS + fields:
+        parts = field.split('.')
+        value = result
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return projected
@@ -1,9 +1,38 @@
-from flask import jsonify
+from flask import Response, request
+import json
+import hashlib
 import logging
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Hashable
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the standard library encoder
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _default(obj):
+    """Encode values neither encoder handles natively (datetimes always as ISO 8601)"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'tolist'):  # numpy arrays and scalars
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(data: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_response(data: Any, status_code: int = 200) -> Response:
+    return Response(encode_json(data), status=status_code, mimetype='application/json')
+
 def format_response(data, message="Success", status_code=200):
     """Format successful API response"""
     response = {
@@ -13,7 +42,7 @@ def format_response(data, message="Success", status_code=200):
         "timestamp": datetime.now().isoformat()
     }
     
-    return jsonify(response), status_code
+    return json_response(response, status_code), status_code
 
 def format_error(message, status_code=400, error_code=None):
     """Format error API response"""
@@ -25,7 +54,7 @@ def format_error(message, status_code=400, error_code=None):
     }
     
     logger.error(f"API Error {status_code}: {message}")
-    return jsonify(response), status_code
+    return json_response(response, status_code), status_code
 
 def format_validation_error(errors):
     """Format validation error response"""
@@ -36,4 +65,56 @@ def format_validation_error(errors):
         "timestamp": datetime.now().isoformat()
     }
     
-    return jsonify(response), 400
\ No newline at end of file
+    return json_response(response, 400), 400
+
+class EncodedPayload:
+    """
+    A success response whose data is encoded once and reused.
+
+    Only the envelope timestamp is encoded per response. The ETag is a hash of
+    the encoded data, so it is the same in every worker process and does not
+    change with the timestamp.
+    """
+
+    __slots__ = ('prefix', 'etag')
+
+    def __init__(self, data: Any, message: str = "Success"):
+        encoded = encode_json(data)
+        self.etag = hashlib.blake2b(encoded, digest_size=16).hexdigest()
+        # Same envelope as format_response, up to the timestamp
+        self.prefix = b''.join([
+            b'{"success":true,"message":', encode_json(message),
+            b',"data":', encoded, b',"timestamp":'
+        ])
+
+    def to_response(self) -> Response:
+        """The payload for the current request; 304 Not Modified if the client's copy is current"""
+        body = self.prefix + encode_json(datetime.now().isoformat()) + b'}'
+        response = Response(body, mimetype='application/json')
+        response.set_etag(self.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+class PayloadCache:
+    """Encoded payloads by key, rebuilt when the object they were built from is replaced"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (source, payload), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, source: Any, build: Callable[[], Any], message: str = "Success") -> EncodedPayload:
+        """Payload for key, encoding build() unless it was already built from this same source object"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is source:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        payload = EncodedPayload(build(), message)
+        with self._lock:
+            self._entries[key] = (source, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
@@ -0,0 +1,53 @@
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, Union
+
+# Runs of whitespace collapse to a single space
+_WHITESPACE = re.compile(r'\s+')
+
+# Everything except word characters, whitespace and punctuation that carries meaning
+# in resumes (C++, C#, node.js, 20%, R&D, emails, dates)
+_DISALLOWED = re.compile(r'[^\w\s\-\.\,\;\:\(\)\[\]\/\@\+\#\%\&\*]')
+
+
+class NormalizedText:
+    """
+    Cleaned forms of one document, derived once and shared by every scorer.
+
+    ``clean`` keeps the original casing (for spaCy and readability metrics),
+    ``lower`` and ``tokens`` are for keyword matching. Filtered token sets and
+    counts are computed on first use and cached per minimum token length.
+    """
+
+    __slots__ = ('original', 'clean', 'lower', 'tokens', '_sets', '_counts')
+
+    def __init__(self, text: str):
+        self.original = text or ''
+        self.clean = _DISALLOWED.sub('', _WHITESPACE.sub(' ', self.original)).strip()
+        self.lower = self.clean.lower()
+        self.tokens = self.lower.split()
+        self._sets: Dict[int, FrozenSet[str]] = {}
+        self._counts: Dict[int, Counter] = {}
+
+    def token_set(self, min_length: int = 1) -> FrozenSet[str]:
+        """Distinct lowercase tokens of at least ``min_length`` characters"""
+        tokens = self._sets.get(min_length)
+        if tokens is None:
+            tokens = frozenset(token for token in self.tokens if len(token) >= min_length)
+            self._sets[min_length] = tokens
+        return tokens
+
+    def token_counts(self, min_length: int = 1) -> Counter:
+        """Lowercase token frequencies for tokens of at least ``min_length`` characters"""
+        counts = self._counts.get(min_length)
+        if counts is None:
+            counts = Counter(token for token in self.tokens if len(token) >= min_length)
+            self._counts[min_length] = counts
+        return counts
+
+
+def normalize(text: Union[str, NormalizedText]) -> NormalizedText:
+    """Normalize raw text; already normalized input is returned unchanged"""
+    if isinstance(text, NormalizedText):
+        return text
+    return NormalizedText(text)